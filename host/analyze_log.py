@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming analyzer for serial console logs of the clock (`issues/*.log`).
+
+Every log is read line by line in constant memory; nothing but counters and
+the current `## CET @ ...` group is kept. Extracted are:
+
+* boots ("code.py output:", with the preceding "soft reboot", auto-reload or
+  crash as reason), boot reports ("## Boot ...ms", "## First clock frame");
+* the `## CET|UTC @ Time/Tick/RTC/NTP` groups, as drift of the tick clock
+  and the RTC against NTP (against Time if a group has no NTP line);
+* NTP sync attempts, successes and failures;
+* ETIMEDOUT, TimeoutError (SPI char/select timeouts, ESP32 not responding)
+  and UDP send errors, Wi-Fi connection failures, ESP32 resets and
+  recoveries, tracebacks, watchdog trips and crash records;
+* outages: the link goes down with the first error after a good sync and is
+  up again with the next good sync. Time between failures (up time) and
+  time to recover (down time) give MTBF and MTTR.
+
+There are no host timestamps in the logs: times are the clock's own, taken
+from the last group before an event (to the second in the old per-tick
+logs, to the minute in logs of the current firmware).
+
+Usage:
+    python host/analyze_log.py issues/*.log
+    python host/analyze_log.py issues/*.log --drift drift.csv --events events.csv
+    python host/analyze_log.py issues/*.log --format json --events events.jsonl
+
+The summary (one row per log) goes to stdout; `--drift` and `--events`
+stream the time series to files, as CSV or, with `--format json`, as JSON
+lines.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import calendar
+import csv
+import json
+import os
+import re
+import sys
+import time
+
+GROUP = re.compile(r"^#+ (?:CET|UTC) @ (Time|Tick|RTC|NTP):\s+\('(\d\d):(\d\d):(\d\d)', '\w+, (\d\d) (\w{3}) (\d{4})'\)")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+SYNC_FAILED = re.compile(r"^!! (?:OS)?Error (?:while )?syncing time: (.*?)(?: \(fail #\d+\)|\. Retrying in \d+ seconds\.)?$")
+FETCH_FAILED = re.compile(r"^!! OSError while fetching ntp\.datetime: (.*)$")
+EXCEPTION = re.compile(r"^(\w+): (.*)$")
+BOOT_REPORT = re.compile(r"^## Boot (\d+)ms")
+FIRST_FRAME = re.compile(r"^## First clock frame after ([\d.]+)s")
+## Line prefix -> LogAnalyzer method handling the line
+PREFIXES = (
+    ("Traceback (most recent call last)", "_traceback_start"),
+    ("code.py output:", "_boot"),
+    ("soft reboot", "_soft_reboot"),
+    ("Code stopped by auto-reload", "_auto_reload"),
+    (">> Syncing time via NTP", "_sync_attempt"),
+    (">> Updating time via NTP", "_sync_attempt"),
+    ("!!", "_warning"),
+    ("## Boot", "_boot_report"),
+    ("## First clock frame", "_boot_report"),
+    )
+
+DRIFT_FIELDS = ("file", "line", "boot", "time", "ref", "tick_s", "rtc_s")
+EVENT_FIELDS = ("file", "line", "boot", "time", "event", "kind", "detail")
+SUMMARY_FIELDS = ("file", "lines", "boots", "groups", "tick_drift_min_s", "tick_drift_max_s",
+                  "sync_attempts", "sync_ok", "sync_failed", "sync_failure_rate",
+                  "fetch_errors", "ETIMEDOUT", "TimeoutError", "UDP", "other_errors",
+                  "connect_failures", "esp_resets", "esp_recoveries", "crashes",
+                  "outages", "recoveries", "mtbf_s", "mttr_s", "max_outage_s")
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def error_kind(message):
+    '''Class of an error message: ETIMEDOUT, TimeoutError, UDP or other.'''
+    if "ETIMEDOUT" in message:
+        return "ETIMEDOUT"
+    lower = message.lower()
+    if "timed out" in lower or "timeouterror" in lower or "not responding" in lower:
+        return "TimeoutError"
+    if "UDP" in message:
+        return "UDP"
+    return "other"
+
+
+def parse_stamp(match):
+    '''Seconds of a group line as if UTC (only differences are used), None if the date is garbled.'''
+    hour, minute, second, mday, month, year = match.group(2, 3, 4, 5, 6, 7)
+    if month not in MONTHS:
+        return None
+    return calendar.timegm((int(year), MONTHS.index(month) + 1, int(mday), int(hour), int(minute), int(second)))
+
+
+def format_stamp(ts):
+    if ts is None:
+        return ""
+    return "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(*time.gmtime(ts)[:6])
+
+
+##=============================================================================
+class LogAnalyzer:
+    '''
+    State machine over the lines of one console log.
+
+    Parameters
+    ----------
+    name : str
+        file name for the output rows
+    on_drift, on_event : callable, optional
+        called with a dict per drift sample and per event
+
+    Attributes
+    ----------
+    time : int or None
+        log time of the last group, seconds as if UTC
+    up : bool or None
+        link state, None until the first sync or error
+    '''
+
+    def __init__(self, name, on_drift=None, on_event=None):
+        self.name = name
+        self.on_drift = on_drift
+        self.on_event = on_event
+        self.lineno = 0
+        self.boots = 0
+        self.groups = 0
+        self.time = None
+        self._group = {}
+        self._group_line = 0
+        self._boot_reason = ""
+        self._traceback = False
+        self.drift_min = None
+        self.drift_max = None
+        self.sync_attempts = 0
+        self.sync_ok = 0
+        self.sync_failed = 0
+        self.fetch_errors = 0
+        self.errors = {"ETIMEDOUT": 0, "TimeoutError": 0, "UDP": 0, "other": 0}
+        self.connect_failures = 0
+        self.esp_resets = 0
+        self.esp_recoveries = 0
+        self.crashes = 0
+        ## Outages: up (True), down (False) or not known yet (None)
+        self.up = None
+        self._since = None
+        self.outages = 0
+        self.recoveries = 0
+        self._up_time = self._up_count = 0
+        self._down_time = self._down_count = 0
+        self.max_outage = 0
+        self._handlers = tuple((prefix, getattr(self, name)) for prefix, name in PREFIXES)
+
+    ##-------------------------------------------------------------------------
+    def feed(self, line):
+        '''Process one line of the log.'''
+        self.lineno += 1
+        line = line.rstrip("\r\n")
+        match = GROUP.match(line)
+        if match:
+            self._group_stamp(match)
+            return
+        if self._group:
+            self._flush_group()
+        if not line or self._traceback and self._traceback_line(line):
+            return
+        for prefix, handler in self._handlers:
+            if line.startswith(prefix):
+                handler(line)
+                return
+        ## Old firmware printed it without "<< "
+        if "Time synchronized successfully" in line:
+            self._sync_ok(line)
+
+    def _group_stamp(self, match):
+        kind = match.group(1)
+        if kind == "Time" and self._group:
+            self._flush_group()
+        if not self._group:
+            self._group_line = self.lineno
+        self._group[kind] = parse_stamp(match)
+
+    def _traceback_start(self, line):
+        self._traceback = True
+
+    def _traceback_line(self, line):
+        '''True if the line belongs to the traceback: its frames, and the exception that ends it.'''
+        if line.startswith(" "):
+            return True
+        self._traceback = False
+        exception = EXCEPTION.match(line)
+        if not exception:
+            return False
+        self.crashes += 1
+        self._error("crash", line)
+        self._boot_reason = "crash: " + exception.group(1)
+        return True
+
+    def _boot(self, line):
+        self.boots += 1
+        self.time = None  # the clock starts over
+        self._event("boot", "", self._boot_reason)
+        self._boot_reason = ""
+
+    def _soft_reboot(self, line):
+        self._boot_reason = self._boot_reason or "soft reboot"
+
+    def _auto_reload(self, line):
+        self._boot_reason = "auto-reload"
+
+    def _sync_attempt(self, line):
+        self.sync_attempts += 1
+
+    def _sync_ok(self, line):
+        self.sync_ok += 1
+        self._event("sync_ok", "", "")
+        self._recovered()
+
+    def _boot_report(self, line):
+        report = BOOT_REPORT.match(line) or FIRST_FRAME.match(line)
+        if report:
+            self._event("boot_report" if line.startswith("## Boot") else "first_frame", "", report.group(1))
+
+    def _warning(self, line):
+        failed = SYNC_FAILED.match(line)
+        if failed:
+            self.sync_failed += 1
+            self._error("sync_failed", failed.group(1))
+            return
+        fetch = FETCH_FAILED.match(line)
+        if fetch:
+            self.fetch_errors += 1
+            self._error("fetch_failed", fetch.group(1))
+        elif "Could not connect" in line or "Could not reconnect" in line:
+            self.connect_failures += 1
+            self._event("connect_failed", "", line.split(":", 1)[-1].strip())
+        elif "resetting the ESP module" in line:
+            self.esp_resets += 1
+            self._event("esp_reset", "", "")
+            self._down()
+        elif "Reconnected to Wi-Fi after ESP reset" in line:
+            self.esp_recoveries += 1
+            self._event("esp_recovered", "", "")
+        elif "Last run crashed" in line:
+            self._event("crash_record", "", line[3:])
+        elif "Watchdog no longer fed" in line or "Task error" in line or "Main loop crashed" in line:
+            self._event("watchdog", "", line[3:])
+            self._down()
+
+    ##-------------------------------------------------------------------------
+    def _flush_group(self):
+        group = self._group
+        self._group = {}
+        now = group.get("Time")
+        if now is None:
+            return
+        self.time = now
+        self.groups += 1
+        tick = group.get("Tick")
+        if tick is None:
+            return
+        ref_name = "NTP" if group.get("NTP") is not None else "Time"
+        ref = group[ref_name]
+        drift = tick - ref
+        if self.drift_min is None or drift < self.drift_min:
+            self.drift_min = drift
+        if self.drift_max is None or drift > self.drift_max:
+            self.drift_max = drift
+        if self.on_drift is not None:
+            rtc = group.get("RTC")
+            self.on_drift({"file": self.name, "line": self._group_line, "boot": self.boots, "time": format_stamp(now),
+                           "ref": ref_name, "tick_s": drift, "rtc_s": "" if rtc is None else rtc - ref})
+
+    def _event(self, event, kind, detail):
+        if self.on_event is not None:
+            self.on_event({"file": self.name, "line": self.lineno, "boot": self.boots, "time": format_stamp(self.time),
+                           "event": event, "kind": kind, "detail": detail})
+
+    def _error(self, event, message):
+        kind = error_kind(message)
+        self.errors[kind] += 1
+        self._event(event, kind, message)
+        self._down()
+
+    def _down(self):
+        if self.up is False:
+            return
+        now = self.time
+        if self.up and now is not None and self._since is not None:
+            self._up_time += now - self._since
+            self._up_count += 1
+        self.up = False
+        self.outages += 1
+        self._since = now
+        self._event("down", "", "")
+
+    def _recovered(self):
+        if self.up:
+            return
+        now = self.time
+        if self.up is False:
+            self.recoveries += 1
+            duration = None
+            if now is not None and self._since is not None:
+                duration = now - self._since
+                self._down_time += duration
+                self._down_count += 1
+                self.max_outage = max(self.max_outage, duration)
+            self._event("up", "", "" if duration is None else "{}s".format(duration))
+        self.up = True
+        self._since = now
+
+    def close(self):
+        '''End of the log: take the last group into account.'''
+        if self._group:
+            self._flush_group()
+
+    ##-------------------------------------------------------------------------
+    def summary(self):
+        '''Counters, sync failure rate, MTBF and MTTR (in seconds of log time) so far.'''
+        syncs = self.sync_ok + self.sync_failed
+        return {
+            "file": self.name, "lines": self.lineno, "boots": self.boots, "groups": self.groups,
+            "tick_drift_min_s": self.drift_min, "tick_drift_max_s": self.drift_max,
+            "sync_attempts": self.sync_attempts, "sync_ok": self.sync_ok, "sync_failed": self.sync_failed,
+            "sync_failure_rate": round(self.sync_failed / syncs, 4) if syncs else None,
+            "fetch_errors": self.fetch_errors, "ETIMEDOUT": self.errors["ETIMEDOUT"],
+            "TimeoutError": self.errors["TimeoutError"], "UDP": self.errors["UDP"], "other_errors": self.errors["other"],
+            "connect_failures": self.connect_failures, "esp_resets": self.esp_resets,
+            "esp_recoveries": self.esp_recoveries, "crashes": self.crashes,
+            "outages": self.outages, "recoveries": self.recoveries,
+            "mtbf_s": round(self._up_time / self._up_count, 1) if self._up_count else None,
+            "mttr_s": round(self._down_time / self._down_count, 1) if self._down_count else None,
+            "max_outage_s": self.max_outage,
+        }
+
+
+##=============================================================================
+def analyze(path, on_drift=None, on_event=None):
+    '''Stream one log file through a LogAnalyzer; returns its summary.'''
+    analyzer = LogAnalyzer(os.path.basename(path), on_drift, on_event)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            analyzer.feed(line)
+    analyzer.close()
+    return analyzer.summary()
+
+
+def _writer(path, fields, fmt):
+    '''Row sink for path: a CSV writer or JSON lines; returns (write, file).'''
+    f = open(path, "w", newline="", encoding="utf-8")
+    if fmt == "json":
+        return (lambda row: f.write(json.dumps(row) + "\n")), f
+    writer = csv.DictWriter(f, fields)
+    writer.writeheader()
+    return writer.writerow, f
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Analyze serial console logs of the clock.")
+    parser.add_argument("logs", nargs="+", help="console logs, e.g. issues/*.log")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv", help="output format")
+    parser.add_argument("--drift", help="write the drift series to this file")
+    parser.add_argument("--events", help="write the events to this file")
+    args = parser.parse_args()
+
+    files = []
+    on_drift = on_event = None
+    if args.drift:
+        on_drift, f = _writer(args.drift, DRIFT_FIELDS, args.format)
+        files.append(f)
+    if args.events:
+        on_event, f = _writer(args.events, EVENT_FIELDS, args.format)
+        files.append(f)
+    try:
+        summaries = []
+        if args.format == "csv":
+            out = csv.DictWriter(sys.stdout, SUMMARY_FIELDS, lineterminator="\n")
+            out.writeheader()
+        for path in args.logs:
+            summary = analyze(path, on_drift, on_event)
+            if args.format == "csv":
+                out.writerow(summary)
+            else:
+                summaries.append(summary)
+        if args.format == "json":
+            print(json.dumps(summaries, indent=1))
+    finally:
+        for f in files:
+            f.close()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cross-check and benchmark the integer calendar math in `datetime_util`.
+
+* `--check` compares `epoch_to_civil()`/`civil_to_epoch()` against CPython's
+  `time.gmtime()`/`calendar.timegm()` for every day from 1970 to 2099 (at
+  several times of day) and for both the 1970 and the 2000 epoch.
+* `--check` also compares `PosixTZ.utcoffset()` against the IANA database
+  (`zoneinfo`) for a handful of zones, every 30 minutes from 2020 to 2030.
+* The benchmark compares `epoch_to_civil()` with `time.localtime()` and the
+  `time.localtime(time.mktime(...))` round-trip it replaces.
+
+Usage:
+    python host/bench_datetime_util.py --check
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import calendar
+import datetime
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+os.environ["TZ"] = "UTC"
+time.tzset()
+
+import datetime_util  # noqa: E402
+
+SECONDS_OF_DAY = (0, 1, 3599, 3600, 43210, 86399)
+
+## POSIX TZ string -> IANA zone
+ZONES = {
+    datetime_util.TZ_CET: "Europe/Berlin",
+    "GMT0BST,M3.5.0/1,M10.5.0": "Europe/London",
+    "EST5EDT,M3.2.0,M11.1.0": "America/New_York",
+    "AEST-10AEDT,M10.1.0,M4.1.0/3": "Australia/Sydney",
+    "<+1030>-10:30<+11>-11,M10.1.0,M4.1.0": "Australia/Lord_Howe",
+    "JST-9": "Asia/Tokyo",
+    }
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def check():
+    '''Return the number of mismatches against CPython (printing the first few).'''
+    errors = 0
+    epoch_2000 = calendar.timegm((2000, 1, 1, 0, 0, 0))
+    first = datetime_util.days_from_civil(1970, 1, 1)
+    last = datetime_util.days_from_civil(2099, 12, 31)
+    for days in range(first, last + 1):
+        for sod in SECONDS_OF_DAY:
+            ts = days * 86400 + sod
+            expected = tuple(time.gmtime(ts))[:8]
+            got = (
+                datetime_util.epoch_to_civil(ts, datetime_util.EPOCH_1970),
+                datetime_util.epoch_to_civil(ts - epoch_2000, datetime_util.EPOCH_2000),
+                )
+            back = (
+                datetime_util.civil_to_epoch(*expected[:6], epoch=datetime_util.EPOCH_1970),
+                datetime_util.civil_to_epoch(*expected[:6], epoch=datetime_util.EPOCH_2000) + epoch_2000,
+                )
+            if got != (expected, expected) or back != (ts, ts) or datetime_util.get_timetuple(expected[:6])[:8] != expected:
+                errors += 1
+                if errors <= 10:
+                    print("!! mismatch at", ts, expected, got, back)
+    print("## checked {} days x {} times of day, 2 epochs: {} mismatches".format(
+        last - first + 1, len(SECONDS_OF_DAY), errors))
+    return errors
+
+
+##=============================================================================
+def check_timezones():
+    '''Return the number of utcoffset() mismatches against zoneinfo.'''
+    from zoneinfo import ZoneInfo
+    errors = 0
+    first = calendar.timegm((2020, 1, 1, 0, 0, 0))
+    last = calendar.timegm((2031, 1, 1, 0, 0, 0))
+    for tz_string, name in ZONES.items():
+        tz = datetime_util.PosixTZ(tz_string)
+        zone = ZoneInfo(name)
+        mismatches = 0
+        for ts in range(first, last, 1800):
+            expected = int(datetime.datetime.fromtimestamp(ts, zone).utcoffset().total_seconds())
+            if tz.utcoffset(ts) != expected:
+                mismatches += 1
+        print("## {:<40} vs. {:<20} {} mismatches".format(tz_string, name, mismatches))
+        errors += mismatches
+    return errors
+
+
+##=============================================================================
+def bench(number):
+    ts = 1736965800  # 2025-01-15 18:30:00 UTC
+    cases = (
+        ("time.localtime(ts)", lambda: time.localtime(ts)),
+        ("epoch_to_civil(ts)", lambda: datetime_util.epoch_to_civil(ts)),
+        ("localtime(mktime(t) + 3600)", lambda: time.localtime(time.mktime((2025, 1, 15, 18, 30, 0, 0, 0, 0)) + 3600)),
+        ("epoch_to_civil(civil_to_epoch(*t) + 3600)", lambda: datetime_util.epoch_to_civil(
+            datetime_util.civil_to_epoch(2025, 1, 15, 18, 30, 0) + 3600)),
+        ("CET.utcoffset(ts)", lambda: datetime_util.CET.utcoffset(ts)),
+        )
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print("{:<45} {:8.3f} us".format(name, seconds / number * 1e6))
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Cross-check and benchmark datetime_util.")
+    parser.add_argument("--check", action="store_true", help="run the exhaustive 1970-2099 cross-check")
+    parser.add_argument("--number", type=int, default=100000, help="calls per benchmark repetition")
+    args = parser.parse_args()
+    if args.check and check() + check_timezones():
+        sys.exit(1)
+    bench(args.number)
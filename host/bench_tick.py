@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per-tick latency and allocation benchmark for `clocktick()`/`update_display()`.
+
+The firmware is loaded into the simulator under virtual time, and its own
+`scheduler` runs on a virtual time event loop together with the console log
+and fade tasks, the way `main()` runs them on the board. A tick is all the
+loop does up to and including the next render job: the sensor job every
+other second (the `seconds % 2` branch redraws the reading), NTP syncs,
+checkpoints, log drains and fade frames in between. Every scenario crosses
+a day/night switch and an NTP sync.
+
+Each scenario runs twice: a timing pass (wall time per tick, gc collections)
+and an allocation pass under tracemalloc (peak and retained bytes per tick).
+Time spent in `time.sleep()` costs nothing on the host; it is reported
+separately as `blocked_ms` since that is what stalls the board.
+
+Numbers are host numbers: compare them against each other, not against the
+M4.
+
+Usage:
+    python host/bench_tick.py --json bench.json
+    python host/bench_tick.py --seconds 600 --compare bench.json
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import asyncio
+import calendar
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import simulator
+from virtual_time import VirtualTime
+
+## name, UTC start (Y, M, D, h, m, s), duration in seconds
+SCENARIOS = (
+    ("weekday-evening", (2025, 1, 15, 18, 30, 0), 3700),  # Wed 19:30 CET, night at 20:00
+    ("weekday-morning", (2025, 1, 15, 5, 30, 0), 3700),  # Wed 06:30 CET, wakeup at 07:00
+    ("weekend-morning", (2025, 1, 18, 6, 30, 0), 3700),  # Sat 07:30 CET, wakeup at 08:00
+    )
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def percentiles(values, points=(50, 90, 99)):
+    '''Nearest-rank percentiles plus mean and max.'''
+    ordered = sorted(values)
+    n = len(ordered)
+    stats = {"p%d" % p: ordered[min(n - 1, max(0, (p * n + 99) // 100 - 1))] for p in points}
+    stats["mean"] = sum(ordered) / n
+    stats["max"] = ordered[-1]
+    return stats
+
+
+##=============================================================================
+class TickDriver:
+    '''Boot the firmware under virtual time and run its scheduler one render at a time.'''
+
+    def __init__(self, start, script="code_MatrixClock.py"):
+        self.vt = VirtualTime(start=start).install()
+        ## Start without a clock checkpoint, like a freshly flashed board
+        simulator.setup()
+        import microcontroller
+        microcontroller.nvm.erase()
+        self.clock = simulator.load_clock(script)
+        ns = self.ns = self.clock.ns
+        import board
+        self.sensor = board.I2C().devices[0x44]
+        self.loop = self.vt.new_event_loop()
+        ## Bring the link up, like the supervisor task does at boot
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.loop.run_until_complete(ns["wifi"].connect())
+        ## A tick ends with the render job
+        self.rendered = asyncio.Event()
+        render = ns["scheduler"].job("render")
+        func = render.func
+
+        def render_and_signal():
+            func()
+            self.rendered.set()
+        render.func = render_and_signal
+        ## The tasks of main(), except the Wi-Fi supervisor and the watchdog feeder
+        self.loop.create_task(ns["log"].run())
+        ns["fade_event"] = asyncio.Event()
+        self.loop.create_task(ns["_fade_display"]())
+        self.loop.create_task(ns["scheduler"].run())
+
+    def close(self):
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+        self.vt.uninstall()
+
+    def is_night(self):
+        return self.ns["clock_face"].theme == "night"
+
+    def tick(self):
+        '''
+        Run the event loop up to and including the next render job.
+
+        Returns
+        -------
+        branches : set of str
+            Branches taken: "sensor", "ntp", "switch".
+        '''
+        ns = self.ns
+        measurements = self.sensor.measurements
+        lastsync = ns["ts_lastntpsync"]
+        night = self.is_night()
+        self.rendered.clear()
+        self.loop.run_until_complete(self.rendered.wait())
+        branches = set()
+        if self.sensor.measurements != measurements:
+            branches.add("sensor")
+        if ns["ts_lastntpsync"] != lastsync:
+            branches.add("ntp")
+        if self.is_night() != night:
+            branches.add("switch")
+        return branches
+
+
+##=============================================================================
+def run_scenario(name, start_tuple, seconds, script):
+    '''Time and trace one scenario; return its result dictionary.'''
+    start = calendar.timegm(start_tuple)
+    stdout = sys.stdout
+    collections = [0]
+
+    def count_gc(phase, info):
+        if phase == "start":
+            collections[0] += 1
+
+    ## Timing pass ------------------------------------------------------------
+    driver = TickDriver(start, script)
+    wall_us = []
+    by_branch = {"plain": [], "sensor": [], "ntp": [], "switch": []}
+    counts = {"sensor": 0, "ntp": 0, "switch": 0, "night": 0}
+    blocked = driver.vt.slept
+    gc.collect()
+    gc.callbacks.append(count_gc)
+    sys.stdout = simulator.NullWriter()
+    try:
+        for _ in range(seconds):
+            t0 = time.perf_counter()
+            branches = driver.tick()
+            dt = (time.perf_counter() - t0) * 1e6
+            wall_us.append(dt)
+            for branch in branches:
+                counts[branch] += 1
+                by_branch[branch].append(dt)
+            if not branches:
+                by_branch["plain"].append(dt)
+            counts["night"] += driver.is_night()
+    finally:
+        sys.stdout = stdout
+        gc.callbacks.remove(count_gc)
+        blocked = driver.vt.slept - blocked
+        driver.close()
+
+    ## Allocation pass ---------------------------------------------------------
+    driver = TickDriver(start, script)
+    peak_bytes = []
+    retained_bytes = []
+    gc.collect()
+    tracemalloc.start()
+    sys.stdout = simulator.NullWriter()
+    try:
+        for _ in range(seconds):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            driver.tick()
+            current, peak = tracemalloc.get_traced_memory()
+            peak_bytes.append(peak - before)
+            retained_bytes.append(current - before)
+    finally:
+        sys.stdout = stdout
+        tracemalloc.stop()
+        driver.close()
+
+    return {
+        "start_utc": start,
+        "ticks": seconds,
+        "wall_us": percentiles(wall_us),
+        "wall_us_by_branch": {branch: percentiles(values) for branch, values in by_branch.items() if values},
+        "alloc_peak_bytes": percentiles(peak_bytes),
+        "alloc_retained_bytes_total": sum(retained_bytes),
+        "gc_collections": collections[0],
+        "blocked_ms": round(blocked * 1000, 3),
+        "branches": counts,
+        }
+
+
+##=============================================================================
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ("git", "describe", "--always", "--dirty"), cwd=simulator.HOST_DIR,
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+##=============================================================================
+def print_report(results, baseline=None):
+    header = "{:<18} {:>9} {:>9} {:>9} {:>10} {:>6} {:>10}".format(
+        "scenario", "p50 us", "p99 us", "max us", "peak B p50", "gc", "blocked ms")
+    print(header)
+    print("-" * len(header))
+    for name, r in results["scenarios"].items():
+        print("{:<18} {:>9.1f} {:>9.1f} {:>9.1f} {:>10} {:>6} {:>10.1f}".format(
+            name, r["wall_us"]["p50"], r["wall_us"]["p99"], r["wall_us"]["max"],
+            r["alloc_peak_bytes"]["p50"], r["gc_collections"], r["blocked_ms"]))
+        old = (baseline or {}).get("scenarios", {}).get(name)
+        if old:
+            def delta(new, ref):
+                return "{:+.0f}%".format(100 * (new - ref) / ref) if ref else "n/a"
+            print("{:<18} {:>9} {:>9} {:>9} {:>10} {:>6} {:>10}".format(
+                "  vs. baseline",
+                delta(r["wall_us"]["p50"], old["wall_us"]["p50"]),
+                delta(r["wall_us"]["p99"], old["wall_us"]["p99"]),
+                delta(r["wall_us"]["max"], old["wall_us"]["max"]),
+                delta(r["alloc_peak_bytes"]["p50"], old["alloc_peak_bytes"]["p50"]),
+                delta(r["gc_collections"], old["gc_collections"]),
+                delta(r["blocked_ms"], old["blocked_ms"])))
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per-tick latency and allocation benchmark.")
+    parser.add_argument("--script", default="code_MatrixClock.py", help="firmware script in src/")
+    parser.add_argument("--seconds", type=int, help="override the duration of every scenario")
+    parser.add_argument("--scenario", action="append", help="run only this scenario (repeatable)")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="print deltas against an earlier JSON result")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "script": args.script,
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_utc": int(time.time()),
+            },
+        "scenarios": {},
+        }
+    for name, start_tuple, seconds in SCENARIOS:
+        if args.scenario and name not in args.scenario:
+            continue
+        results["scenarios"][name] = run_scenario(name, start_tuple, args.seconds or seconds, args.script)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print("## Results written to", os.path.abspath(args.json))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+"""
+Build the prerendered digit atlases for `src/clock_face.py`.
+
+Rasterizes `0-9`, `:` and space of each theme's BDF font into one indexed
+sprite sheet (1 bit BMP, palette: 0 = background, 1 = theme color). Tiles
+are half a digit wide, so digits take two tiles and the narrower colon one:
+
+    tile:   0 1   2 3  ...  18 19   20   21
+    glyph:  "0"   "1"  ...  "9"     ":"  " "
+
+The glyphs keep the BDF's baseline, so swapping atlases keeps the layout of
+`adafruit_display_text.Label`.
+
+Usage:
+    python host/build_glyph_atlas.py            # writes src/atlas_day.bmp, src/atlas_night.bmp
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import os
+import struct
+import sys
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(HOST_DIR), "src")
+sys.path.insert(0, os.path.join(HOST_DIR, "sim"))
+
+from adafruit_bitmap_font import bitmap_font  # noqa: E402
+
+## theme -> (BDF font in src/, color); keep in line with the themes in code_MatrixClock.py
+THEMES = {
+    "day": ("IBMPlexMono-Medium-24_jep.bdf", 0x404000),
+    "night": ("helvR10.bdf", 0x400000),
+    }
+DIGITS = "0123456789"
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def rasterize(font):
+    '''
+    Render the atlas glyphs of a font.
+
+    Returns
+    -------
+    tile_width, tile_height : int
+    rows : list of bytearray
+        tile_height rows of 22 * tile_width pixels, 0 or 1
+    '''
+    font.load_glyphs(DIGITS + ": ")
+    glyphs = [font.get_glyph(ord(char)) for char in DIGITS + ": "]
+    advance = max(glyph.shift_x for glyph in glyphs[:10])
+    tile_width = (advance + 1) // 2
+    ## Rows from the highest glyph top to the lowest glyph bottom, relative to the baseline
+    top = max(glyph.height + glyph.dy for glyph in glyphs)
+    bottom = min(glyph.dy for glyph in glyphs)
+    tile_height = top - bottom
+    width = 22 * tile_width
+    rows = [bytearray(width) for _ in range(tile_height)]
+
+    def draw(glyph, x0, cell_width):
+        x0 += max(0, min(glyph.dx, cell_width - glyph.width))
+        y0 = top - glyph.height - glyph.dy
+        for y in range(glyph.height):
+            for x in range(glyph.width):
+                if glyph.bitmap[x, y] and 0 <= x0 + x < width:
+                    rows[y0 + y][x0 + x] = 1
+
+    for i, glyph in enumerate(glyphs[:10]):
+        draw(glyph, 2 * i * tile_width, 2 * tile_width)
+    draw(glyphs[10], 20 * tile_width, tile_width)
+    return tile_width, tile_height, rows
+
+
+##=============================================================================
+def write_bmp(filename, rows, palette):
+    '''Write 0/1 pixel rows as a 1 bit indexed BMP.'''
+    width = len(rows[0])
+    height = len(rows)
+    stride = ((width + 31) // 32) * 4
+    pixels = bytearray()
+    for row in reversed(rows):  # bottom-up
+        line = bytearray(stride)
+        for x, value in enumerate(row):
+            if value:
+                line[x // 8] |= 0x80 >> (x % 8)
+        pixels += line
+    table = b"".join(struct.pack("<BBBB", color & 0xFF, (color >> 8) & 0xFF, color >> 16, 0) for color in palette)
+    offset = 14 + 40 + len(table)
+    with open(filename, "wb") as f:
+        f.write(b"BM" + struct.pack("<IHHI", offset + len(pixels), 0, 0, offset))
+        f.write(struct.pack("<IiiHHIIiiII", 40, width, height, 1, 1, 0, len(pixels), 2835, 2835, len(palette), 0))
+        f.write(table)
+        f.write(pixels)
+
+
+##=============================================================================
+def build(themes=THEMES, out_dir=SRC_DIR):
+    '''Write atlas_<theme>.bmp for every theme; return {theme: (filename, tile_width, tile_height)}.'''
+    built = {}
+    for theme, (font_file, color) in themes.items():
+        font = bitmap_font.load_font(os.path.join(SRC_DIR, font_file))
+        tile_width, tile_height, rows = rasterize(font)
+        filename = os.path.join(out_dir, "atlas_{}.bmp".format(theme))
+        write_bmp(filename, rows, (0x000000, color))
+        built[theme] = (filename, tile_width, tile_height)
+    return built
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the digit atlases for the clock face.")
+    parser.add_argument("--out-dir", default=SRC_DIR, help="where to write atlas_<theme>.bmp")
+    args = parser.parse_args()
+    for theme, (filename, tile_width, tile_height) in build(out_dir=args.out_dir).items():
+        print("## {:6s} {}x{} tiles -> {} ({} bytes)".format(
+            theme, tile_width, tile_height, os.path.relpath(filename), os.path.getsize(filename)))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check `host/analyze_log.py` on a short console log with the messages of the
+old firmware (per-tick groups with NTP, tracebacks) and of the current one
+(groups without NTP, NTP client messages, boot report).
+
+    python host/check_analyze_log.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import sys
+
+import analyze_log
+
+LOG = """\
+code.py output:
+!! Could not connect, retrying:  ('No such ssid', b'KapWegNet')
+
+## CET @ Time: ('19:36:37', 'Mon, 20 Jan 2025')
+## CET @ Tick: ('19:36:31', 'Mon, 20 Jan 2025')
+## CET @ RTC:  ('19:36:37', 'Mon, 20 Jan 2025')
+## CET @ NTP:  ('19:36:37', 'Mon, 20 Jan 2025')
+
+>> Syncing time via NTP...
+<< Time synchronized successfully.
+
+## CET @ Time: ('19:37:00', 'Mon, 20 Jan 2025')
+## CET @ Tick: ('19:37:00', 'Mon, 20 Jan 2025')
+## CET @ RTC:  ('19:37:00', 'Mon, 20 Jan 2025')
+## CET @ NTP:  ('19:37:00', 'Mon, 20 Jan 2025')
+!! OSError while fetching ntp.datetime: [Errno 116] ETIMEDOUT
+>> Syncing time via NTP...
+!! OSError while syncing time: Timed out waiting for SPI char (fail #1)
+
+## CET @ Time: ('19:37:30', 'Mon, 20 Jan 2025')
+## CET @ Tick: ('19:37:10', 'Mon, 20 Jan 2025')
+## CET @ RTC:  ('19:37:30', 'Mon, 20 Jan 2025')
+## CET @ NTP:  ('19:37:30', 'Mon, 20 Jan 2025')
+!! Error syncing time: Failed to send UDP data. Retrying in 10 seconds.
+!! Too many consecutive failures, resetting the ESP module...
+!! Reconnected to Wi-Fi after ESP reset.
+
+## CET @ Time: ('19:38:00', 'Mon, 20 Jan 2025')
+## CET @ Tick: ('19:37:40', 'Mon, 20 Jan 2025')
+## CET @ RTC:  ('19:38:00', 'Mon, 20 Jan 2025')
+>> Syncing time via NTP...
+<< Time synchronized successfully with 0.pool.ntp.org. Offset: -0.002s RTT: 31ms Drift: 1.2ppm
+
+## CET @ Time: ('19:40:00', 'Mon, 20 Jan 2025')
+## CET @ Tick: ('19:40:00', 'Mon, 20 Jan 2025')
+## CET @ RTC:  ('19:40:00', 'Mon, 20 Jan 2025')
+!! Error while syncing time: [Errno 116] ETIMEDOUT (fail #1)
+Traceback (most recent call last):
+  File "code.py", line 215, in <module>
+TimeoutError: ESP32 not responding
+
+Code done running.
+soft reboot
+
+Auto-reload is on. Simply save files over USB to run them or enter REPL to disable.
+code.py output:
+## Boot 2476ms: board=2ms/118k
+"""
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    errors = []
+    drift, events = [], []
+    analyzer = analyze_log.LogAnalyzer("check.log", drift.append, events.append)
+    for line in LOG.splitlines(True):
+        analyzer.feed(line)
+    analyzer.close()
+    summary = analyzer.summary()
+
+    expected = {"boots": 2, "groups": 5, "sync_attempts": 3, "sync_ok": 2, "sync_failed": 3, "fetch_errors": 1,
+                "ETIMEDOUT": 2, "TimeoutError": 2, "UDP": 1, "connect_failures": 1, "esp_resets": 1,
+                "esp_recoveries": 1, "crashes": 1, "outages": 2, "recoveries": 1,
+                "tick_drift_min_s": -20, "tick_drift_max_s": 0, "mtbf_s": 71.5, "mttr_s": 60.0}
+    for key, value in expected.items():
+        if summary[key] != value:
+            errors.append("{}: {} instead of {}".format(key, summary[key], value))
+    if [(row["ref"], row["tick_s"]) for row in drift] != [("NTP", -6), ("NTP", 0), ("NTP", -20), ("Time", -20), ("Time", 0)]:
+        errors.append("drift series: {}".format(drift))
+    boots = [(row["event"], row["detail"]) for row in events if row["event"] in ("boot", "boot_report")]
+    if boots != [("boot", ""), ("boot", "crash: TimeoutError"), ("boot_report", "2476")]:
+        errors.append("boots: {}".format(boots))
+    if [row["time"] for row in events if row["event"] == "down"] != ["2025-01-20 19:37:00", "2025-01-20 19:40:00"]:
+        errors.append("outages start at {}".format([row for row in events if row["event"] == "down"]))
+    return errors
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## Log analyzer check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check the staged boot of `src/code_MatrixClock.py` in the simulator.
+
+Boots the firmware under virtual time with the access point reachable and
+unreachable, and checks the boot profile (see `src/boot_profile.py`): every
+phase is reported, the first clock frame is within `BOOT_BUDGET`, and Wi-Fi
+and NTP finish in the background. A warm boot with the RTC reset to 2000
+has to continue from the clock checkpoint in NVM, dimmed until NTP answers.
+
+    python host/check_boot.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import calendar
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import scenarios
+import simulator
+from virtual_time import VirtualTime
+
+START = calendar.timegm((2025, 1, 15, 12, 0, 0))
+## Time of a freshly reset RTC
+RTC_RESET = calendar.timegm((2000, 1, 1, 0, 0, 0))
+## Phases marked before the first clock frame, in order
+BOOT_PHASES = ("board", "esp32spi", "matrix_display", "imageload", "modules", "matrix", "splash",
+               "sensor", "fonts", "esp", "rtc", "hold", "frame")
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def boot(ap_reachable, seconds=20, start=START):
+    '''Boot and run main() for seconds; return the script namespace, console output and clock time.'''
+    simulator.setup()
+    from adafruit_esp32spi import adafruit_esp32spi
+    adafruit_esp32spi.ESP_SPIcontrol.ap_reachable = ap_reachable
+    try:
+        with VirtualTime(start=start) as vt:
+            clock = simulator.load_clock()
+            console = io.StringIO()
+            with contextlib.redirect_stdout(console):
+                clock.run(seconds, vt)
+            now = clock.ns["clock"].time()
+    finally:
+        adafruit_esp32spi.ESP_SPIcontrol.ap_reachable = True
+    return clock.ns, clock.console + console.getvalue(), now
+
+
+##=============================================================================
+def _check_cold_boot(ap_reachable, background):
+    '''Boot phases, first frame, splash time and boot report of a cold boot.'''
+    errors = []
+    ns, console, _ = boot(ap_reachable)
+    profile = ns["profile"]
+    names = tuple(name for name, _, _ in profile.phases)
+    if names != BOOT_PHASES + background:
+        errors.append("phases {}".format(names))
+    if ns["ts_first_frame"] > ns["BOOT_BUDGET"]:
+        errors.append("first frame after {:.2f}s".format(ns["ts_first_frame"]))
+    ## Assets load while the splash shows; the rest of SPLASH_TIME is waited for
+    shown_ms = sum(duration_ms for _, duration_ms, _ in profile.phases[BOOT_PHASES.index("splash") + 1:BOOT_PHASES.index("hold") + 1])
+    if abs(shown_ms - ns["SPLASH_TIME"] * 1000) > 5:
+        errors.append("splash shown for {}ms".format(shown_ms))
+    if any(mem_free <= 0 for _, _, mem_free in profile.phases):
+        errors.append("no free heap reported")
+    if console.count("## Boot ") != 1 or profile.report() not in console:
+        errors.append("boot report not printed once")
+    ## Frames are only pushed on changes; every tick updates the matrix
+    if ns["clock_face"].writes == 0 or ns["matrix"].frames + ns["matrix"].skipped < 10:
+        errors.append("clock not running")
+    if ap_reachable and ns["ts_lastntpsync"] is None:
+        errors.append("no NTP sync")
+    return errors
+
+
+def check_ap_reachable(nvm):
+    '''Wi-Fi and NTP finish in the background after the first frame.'''
+    return _check_cold_boot(True, ("connect", "ntp"))
+
+
+def check_ap_unreachable(nvm):
+    '''The first connection attempt fails in the background after the first frame.'''
+    return _check_cold_boot(False, ("offline",))
+
+
+def check_warm_boot(nvm):
+    '''The synced boot has left a checkpoint; with the RTC reset the clock continues from it.'''
+    from clock_checkpoint import ClockCheckpoint
+    saved = ClockCheckpoint(nvm, None).load()
+    if saved is None:
+        return ["no clock checkpoint after a synced boot"]
+    errors = []
+    ns, console, now = boot(False, seconds=5, start=RTC_RESET)
+    if ns["checkpoint"].restored is None or "Time restored from NVM" not in console:
+        errors.append("checkpoint not restored")
+    elif ns["clock"].synced or not 0 <= now - saved[0] // 1_000_000_000 <= 6:
+        errors.append("clock at {} for a checkpoint at {}".format(now, saved[0] // 1_000_000_000))
+    if ns["fader"].level != ns["UNSYNCED_LEVEL"]:
+        errors.append("unsynced time not dimmed")
+    if not ns["clock_face"].colon:
+        errors.append("colon blinks while unsynced")
+    return errors
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    simulator.setup()
+    os.environ["SIM_NVM"] = os.path.join(tempfile.gettempdir(), "check_boot_nvm.bin")
+    import microcontroller
+    microcontroller.nvm.erase()
+    return scenarios.run([check_ap_reachable, check_ap_unreachable, check_warm_boot], microcontroller.nvm)
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## Boot check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check that `src/datetime_util.py` imports as on CircuitPython.
+
+CircuitPython's `time` has no `gmtime()`, and the simulator runs on CPython,
+which has one. The module is imported with `time.gmtime` deleted, once with
+the 1970 and once with the 2000 epoch of `time.localtime()`, and has to
+detect the epoch of the port.
+
+    python host/check_datetime_util.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import calendar
+import importlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+## Seconds from 1970-01-01 to 2000-01-01
+EPOCH_2000_S = calendar.timegm((2000, 1, 1, 0, 0, 0))
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def import_without_gmtime(epoch_s):
+    '''Import datetime_util afresh without time.gmtime(); time.localtime() counts from epoch_s (UTC).'''
+    gmtime, localtime = time.gmtime, time.localtime
+    del time.gmtime
+    time.localtime = lambda secs=None: gmtime(time.time() - epoch_s if secs is None else secs + epoch_s)
+    sys.modules.pop("datetime_util", None)
+    try:
+        return importlib.import_module("datetime_util")
+    finally:
+        time.gmtime, time.localtime = gmtime, localtime
+        sys.modules.pop("datetime_util", None)
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    errors = []
+    for epoch_s, name in ((0, "EPOCH_1970"), (EPOCH_2000_S, "EPOCH_2000")):
+        try:
+            datetime_util = import_without_gmtime(epoch_s)
+        except Exception as e:
+            errors.append("{} port: import raised {!r}".format(name, e))
+            continue
+        if datetime_util.EPOCH != getattr(datetime_util, name):
+            errors.append("{} port detected as epoch {}".format(name, datetime_util.EPOCH))
+        elif datetime_util.epoch_to_civil(0)[:3] != time.gmtime(epoch_s)[:3]:
+            errors.append("{} port: epoch_to_civil(0) is {}".format(name, datetime_util.epoch_to_civil(0)))
+    return errors
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## datetime_util check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check `src/ntp_client.py` against local NTP stand-in servers.
+
+Three real UDP servers from `ntp_server.serve()` on 127.0.0.1 play a good
+server, a server that is 2s off and a dead one. The client has to pick the
+good one, reject the outlier, and must not wait a full timeout for the dead
+server once it is held off. A server failing at once (kiss-o'-death) must
+not cut short the burst of a slow but healthy one:
+
+    python host/check_ntp_client.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import ntp_server
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(os.path.dirname(HOST_DIR), "src"), os.path.join(HOST_DIR, "sim")]
+
+import adafruit_connection_manager  # noqa: E402
+import softclock  # noqa: E402
+from ntp_client import NTPClient  # noqa: E402
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def check_rounds(rounds=4):
+    '''Run a few sync rounds over good, outlier, fair and dead servers.'''
+    responders = {
+        "good": ntp_server.NTPResponder(delay=0.002),
+        "off": ntp_server.NTPResponder(delay=0.001, offset=2.0),
+        "fair": ntp_server.NTPResponder(delay=0.010, jitter=0.005),
+        "dead": ntp_server.NTPResponder(drop=1.0),
+        }
+    servers = {name: ntp_server.serve(responder) for name, responder in responders.items()}
+    names = {"127.0.0.1:{}".format(address[1]): name for name, (address, _) in servers.items()}
+
+    clock = softclock.SoftClock(time.time() - 5)  # start 5s behind
+    pool = adafruit_connection_manager.SocketPool(object())
+    client = NTPClient(pool, clock, servers=list(names), timeout=1.0, settle=0.2)
+    errors = []
+    try:
+        for i in range(rounds):
+            start = time.monotonic()
+            ok = asyncio.run(client.sync())
+            took = time.monotonic() - start
+            error = abs(clock.time_ns() - time.time_ns()) / 1e6
+            reach = " ".join("{}=0o{:o}".format(names[s.name], s.reach) for s in client.servers)
+            print("## Round {}: ok={} server={} took {:.0f}ms clock error {:.1f}ms reach {}".format(
+                i, ok, names.get(client.last_server), took * 1e3, error, reach))
+            if not ok:
+                errors.append("round {} failed: {}".format(i, client.last_error))
+            elif names[client.last_server] != "good":
+                errors.append("round {} picked {}".format(i, names[client.last_server]))
+            elif error > 20:
+                errors.append("round {} clock error {:.1f}ms".format(i, error))
+            if i > 0 and took > client.timeout:
+                errors.append("round {} waited {:.0f}ms for the dead server".format(i, took * 1e3))
+        if client.outliers == 0:
+            errors.append("the 2s outlier was never rejected")
+    finally:
+        for _, stop in servers.values():
+            stop()
+    return errors
+
+
+def check_fast_failure():
+    '''A server failing at once must not start the settle timer for a slow healthy one.'''
+    responders = {
+        "slow": ntp_server.NTPResponder(delay=0.05),
+        "kod": ntp_server.NTPResponder(stratum=0),
+        }
+    servers = {name: ntp_server.serve(responder) for name, responder in responders.items()}
+    names = {"127.0.0.1:{}".format(address[1]): name for name, (address, _) in servers.items()}
+
+    clock = softclock.SoftClock(time.time())
+    pool = adafruit_connection_manager.SocketPool(object())
+    ## A burst of the slow server takes about 0.3s, longer than settle
+    client = NTPClient(pool, clock, servers=list(names), timeout=1.0, settle=0.1)
+    errors = []
+    try:
+        ok = asyncio.run(client.sync())
+        if not ok or names.get(client.last_server) != "slow":
+            errors.append("fast failure: ok={} server={} error={}".format(ok, names.get(client.last_server), client.last_error))
+        if responders["slow"].replies != client.burst:
+            errors.append("fast failure: slow server answered {} of {} requests".format(responders["slow"].replies, client.burst))
+    finally:
+        for _, stop in servers.values():
+            stop()
+    return errors
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    return check_rounds() + check_fast_failure()
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## NTP client check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check `src/deadline_scheduler.py` under virtual time.
+
+* Deadlines do not drift with the run time of a job, jobs due together run
+  in priority order, and a callable period counts from the end of a run.
+* A job blocking the loop past its next deadline is an overrun and the
+  deadlines it covered entirely are missed; a coroutine job still running
+  at its next deadline is not started twice.
+* A failing job is stopped and reported to the loop's exception handler,
+  the others go on.
+* Jobs aligned to the seconds of a `SoftClock` stay aligned while the clock
+  is stepped back and forth and slewed, without skipping a second.
+* The firmware itself, booted just before both DST transitions of 2028
+  with its clock a fraction of a second off, renders every second at
+  `RENDER_PHASE_NS` after the second boundary and shows the local time.
+
+    python host/check_scheduler.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import calendar
+import contextlib
+import datetime
+import io
+import os
+import sys
+import time
+import zoneinfo
+
+import scenarios
+import simulator
+from virtual_time import VirtualTime
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(os.path.dirname(HOST_DIR), "src"), os.path.join(HOST_DIR, "sim")]
+
+import softclock  # noqa: E402
+from deadline_scheduler import Scheduler  # noqa: E402
+
+START = calendar.timegm((2028, 1, 15, 12, 0, 0))
+ZONE = zoneinfo.ZoneInfo("Europe/Berlin")
+## Both DST transitions of 2028 in UTC, and how far the clock is off at boot (stepped by the first NTP sync)
+TRANSITIONS = ((calendar.timegm((2028, 3, 26, 1, 0, 0)), 0.3), (calendar.timegm((2028, 10, 29, 1, 0, 0)), -0.37))
+## Render phase after the second boundary, as in code.py, and the tolerance of the checks
+PHASE_NS = 2_000_000
+TOLERANCE_NS = 100_000
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def run_for(vt, scheduler, seconds, events=(), on_error=None):
+    '''Run the scheduler for seconds of virtual time; events are (at, callable).'''
+    async def main():
+        loop = asyncio.get_running_loop()
+        if on_error is not None:
+            loop.set_exception_handler(lambda loop, context: on_error(context))
+        task = asyncio.create_task(scheduler.run())
+        start = vt.monotonic()
+        for at, event in events:
+            await asyncio.sleep(start + at - vt.monotonic())
+            event()
+        await asyncio.sleep(start + seconds - vt.monotonic())
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    vt.run(main())
+
+
+def offsets_ms(starts):
+    '''Start times in ms after the first one, to 0.1ms (the event loop wakes up to 1us late).'''
+    return [round((start - starts[0]) / 1e6, 1) for start in starts]
+
+
+##=============================================================================
+def check_no_drift():
+    '''A job taking 0.3s still starts every 1s on the dot.'''
+    starts = []
+    scheduler = Scheduler()
+
+    def work():
+        starts.append(time.monotonic_ns())
+        time.sleep(0.3)
+    job = scheduler.every("work", 1, work)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 10.5)
+    errors = []
+    if offsets_ms(starts) != [k * 1000.0 for k in range(11)]:
+        errors.append("starts at {}ms".format(offsets_ms(starts)))
+    if job.runs != 11 or job.overruns or job.missed or job.late_max_ns > TOLERANCE_NS:
+        errors.append(job.report())
+    if abs(job.duration_max_ns - 300_000_000) > TOLERANCE_NS:
+        errors.append("longest run {}ns".format(job.duration_max_ns))
+    return errors
+
+
+def check_priorities():
+    '''Jobs due together run lowest priority value first, ties in the order added.'''
+    order = []
+    scheduler = Scheduler()
+    for name, priority in (("c", 2), ("a", 0), ("b", 1), ("b2", 1)):
+        scheduler.every(name, 1, lambda name=name: order.append(name), priority=priority)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 2.5)
+    if order != ["a", "b", "b2", "c"] * 3:
+        return ["order {}".format(order)]
+    return []
+
+
+def check_callable_period():
+    '''A callable period is the delay from the end of a run, e.g. a backoff.'''
+    starts = []
+    delays = [2, 4, 1, 60]
+    scheduler = Scheduler()
+
+    async def work():
+        starts.append(time.monotonic_ns())
+        await asyncio.sleep(0.5)
+    job = scheduler.every("work", lambda: delays[job.runs - 1], work, delay=1)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 11)
+    if offsets_ms(starts) != [0.0, 2500.0, 7000.0, 8500.0] or job.overruns or job.missed:
+        return ["starts at {}ms, {}".format(offsets_ms(starts), job.report())]
+    return []
+
+
+def check_blocking_overrun():
+    '''A job blocking the loop for 2.5s runs its next deadline late and misses the one after.'''
+    starts = []
+    scheduler = Scheduler()
+
+    def work():
+        starts.append(time.monotonic_ns())
+        if len(starts) == 4:
+            time.sleep(2.5)
+    job = scheduler.every("work", 1, work)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 8.5)
+    errors = []
+    if offsets_ms(starts) != [0.0, 1000.0, 2000.0, 3000.0, 5500.0, 6000.0, 7000.0, 8000.0]:
+        errors.append("starts at {}ms".format(offsets_ms(starts)))
+    if job.overruns != 1 or job.missed != 1 or abs(job.late_max_ns - 1_500_000_000) > TOLERANCE_NS:
+        errors.append(job.report())
+    return errors
+
+
+def check_async_overrun():
+    '''A coroutine job still running at its next deadlines is not started again.'''
+    starts = []
+    scheduler = Scheduler()
+
+    async def work():
+        starts.append(time.monotonic_ns())
+        if len(starts) == 4:
+            await asyncio.sleep(2.5)
+    job = scheduler.every("work", 1, work)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 8.5)
+    errors = []
+    if offsets_ms(starts) != [0.0, 1000.0, 2000.0, 3000.0, 6000.0, 7000.0, 8000.0]:
+        errors.append("starts at {}ms".format(offsets_ms(starts)))
+    if job.overruns != 2 or job.missed or job.late_max_ns > TOLERANCE_NS:
+        errors.append(job.report())
+    return errors
+
+
+def check_failure():
+    '''Failing jobs are stopped and reported; the others go on.'''
+    reported = []
+    scheduler = Scheduler()
+    good = scheduler.every("good", 1, lambda: None)
+
+    def fail_second():
+        if bad.runs == 2:
+            raise RuntimeError("inline")
+
+    async def fail_at_once():
+        raise ValueError("async")
+    bad = scheduler.every("bad", 1, fail_second)
+    bad_async = scheduler.every("bad_async", 1, fail_at_once)
+    with VirtualTime(start=START) as vt:
+        run_for(vt, scheduler, 4.5, on_error=lambda context: reported.append(
+            (context["message"], type(context["exception"]).__name__)))
+    errors = []
+    if sorted(reported) != [("job bad failed", "RuntimeError"), ("job bad_async failed", "ValueError")]:
+        errors.append("reported {}".format(reported))
+    if bad.runs != 2 or not isinstance(bad.failed, RuntimeError) or bad_async.runs != 1 or bad_async.running:
+        errors.append("failed jobs: {}, {}".format(bad.report(), bad_async.report()))
+    if good.runs != 5 or good.failed is not None:
+        errors.append(good.report())
+    return errors
+
+
+def check_clock_steps():
+    '''Aligned to the seconds of a SoftClock that is stepped back, forward, back, then slewed.'''
+    renders = []
+    scheduler = Scheduler()
+    with VirtualTime(start=START + 0.25) as vt:
+        clock = softclock.SoftClock()
+        clock.freq_ppb = 300_000  # the oscillator is 300ppm off
+
+        def render():
+            renders.append((time.monotonic_ns(), clock.time_ns()))
+
+        def step(seconds):
+            return lambda: clock.sync(clock.time_ns() + int(seconds * 1e9))
+        ## As _next_second() in code.py
+        job = scheduler.every("render", 1, render, align=lambda ns: clock.next_second(ns - PHASE_NS // 2) + PHASE_NS)
+        ## The first sync steps any offset, later ones more than 1s; the last one is slewed in.
+        ## Each moves the render due next off phase
+        steps = ((3.5, step(-0.3)), (6.5, step(1.37)), (9.5, step(-2.4)), (12.5, step(0.2)))
+        run_for(vt, scheduler, 20, steps)
+    return check_renders(renders, len(steps)) + ([job.report()] if job.overruns or job.missed else [])
+
+
+def check_renders(renders, syncs):
+    '''
+    Every render, (monotonic ns, clock ns, ...), within TOLERANCE_NS after PHASE_NS into a second
+    of the clock, except the one right after each sync; never more than 1s between renders.
+    '''
+    errors = []
+    phases = [render[1] % 1_000_000_000 for render in renders]
+    off_phase = [phase / 1e6 for phase in phases if not 0 <= phase - PHASE_NS <= TOLERANCE_NS]
+    if len(off_phase) > syncs:
+        errors.append("{} renders off phase, at {}ms into the second".format(len(off_phase), off_phase))
+    gaps = [b[0] - a[0] for a, b in zip(renders, renders[1:])]
+    if not gaps or max(gaps) > 1_000_000_000 + TOLERANCE_NS:
+        errors.append("longest time between renders {}ms".format(max(gaps, default=0) / 1e6))
+    return errors
+
+
+##=============================================================================
+def boot_across(transition, offset):
+    '''Boot the firmware 15s before transition with the clock offset s off; run 30s; return its renders and namespace.'''
+    renders = []
+    simulator.setup()
+    os.environ.pop("TIMEZONE", None)
+    import rtc
+    rtc.RTC._offset = 0
+    with VirtualTime(start=transition - 15) as vt:
+        clock = simulator.load_clock()
+        ns = clock.ns
+        job = ns["scheduler"].job("render")
+        func = job.func
+
+        def render():
+            func()
+            renders.append((time.monotonic_ns(), ns["clock"].time_ns(), ns["render"]._state.get("time")))
+        job.func = render
+        ## The NTP server's time, not the clock
+        vt.step_epoch(offset)
+        with contextlib.redirect_stdout(io.StringIO()):
+            clock.run(30, vt)
+    return renders, ns
+
+
+def check_firmware_dst():
+    '''The firmware renders every second in phase across both DST transitions and shows the local time.'''
+    errors = []
+    for transition, offset in TRANSITIONS:
+        when = datetime.datetime.fromtimestamp(transition, ZONE).date()
+        renders, ns = boot_across(transition, offset)
+        if ns["clock"].steps != 1:
+            errors.append("{}: clock stepped {} times".format(when, ns["clock"].steps))
+        if not renders[0][1] < transition * 1_000_000_000 < renders[-1][1]:
+            errors.append("{}: renders do not cross the transition".format(when))
+        errors.extend("{}: {}".format(when, error) for error in check_renders(renders, 1))
+        for _, clock_ns, shown in renders:
+            local = datetime.datetime.fromtimestamp(clock_ns // 1_000_000_000, ZONE)
+            if shown != local.hour * 100 + local.minute:
+                errors.append("{}: shows {} at {}".format(when, shown, local.isoformat()))
+                break
+        render = ns["scheduler"].job("render")
+        if render.overruns or render.missed or render.failed:
+            errors.append("{}: {}".format(when, render.report()))
+    return errors
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    return scenarios.run([check_no_drift, check_priorities, check_callable_period, check_blocking_overrun,
+                          check_async_overrun, check_failure, check_clock_steps, check_firmware_dst])
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## Scheduler check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check `src/sht40.py` against the simulated I2C bus.
+
+The simulated SHT40 NACKs reads issued before its conversion time has
+elapsed, like the real part. Runs under virtual time:
+
+    python host/check_sht40.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import os
+import sys
+
+import scenarios
+from virtual_time import VirtualTime
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(os.path.dirname(HOST_DIR), "src"), os.path.join(HOST_DIR, "sim")]
+
+import busio  # noqa: E402
+import sim_i2c  # noqa: E402
+import sht40  # noqa: E402
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def check_collect(sensor, device, i2c, vt):
+    '''Collecting early is refused without touching the bus.'''
+    errors = []
+    if sensor.trigger() is None:
+        errors.append("trigger failed on an idle bus")
+    if sensor.collect():
+        errors.append("collect succeeded before the conversion time")
+    vt.advance(sensor.mode[-1])
+    if not sensor.collect() or abs(sensor.temperature - 23.4) > 0.01 or abs(sensor.humidity - 56.7) > 0.01:
+        errors.append("bad reading {} {}".format(sensor.temperature, sensor.humidity))
+    return errors
+
+
+def check_busy_bus(sensor, device, i2c, vt):
+    '''A busy bus is not waited for.'''
+    errors = []
+    i2c.try_lock()
+    if sensor.trigger() is not None:
+        errors.append("trigger did not notice the busy bus")
+    i2c.unlock()
+    return errors
+
+
+def check_measure(sensor, device, i2c, vt):
+    '''measure() yields for the conversion instead of blocking the loop.'''
+    errors = []
+    device.temperature = 19.0
+    ticks = []
+
+    async def other_task():
+        for _ in range(5):
+            ticks.append(vt.monotonic())
+            await asyncio.sleep(0.002)
+
+    async def both():
+        results = await asyncio.gather(sensor.measure(), other_task())
+        return results[0]
+
+    slept = vt.slept
+    if not vt.run(both()) or abs(sensor.temperature - 19.0) > 0.01:
+        errors.append("measure() failed: {}".format(sensor.last_error))
+    if vt.slept != slept:
+        errors.append("measure() blocked in time.sleep()")
+    if len(ticks) != 5 or ticks[-1] - ticks[0] > 0.0085:
+        errors.append("other task starved: {}".format(ticks))
+    return errors
+
+
+def check_crc(sensor, device, i2c, vt):
+    '''A corrupted transfer keeps the cached reading.'''
+    cached = sensor.temperature
+    sensor.trigger()
+    vt.advance(sensor.mode[-1])
+    device._payload[1] ^= 0xFF
+    if sensor.collect() or sensor.temperature != cached:
+        return ["CRC error not detected"]
+    return []
+
+
+def check_run(sensor, device, i2c, vt):
+    '''The background task keeps the cache fresh.'''
+    device.temperature, device.humidity = 25.0, 40.0
+    readings = sensor.readings
+
+    async def run_for(seconds):
+        try:
+            await asyncio.wait_for(sensor.run(2), seconds)
+        except asyncio.TimeoutError:
+            pass
+    vt.run(run_for(10.5))
+    if sensor.readings - readings != 6 or abs(sensor.temperature - 25.0) > 0.01:
+        return ["run() made {} readings".format(sensor.readings - readings)]
+    return []
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    device = sim_i2c.SHT40(temperature=23.4, humidity=56.7)
+    i2c = busio.I2C(None, None)
+    i2c.devices[0x44] = device
+    sensor = sht40.SHT40(i2c)
+    with VirtualTime(start=1736965800) as vt:
+        return scenarios.run([check_collect, check_busy_bus, check_measure, check_crc, check_run], sensor, device, i2c, vt)
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## SHT40 driver check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
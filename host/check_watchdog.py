@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check the task watchdog of `src/code_MatrixClock.py` in the simulator.
+
+Under virtual time:
+
+* a healthy clock keeps feeding the watchdog;
+* when the sensor task dies, the watchdog is no longer fed, a crash record
+  is written to NVM and the board would be reset within the timeout;
+* the next boot reports the crash record and clears it;
+* in `DEBUG` mode the watchdog is not armed, and tracking the tasks
+  neither feeds it nor journals a crash.
+
+    python host/check_watchdog.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import calendar
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import scenarios
+import simulator
+from virtual_time import VirtualTime
+
+START = calendar.timegm((2025, 1, 15, 12, 0, 0))
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def check_dead_task(microcontroller):
+    '''A healthy clock feeds the watchdog, a dead sensor task trips it, the next boot reports it.'''
+    errors = []
+    wdt_hw = microcontroller.watchdog
+
+    with VirtualTime(start=START) as vt:
+        clock = simulator.load_clock()
+        ns = clock.ns
+        with contextlib.redirect_stdout(io.StringIO()):
+            clock.run(60, vt)
+        wdt = ns["wdt"]
+        if wdt_hw.feeds < 10 or wdt_hw.expired or wdt.tripped is not None:
+            errors.append("healthy clock: {} feeds, expired {}, tripped {}".format(wdt_hw.feeds, wdt_hw.expired, wdt.tripped))
+        if set(wdt._deadlines) != {"render", "sensor", "ntp", "wifi"}:
+            errors.append("tasks checking in: {}".format(sorted(wdt._deadlines)))
+
+        ## The sensor task dies with an exception
+        async def broken():
+            raise RuntimeError("I2C bus stuck")
+        ns["sensor"].measure = broken
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            clock.run(60, vt)
+        crash = wdt.load()
+        if not wdt_hw.expired:
+            errors.append("dead sensor task: watchdog still fed")
+        if crash is None or crash[0] not in ("RuntimeError", "stalled sensor") or crash[1] < 60 or crash[3] <= 0:
+            errors.append("dead sensor task: crash record {}".format(crash))
+        if "Watchdog no longer fed" not in console.getvalue():
+            errors.append("dead sensor task: not reported")
+
+        ## Next boot
+        microcontroller.cpu.reset_reason = microcontroller.ResetReason.WATCHDOG
+        wdt_hw.deinit()
+        clock = simulator.load_clock()
+        report = [line for line in clock.console.splitlines() if "Last run crashed" in line]
+        if crash is not None and report != ["!! Last run crashed: {} after {}s, last check-in: {}, free heap: {}".format(*crash)]:
+            errors.append("next boot: crash reported as {}".format(report))
+        if clock.ns["wdt"].load() is not None:
+            errors.append("next boot: crash record not cleared")
+    microcontroller.cpu.reset_reason = microcontroller.ResetReason.POWER_ON
+    wdt_hw.deinit()
+    return errors
+
+
+def check_debug_mode(microcontroller):
+    '''The unarmed watchdog of DEBUG mode is never fed, nothing is journaled.'''
+    errors = []
+    microcontroller.nvm.erase()
+    wdt_hw = microcontroller.watchdog
+    feeds = wdt_hw.feeds
+    script = os.path.join(tempfile.gettempdir(), "check_watchdog_debug.py")
+    with open(os.path.join(simulator.SRC_DIR, "code_MatrixClock.py"), encoding="utf-8") as f:
+        source = f.read()
+    with open(script, "w", encoding="utf-8") as f:
+        f.write(source.replace("\nDEBUG = False\n", "\nDEBUG = True\n", 1))
+    with VirtualTime(start=START) as vt:
+        clock = simulator.load_clock(script)
+        console = io.StringIO()
+        with contextlib.redirect_stdout(console):
+            clock.run(60, vt)
+            clock.ns["log"].flush()
+    wdt = clock.ns["wdt"]
+    if not clock.ns["DEBUG"]:
+        errors.append("DEBUG not set")
+    if wdt_hw.mode is not None or wdt_hw.feeds != feeds:
+        errors.append("watchdog armed ({}) or fed {} times".format(wdt_hw.mode, wdt_hw.feeds - feeds))
+    if wdt.tripped is not None or wdt.load() is not None or "Task error" in console.getvalue():
+        errors.append("tripped {}, crash record {}".format(wdt.tripped, wdt.load()))
+    return errors
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    simulator.setup()
+    os.environ["SIM_NVM"] = os.path.join(tempfile.gettempdir(), "check_watchdog_nvm.bin")
+    import microcontroller
+    microcontroller.nvm.erase()
+    return scenarios.run([check_dead_task, check_debug_mode], microcontroller)
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## Watchdog check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
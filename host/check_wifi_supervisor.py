@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""
+Check `src/wifi_supervisor.py` against the simulated ESP32.
+
+Under virtual time, with a ticker task standing in for the render loop:
+
+* an unreachable AP is retried with growing backoff and escalates to
+  `esp.reset()`, and the link comes up once the AP is back;
+* a wedged SPI link (`TimeoutError: Timed out waiting for SPI char`)
+  degrades the link and is recovered by a reset within seconds;
+* no exception escapes and the ticker is never held up.
+
+    python host/check_wifi_supervisor.py
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import scenarios
+from virtual_time import VirtualTime
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(os.path.dirname(HOST_DIR), "src"), os.path.join(HOST_DIR, "sim")]
+
+from adafruit_esp32spi import adafruit_esp32spi  # noqa: E402
+import wifi_supervisor  # noqa: E402
+
+## Longest gap the render loop may see between two 100ms ticks
+MAX_GAP = 0.15
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def supervise(vt, wifi, seconds, events=()):
+    '''
+    Run wifi.run() and a 10 Hz ticker for seconds; events are (at, callable).
+
+    Returns the longest gap between ticks and the exception that escaped, if any.
+    '''
+    gaps = [0.0]
+    escaped = []
+
+    async def ticker():
+        last = vt.monotonic()
+        while True:
+            await asyncio.sleep(0.1)
+            now = vt.monotonic()
+            gaps[0] = max(gaps[0], now - last)
+            last = now
+
+    async def inject():
+        start = vt.monotonic()
+        for at, event in events:
+            await asyncio.sleep(start + at - vt.monotonic())
+            event()
+
+    async def main():
+        tasks = [asyncio.create_task(wifi.run()), asyncio.create_task(ticker()), asyncio.create_task(inject())]
+        await asyncio.sleep(seconds)
+        for task in tasks:
+            if task.done() and task.exception() is not None:
+                escaped.append(task.exception())
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    vt.run(main())
+    return gaps[0], escaped[0] if escaped else None
+
+
+##=============================================================================
+def check_unreachable_ap(vt, esp, wifi, states):
+    '''Backoff, reset after 3 failures, connected once the AP is back.'''
+    errors = []
+    ESP = adafruit_esp32spi.ESP_SPIcontrol
+
+    def ap_back():
+        ESP.ap_reachable = True
+    gap, escaped = supervise(vt, wifi, 60, ((40, ap_back),))
+    if escaped is not None or gap > MAX_GAP:
+        errors.append("escaped {!r}, ticker gap {:.2f}s".format(escaped, gap))
+    if esp.resets < 1 or wifi.state != wifi_supervisor.CONNECTED or wifi.connects != 1:
+        errors.append("{} resets, state {}, {} connects".format(esp.resets, wifi.state, wifi.connects))
+    attempts = [at for at, state in states if state == wifi_supervisor.ASSOCIATING]
+    pauses = [b - a for a, b in zip(attempts, attempts[1:])]
+    if len(pauses) < 2 or not pauses[1] > pauses[0]:
+        errors.append("no growing backoff between attempts {}".format(pauses))
+    if wifi_supervisor.RESETTING not in [state for _, state in states]:
+        errors.append("never escalated to a reset")
+    return errors
+
+
+def check_wedged_spi(vt, esp, wifi, states):
+    '''A wedged SPI link while connected degrades the link and is recovered by a reset.'''
+    errors = []
+    ESP = adafruit_esp32spi.ESP_SPIcontrol
+    states.clear()
+    resets, connects = esp.resets, wifi.connects
+
+    def wedge():
+        ESP.wedged = True
+    gap, escaped = supervise(vt, wifi, 60, ((5, wedge),))
+    seen = [state for _, state in states]
+    if escaped is not None or gap > MAX_GAP:
+        errors.append("escaped {!r}, ticker gap {:.2f}s".format(escaped, gap))
+    if seen[:4] != [wifi_supervisor.DEGRADED, wifi_supervisor.RESETTING, wifi_supervisor.IDLE, wifi_supervisor.ASSOCIATING]:
+        errors.append("states {}".format(seen))
+    if esp.resets != resets + 1 or wifi.connects != connects + 1 or wifi.state != wifi_supervisor.CONNECTED:
+        errors.append("{} resets, {} connects, state {}".format(esp.resets - resets, wifi.connects - connects, wifi.state))
+    recovered = [at for at, state in states if state == wifi_supervisor.CONNECTED]
+    if not recovered or recovered[0] - states[0][0] > 40:
+        errors.append("not recovered within 40s")
+    if wifi.transport_errors < wifi.reset_after:
+        errors.append("{} transport errors counted".format(wifi.transport_errors))
+    return errors
+
+
+def check():
+    '''Return a list of failed checks (empty if fine).'''
+    random.seed(0)  # backoff jitter
+    ESP = adafruit_esp32spi.ESP_SPIcontrol
+    with VirtualTime(start=1736965800) as vt:
+        ESP.ap_reachable = False
+        esp = ESP(None, None, None, None)
+        states = []
+        wifi = wifi_supervisor.WifiSupervisor(esp, "ssid", "password", timeout=5, min_backoff=2, reset_after=3,
+                                              on_state=lambda wifi, old: states.append((vt.monotonic(), wifi.state)))
+        return scenarios.run([check_unreachable_ap, check_wedged_spi], vt, esp, wifi, states)
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    errors = check()
+    for error in errors:
+        print("!!", error)
+    print("## Wi-Fi supervisor check:", "FAILED" if errors else "ok")
+    sys.exit(1 if errors else 0)
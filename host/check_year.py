@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run the clock through a full year of virtual time.
+
+The firmware is booted in the simulator on 2027-12-31 and runs to
+2029-01-01: both New Years, the leap day 2028-02-29 and both DST
+transitions. Its own scheduler (without the render and sensor jobs) and
+`_fade_display()` task run on a virtual time event loop, so NTP is queried
+exactly when the firmware schedules it. Render ticks (`clocktick()`) are run around every hour
+boundary and every day/night switch, and the time between them is skipped;
+about 20k ticks cover the year in about 10s of wall time. Frames are
+counted but not composited.
+
+At every tick the expected state is computed independently of the firmware
+(`zoneinfo` for Europe/Berlin, the rules of `theme_schedule` restated):
+
+* the displayed hours and minutes and the civil date of the clock;
+* the clock against the true time (to the second);
+* day/night: the old theme just before a switch, the new one (fade done)
+  4.5s after it.
+
+NTP: one sync at boot, then one every `NTP_INTERVAL` (the sync itself
+adds a few ms), none failed.
+
+    python host/check_year.py
+    python host/check_year.py --days 30
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import asyncio
+import calendar
+import datetime
+import os
+import sys
+import tempfile
+import time
+import zoneinfo
+
+import scenarios
+import simulator
+from virtual_time import VirtualTime
+
+START = calendar.timegm((2027, 12, 31, 12, 0, 0))
+DAYS = 367
+ZONE = zoneinfo.ZoneInfo("Europe/Berlin")
+## Day/night rules of theme_schedule.RULES, restated: wake up at 7 on workdays, 8 on weekends, night from 20:00
+WAKE = (7, 7, 7, 7, 7, 8, 8)
+NIGHT = 20
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def local(ts):
+    '''Local civil time of a UTC timestamp.'''
+    return datetime.datetime.fromtimestamp(ts, ZONE)
+
+
+def expected_theme(ts):
+    now = local(ts)
+    return "day" if WAKE[now.weekday()] <= now.hour < NIGHT else "night"
+
+
+def switches(start, end):
+    '''UTC instants of the day/night switches in [start, end).'''
+    day = local(start).date()
+    while True:
+        for hour in (WAKE[day.weekday()], NIGHT):
+            ts = datetime.datetime(day.year, day.month, day.day, hour, tzinfo=ZONE).timestamp()
+            if ts >= end:
+                return
+            if ts >= start:
+                yield ts
+        day += datetime.timedelta(days=1)
+
+
+##=============================================================================
+class YearRun:
+    '''The booted firmware, its NTP task on a virtual time loop, and the checks.'''
+
+    def __init__(self, vt):
+        self.vt = vt
+        self.errors = []
+        self.ticks = 0
+        ## Last text shown on the clock face, from the first frame on
+        self.shown = None
+        import clock_face
+        show = clock_face.ClockFace.show
+
+        def record(face, text):
+            self.shown = text
+            show(face, text)
+        clock_face.ClockFace.show = record
+        try:
+            self.clock = simulator.load_clock()
+        finally:
+            clock_face.ClockFace.show = show
+        ns = self.ns = self.clock.ns
+        ns["clock_face"].show = lambda text: record(ns["clock_face"], text)
+        ## Successful and failed syncs, in virtual UTC
+        self.syncs = []
+        sync = ns["sync_time_via_ntp"]
+
+        async def record_sync():
+            at = vt.time()
+            await sync()
+            self.syncs.append((at, ns["ntp_client"].consecutive_failures == 0))
+        ns["sync_time_via_ntp"] = record_sync
+        self.loop = vt.new_event_loop()
+        self.loop.run_until_complete(ns["wifi"].connect())
+        ## The firmware's scheduler runs NTP and checkpoints; render ticks are driven below
+        ns["scheduler"].pause("render")
+        ns["scheduler"].pause("sensor")
+        self.loop.create_task(ns["scheduler"].run())
+        ## Fades run at FADE_FPS between the ticks, as on the board
+        ns["fade_event"] = asyncio.Event()
+        self.loop.create_task(ns["_fade_display"]())
+
+    def close(self):
+        for task in asyncio.all_tasks(self.loop):
+            task.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+
+    ##-------------------------------------------------------------------------
+    def run_to(self, ts):
+        '''Let the background tasks run until UTC ts.'''
+        delay = ts - self.vt.time()
+        if delay > 0:
+            self.loop.run_until_complete(asyncio.sleep(delay))
+        ## Keep the console buffer from overflowing between drains
+        self.ns["log"].flush()
+
+    def tick(self, ts):
+        '''One main loop iteration at UTC ts; returns the expected local time.'''
+        self.run_to(ts)
+        ns = self.ns
+        self.ns["clocktick"]()
+        self.ticks += 1
+        now = self.vt.time()
+        expected = local(now)
+        ## Ticks are half a second off the second boundaries, so whole seconds must match
+        clock_time = ns["clock"].time()
+        if clock_time != int(now):
+            self.fail(now, "clock off by {}s".format(clock_time - int(now)))
+        shown = self.shown.replace(" ", ":") if self.shown else None
+        if shown != "{:d}:{:02d}".format(expected.hour, expected.minute):
+            self.fail(now, "shows {}".format(self.shown))
+        civil = ns["datetime_util"].epoch_to_civil(int(clock_time) + ns["timezone"].utcoffset(clock_time))
+        if tuple(civil[:3]) != (expected.year, expected.month, expected.day) or civil[6] != expected.weekday():
+            self.fail(now, "civil date {}".format(civil[:7]))
+        return expected
+
+    def fail(self, ts, message):
+        if len(self.errors) < 20:
+            self.errors.append("{}: {}".format(local(ts).isoformat(), message))
+
+    ##-------------------------------------------------------------------------
+    def check_theme(self, ts, theme):
+        self.tick(ts)
+        face, fader = self.ns["clock_face"], self.ns["fader"]
+        if face.theme != theme or fader.theme != theme or fader.active:
+            self.fail(ts, "theme {} (fader {}, active {}) instead of {}".format(face.theme, fader.theme, fader.active, theme))
+
+
+##=============================================================================
+def check_ticks(run, start, end):
+    '''Displayed time, date and theme at boot, around every hour and every day/night switch.'''
+    ## Boot: first frame, then the first sync and day/night settle
+    for second in range(9):
+        run.tick(start + second + 0.5)
+    run.check_theme(start + 9.5, expected_theme(start))
+    ## Switches are on the hour: their window covers the hour as well
+    events = sorted([(ts, 1) for ts in range((start // 3600 + 1) * 3600, end, 3600)] +
+                    [(ts, 0) for ts in switches(start + 60, end)])
+    for ts, hour in events:
+        if ts - 0.5 < run.vt.time():
+            continue
+        if hour:
+            ## Both sides of the hour: DST, midnight, New Year, leap day
+            run.tick(ts - 0.5)
+            run.tick(ts + 0.5)
+        else:
+            ## The tick after the switch starts the fade, out and in take 2 * FADE_TIME
+            run.check_theme(ts - 0.5, expected_theme(ts - 1))
+            for second in range(4):
+                run.tick(ts + second + 0.5)
+            run.check_theme(ts + 4.5, expected_theme(ts))
+    run.run_to(end)
+    return run.errors
+
+
+def check_ntp(run, start, end):
+    '''NTP: at boot, then every NTP_INTERVAL, none failed.'''
+    errors = []
+    interval = run.ns["NTP_INTERVAL"]
+    times = [at for at, _ in run.syncs]
+    failed = [at for at, ok in run.syncs if not ok]
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    if failed:
+        errors.append("{} failed syncs, first at {}".format(len(failed), local(failed[0]).isoformat()))
+    if not times or times[0] - start > 5:
+        errors.append("no sync at boot")
+    if gaps and (min(gaps) < interval or max(gaps) > interval + 1):
+        errors.append("syncs {:.3f}s to {:.3f}s apart instead of {}s".format(min(gaps), max(gaps), interval))
+    if times and len(times) != int(end - times[0]) // interval + 1:
+        errors.append("{} syncs in {} days".format(len(times), (end - start) // 86400))
+    return errors
+
+
+def check(days=DAYS, start=START):
+    '''Return a list of failed checks (empty if fine).'''
+    simulator.setup()
+    os.environ["SIM_NVM"] = os.path.join(tempfile.gettempdir(), "check_year_nvm.bin")
+    ## Default time zone (CET) and no holidays, as restated above
+    os.environ.pop("TIMEZONE", None)
+    os.environ.pop("HOLIDAYS", None)
+    import microcontroller
+    import framebufferio
+    microcontroller.nvm.erase()
+    end = start + days * 86400
+    stdout = sys.stdout
+    with VirtualTime(start=start) as vt:
+        run = YearRun(vt)
+        sys.stdout = simulator.NullWriter()
+        ## Checks read the clock face, not pixels
+        framebufferio.FramebufferDisplay.composite = False
+        try:
+            errors = scenarios.run([check_ticks, check_ntp], run, start, end)
+        finally:
+            sys.stdout = stdout
+            framebufferio.FramebufferDisplay.composite = True
+            run.close()
+    print("## {} days: {} ticks, {} NTP syncs, {} theme switches".format(
+        days, run.ticks, len(run.syncs), sum(1 for _ in switches(start + 60, end))))
+    return errors
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the clock through a year of virtual time.")
+    parser.add_argument("--days", type=int, default=DAYS, help="days to simulate from 2027-12-31 12:00 UTC")
+    args = parser.parse_args()
+    t0 = time.perf_counter()
+    errors = check(args.days)
+    for error in errors:
+        print("!!", error)
+    print("## Year check:", "FAILED" if errors else "ok", "({:.1f}s)".format(time.perf_counter() - t0))
+    sys.exit(1 if errors else 0)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+Local NTP stand-in server for host simulations.
+
+`NTPResponder` builds server replies from the host clock (virtual time if
+installed), optionally offset, delayed, dropped or answered with a
+kiss-o'-death. It is used in-process by the simulator's socket pool, and
+`serve()` exposes it as a real UDP server:
+
+    python host/ntp_server.py --port 12300 --offset 0.250
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import random
+import socket
+import struct
+import threading
+import time
+
+## Seconds from 1900-01-01 (NTP era 0) to 1970-01-01
+NTP_TO_UNIX = 2_208_988_800
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def to_ntp(utc_ns):
+    '''UTC nanoseconds to a 64 bit NTP timestamp (seconds, fraction).'''
+    seconds, ns = divmod(utc_ns, 1_000_000_000)
+    return (seconds + NTP_TO_UNIX) & 0xFFFF_FFFF, (ns << 32) // 1_000_000_000
+
+
+##=============================================================================
+class NTPResponder:
+    '''
+    Answer NTP client requests.
+
+    Parameters
+    ----------
+    offset : float
+        seconds added to the reported time (a server that is off)
+    delay : float
+        one-way network delay in seconds, each direction
+    jitter : float
+        random extra one-way delay, uniformly 0..jitter seconds
+    processing : float
+        seconds between receive (t2) and transmit (t3) timestamps
+    drop : float
+        probability of not answering at all
+    stratum : int
+        0 answers with a kiss-o'-death packet
+    '''
+
+    def __init__(self, *, offset=0.0, delay=0.0, jitter=0.0, processing=0.0, drop=0.0, stratum=2, seed=None):
+        self.offset = offset
+        self.delay = delay
+        self.jitter = jitter
+        self.processing = processing
+        self.drop = drop
+        self.stratum = stratum
+        self._random = random.Random(seed)
+        ## Number of requests seen and answered
+        self.requests = 0
+        self.replies = 0
+
+    def one_way_delay(self):
+        return self.delay + self._random.uniform(0, self.jitter) if self.jitter else self.delay
+
+    def respond(self, request, recv_utc_ns=None):
+        '''
+        Build the reply to a request received at recv_utc_ns (true UTC).
+
+        Returns
+        -------
+        reply : bytes or None
+            None if the request is dropped.
+        '''
+        self.requests += 1
+        if len(request) < 48 or self._random.random() < self.drop:
+            return None
+        if recv_utc_ns is None:
+            recv_utc_ns = time.time_ns()
+        skew_ns = int(self.offset * 1_000_000_000)
+        t2 = to_ntp(recv_utc_ns + skew_ns)
+        t3 = to_ntp(recv_utc_ns + skew_ns + int(self.processing * 1_000_000_000))
+        version = (request[0] >> 3) & 0b111 or 4
+        reply = bytearray(48)
+        reply[0] = (version << 3) | 4  # LI 0, mode 4 (server)
+        reply[1] = self.stratum
+        reply[2] = request[2]  # poll
+        reply[3] = 0xEC  # precision 2^-20 s
+        reply[12:16] = b"RATE" if self.stratum == 0 else b"LOCL"
+        struct.pack_into("!II", reply, 16, *t2)  # reference timestamp
+        reply[24:32] = request[40:48]  # originate = client's transmit timestamp
+        struct.pack_into("!II", reply, 32, *t2)  # receive timestamp
+        struct.pack_into("!II", reply, 40, *t3)  # transmit timestamp
+        self.replies += 1
+        return bytes(reply)
+
+
+##=============================================================================
+def serve(responder, host="127.0.0.1", port=0):
+    '''
+    Serve a responder on a real UDP socket from a daemon thread.
+
+    Delays are real (not virtual) sleeps on the server thread.
+
+    Returns
+    -------
+    address : tuple
+        (host, port) the server listens on
+    stop : callable
+        shuts the server down
+    '''
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.settimeout(0.2)
+    running = threading.Event()
+    running.set()
+
+    def loop():
+        while running.is_set():
+            try:
+                request, client = sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            delay = responder.one_way_delay()
+            if delay:
+                threading.Event().wait(delay)
+            reply = responder.respond(request)
+            if reply is not None:
+                if delay:
+                    threading.Event().wait(delay + responder.processing)
+                sock.sendto(reply, client)
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+
+    def stop():
+        running.clear()
+        thread.join()
+        sock.close()
+
+    return sock.getsockname(), stop
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local NTP stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12300)
+    parser.add_argument("--offset", type=float, default=0.0, help="seconds added to the reported time")
+    parser.add_argument("--delay", type=float, default=0.0, help="one-way delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra one-way delay in seconds")
+    parser.add_argument("--drop", type=float, default=0.0, help="probability of dropping a request")
+    parser.add_argument("--stratum", type=int, default=2, help="0 sends kiss-o'-death replies")
+    args = parser.parse_args()
+
+    responder = NTPResponder(offset=args.offset, delay=args.delay, jitter=args.jitter, drop=args.drop, stratum=args.stratum)
+    address, stop = serve(responder, args.host, args.port)
+    print("## NTP stand-in listening on %s:%d (Ctrl-C to stop)" % address)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop()
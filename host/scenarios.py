@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared runner of the host checks.
+
+A check script has one function per scenario, each returning a list of
+failed checks, and folds them into its `check()`:
+
+    def check():
+        sensor = ...
+        return scenarios.run([check_trigger, check_measure], sensor)
+
+Every failure is prefixed with the scenario it came from; an exception in
+a scenario is a failure of that scenario and does not stop the others.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def name(scenario):
+    '''Name of a scenario function without the check_ prefix.'''
+    name = scenario.__name__
+    return name[6:] if name.startswith("check_") else name
+
+
+def run(checks, *args):
+    '''
+    Run scenario functions in order.
+
+    Parameters
+    ----------
+    checks : list of callable
+        scenarios, called with *args, returning a list of failures
+    *args
+        shared fixtures, e.g. the simulated device
+
+    Returns
+    -------
+    errors : list of str
+        all failures, prefixed with the scenario name
+    '''
+    errors = []
+    for scenario in checks:
+        try:
+            failures = scenario(*args)
+        except Exception as e:
+            failures = ["raised {!r}".format(e)]
+        errors.extend("{}: {}".format(name(scenario), failure) for failure in failures)
+    return errors
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_bitmap_font.bdf`.
+
+Like the real loader, only the header is parsed up front; glyphs are read
+lazily by scanning the whole file whenever missing code points are requested.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import displayio
+from fontio import Glyph
+
+from .glyph_cache import GlyphCache
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class BDF(GlyphCache):
+    '''Loads glyphs from a BDF file.'''
+
+    def __init__(self, f, bitmap_class=displayio.Bitmap):
+        super().__init__()
+        self.file = f
+        self.bitmap_class = bitmap_class
+        self.name = f
+        self._boundingbox = None
+        self._ascent = None
+        self._descent = None
+        self._read_header()
+
+    @property
+    def ascent(self):
+        return self._ascent
+
+    @property
+    def descent(self):
+        return self._descent
+
+    def get_bounding_box(self):
+        return self._boundingbox
+
+    def load_glyphs(self, code_points):
+        if isinstance(code_points, int):
+            code_points = (code_points,)
+        elif isinstance(code_points, str):
+            code_points = [ord(c) for c in code_points]
+        remaining = set(code_points) - set(self._glyphs)
+        if not remaining:
+            return
+        self._read_glyphs(remaining)
+
+        ## Remember code points the font does not have
+        for code_point in remaining:
+            self._glyphs[code_point] = None
+
+    def _read_header(self):
+        '''Read the font bounding box, ascent and descent up to CHARS.'''
+        self.file.seek(0)
+        for line in self.file:
+            line = line.strip()
+            if line.startswith("FONTBOUNDINGBOX "):
+                self._boundingbox = tuple(int(v) for v in line.split()[1:5])
+            elif line.startswith("FONT_ASCENT "):
+                self._ascent = int(line.split()[1])
+            elif line.startswith("FONT_DESCENT "):
+                self._descent = int(line.split()[1])
+            elif line.startswith("CHARS "):
+                break
+        if self._ascent is None:
+            self._ascent = self._boundingbox[1] + self._boundingbox[3]
+        if self._descent is None:
+            self._descent = -self._boundingbox[3]
+
+    def _read_glyphs(self, remaining):
+        '''Scan the file for the code points in remaining; found ones are removed from it.'''
+        self.file.seek(0)
+        code_point = None
+        shift = (0, 0)
+        bbx = None
+        rows = None
+        for line in self.file:
+            if rows is not None and not line.startswith("ENDCHAR"):
+                rows.append(int(line.strip(), 16))
+            elif line.startswith("ENCODING "):
+                code_point = int(line.split()[1])
+            elif line.startswith("DWIDTH "):
+                shift = tuple(int(v) for v in line.split()[1:3])
+            elif line.startswith("BBX "):
+                bbx = tuple(int(v) for v in line.split()[1:5])
+            elif line.startswith("BITMAP"):
+                rows = [] if code_point in remaining else None
+            elif line.startswith("ENDCHAR") and rows is not None:
+                self._glyphs[code_point] = self._make_glyph(bbx, shift, rows)
+                remaining.discard(code_point)
+                if not remaining:
+                    break
+                rows = None
+
+    def _make_glyph(self, bbx, shift, rows):
+        width, height, dx, dy = bbx
+        bitmap = self.bitmap_class(width, height, 2)
+        row_bits = ((width + 7) // 8) * 8
+        for y, row in enumerate(rows[:height]):
+            for x in range(width):
+                if row & (1 << (row_bits - 1 - x)):
+                    bitmap[x, y] = 1
+        return Glyph(bitmap, 0, width, height, dx, dy, shift[0], shift[1])
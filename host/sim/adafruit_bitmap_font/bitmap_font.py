@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_bitmap_font.bitmap_font`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import displayio
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def load_font(filename, bitmap=None):
+    '''Load a BDF font; glyphs are loaded on demand.'''
+    if bitmap is None:
+        bitmap = displayio.Bitmap
+    font_file = open(filename, "r", encoding="latin-1")
+    first = font_file.read(16)
+    font_file.seek(0)
+    if first.startswith("STARTFONT "):
+        from . import bdf
+        return bdf.BDF(font_file, bitmap)
+    raise ValueError("Unknown magic number %r" % first[:4])
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_bitmap_font.glyph_cache`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class GlyphCache:
+    '''Glyphs loaded so far, keyed by code point.'''
+
+    def __init__(self):
+        self._glyphs = {}
+
+    def load_glyphs(self, code_points):
+        pass
+
+    def get_glyph(self, code_point):
+        if code_point not in self._glyphs:
+            self.load_glyphs((code_point,))
+        return self._glyphs.get(code_point)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_connection_manager`.
+
+The socket pool of the simulated ESP32 is backed by the host's `socket`
+module. Datagrams to addresses registered with `register_host()` never
+touch the network: they are answered in-process by a responder object (see
+`host/ntp_server.py`), with delays measured in `time.monotonic()` so that
+virtual time applies.
+
+Socket calls fail like on the board when the ESP32 is wedged (SPI
+TimeoutError) or not connected ("Failed to send UDP data").
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import errno
+import socket
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+## host name -> IP address
+_hosts = {}
+## (IP address, port) -> responder with respond(request, recv_utc_ns), one_way_delay() and processing
+_responders = {}
+
+
+##=============================================================================
+def register_host(name, address, responder=None, port=123):
+    '''Resolve name to address, and answer datagrams to (address, port) with responder.'''
+    _hosts[name] = address
+    if responder is not None:
+        _responders[(address, port)] = responder
+
+
+##=============================================================================
+class _DatagramSocket:
+    '''UDP socket answering registered addresses in-process.'''
+
+    def __init__(self, pool, family, type, proto):
+        self._pool = pool
+        self._args = (family, type, proto)
+        self._real = None
+        self._timeout = None
+        self._peer = None
+        self._inbox = []  # (ready at monotonic, payload, sender)
+
+    def _host_socket(self):
+        if self._real is None:
+            self._real = socket.socket(*self._args)
+            self._real.settimeout(self._timeout)
+        return self._real
+
+    def settimeout(self, value):
+        self._timeout = value
+        if self._real is not None:
+            self._real.settimeout(value)
+
+    def connect(self, address):
+        self._peer = tuple(address)
+
+    def send(self, data):
+        return self.sendto(data, self._peer)
+
+    def sendto(self, data, address):
+        self._pool._check()
+        address = tuple(address)
+        responder = _responders.get(address)
+        if responder is None:
+            return self._host_socket().sendto(data, address)
+        there = responder.one_way_delay()
+        reply = responder.respond(bytes(data), time.time_ns() + int(there * 1_000_000_000))
+        if reply is not None:
+            ready = time.monotonic() + there + responder.processing + responder.one_way_delay()
+            self._inbox.append((ready, reply, address))
+        return len(data)
+
+    def _receive(self):
+        if self._real is not None and not self._inbox:
+            return None
+        now = time.monotonic()
+        if self._inbox and self._inbox[0][0] <= now:
+            return self._inbox.pop(0)
+        if self._timeout == 0:
+            raise OSError(errno.EAGAIN, "EAGAIN")
+        if self._inbox and (self._timeout is None or self._inbox[0][0] - now <= self._timeout):
+            time.sleep(self._inbox[0][0] - now)
+            return self._inbox.pop(0)
+        time.sleep(self._timeout or 0)
+        raise OSError(errno.ETIMEDOUT, "ETIMEDOUT")
+
+    def recvfrom_into(self, buffer, nbytes=0):
+        self._pool._check()
+        message = self._receive()
+        if message is None:
+            return self._real.recvfrom_into(buffer, nbytes)
+        payload = message[1][:nbytes or len(buffer)]
+        buffer[:len(payload)] = payload
+        return len(payload), message[2]
+
+    def recv_into(self, buffer, nbytes=0):
+        return self.recvfrom_into(buffer, nbytes)[0]
+
+    def close(self):
+        if self._real is not None:
+            self._real.close()
+        self._inbox = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+##=============================================================================
+class SocketPool:
+    '''Socket pool backed by host sockets.'''
+
+    AF_INET = socket.AF_INET
+    SOCK_STREAM = socket.SOCK_STREAM
+    SOCK_DGRAM = socket.SOCK_DGRAM
+    IPPROTO_UDP = socket.IPPROTO_UDP
+    timeout = socket.timeout
+    gaierror = socket.gaierror
+
+    def __init__(self, radio):
+        self._radio = radio
+
+    def _check(self):
+        check = getattr(self._radio, "_check", None)
+        if check is not None:
+            check()
+        if not getattr(self._radio, "is_connected", True):
+            raise ConnectionError("Failed to send UDP data")
+
+    def socket(self, family=socket.AF_INET, type=socket.SOCK_STREAM, proto=0):
+        if type == socket.SOCK_DGRAM:
+            return _DatagramSocket(self, family, type, proto)
+        return socket.socket(family, type, proto)
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        self._check()
+        if host in _hosts:
+            return [(socket.AF_INET, socket.SOCK_DGRAM, 0, "", (_hosts[host], port))]
+        return socket.getaddrinfo(host, port, family, type, proto, flags)
+
+
+_pools = {}
+
+
+##=============================================================================
+def get_radio_socketpool(radio):
+    '''Return the (cached) socket pool for radio.'''
+    key = id(radio)
+    if key not in _pools:
+        _pools[key] = SocketPool(radio)
+    return _pools[key]
+
+
+def get_radio_ssl_context(radio):
+    return None
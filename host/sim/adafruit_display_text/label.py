@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_display_text.label`.
+
+Text is rendered into one bitmap per layout, as the real Label does. The
+label origin is at the left edge, vertically centered on the font's ascent.
+Assigning `text` or `font` always triggers a full relayout.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import displayio
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class Label(displayio.Group):
+    '''A single line text label.'''
+
+    def __init__(self, font, *, text="", color=0xFFFFFF, background_color=None,
+                 scale=1, x=0, y=0, **kwargs):
+        super().__init__(scale=scale, x=x, y=y)
+        self._palette = displayio.Palette(2)
+        self._palette.make_transparent(0)
+        self._color = None
+        self._background_color = None
+        self.color = color
+        self.background_color = background_color
+        self._font = font
+        self._text = ""
+        self._bounding_box = (0, 0, 0, 0)
+        self._ascent, self._descent = self._get_ascent_descent()
+        ## Number of relayouts, for profiling
+        self.relayouts = 0
+        self._reset_text(text)
+
+    def _get_ascent_descent(self):
+        ascent = 0
+        descent = 0
+        self._font.load_glyphs("M j'")
+        for char in "M j'":
+            glyph = self._font.get_glyph(ord(char))
+            if glyph is None:
+                continue
+            ascent = max(ascent, glyph.height + glyph.dy)
+            descent = max(descent, -glyph.dy)
+        return ascent, descent
+
+    def _reset_text(self, text):
+        self.relayouts += 1
+        self._text = text
+        while len(self):
+            self.pop()
+        self._font.load_glyphs(text)
+        y_offset = self._ascent // 2
+        placed = []
+        cursor = 0
+        left = top = right = bottom = 0
+        for char in text:
+            glyph = self._font.get_glyph(ord(char))
+            if glyph is None:
+                continue
+            gx = cursor + glyph.dx
+            gy = y_offset - glyph.height - glyph.dy
+            placed.append((glyph, gx, gy))
+            left = min(left, gx)
+            top = min(top, gy)
+            right = max(right, gx + glyph.width, cursor + glyph.shift_x)
+            bottom = max(bottom, gy + glyph.height)
+            cursor += glyph.shift_x
+        if not placed:
+            self._bounding_box = (0, 0, 0, 0)
+            return
+        width = right - left
+        height = bottom - top
+        bitmap = displayio.Bitmap(max(width, 1), max(height, 1), 2)
+        for glyph, gx, gy in placed:
+            src = glyph.bitmap
+            for yy in range(glyph.height):
+                for xx in range(glyph.width):
+                    if src[xx, yy]:
+                        bitmap[gx - left + xx, gy - top + yy] = 1
+        self.append(displayio.TileGrid(bitmap, pixel_shader=self._palette, x=left, y=top))
+        self._bounding_box = (left, top, width, height)
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, new_text):
+        self._reset_text(new_text)
+
+    @property
+    def font(self):
+        return self._font
+
+    @font.setter
+    def font(self, new_font):
+        self._font = new_font
+        self._ascent, self._descent = self._get_ascent_descent()
+        self._reset_text(self._text)
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, new_color):
+        self._color = new_color
+        if new_color is None:
+            self._palette.make_transparent(1)
+        else:
+            self._palette[1] = new_color
+            self._palette.make_opaque(1)
+
+    @property
+    def background_color(self):
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, new_color):
+        self._background_color = new_color
+        if new_color is None:
+            self._palette.make_transparent(0)
+        else:
+            self._palette[0] = new_color
+            self._palette.make_opaque(0)
+
+    @property
+    def bounding_box(self):
+        return self._bounding_box
+
+    @property
+    def width(self):
+        return self._bounding_box[2]
+
+    @property
+    def height(self):
+        return self._bounding_box[3]
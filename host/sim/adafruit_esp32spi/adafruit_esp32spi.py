@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_esp32spi.adafruit_esp32spi`.
+
+The Wi-Fi co-processor always finds the access point unless told otherwise
+through the fault injection attributes of `ESP_SPIcontrol`:
+
+* `ap_reachable = False` makes every `connect_AP` fail.
+* `connect_failures = n` makes the next n `connect_AP` calls fail.
+* `associate_time` is the time from `wifi_set_passphrase` to the AP being
+  joined (or not) when the connection is polled through `status`.
+* `wedged = True` makes every call raise the SPI TimeoutError seen in the
+  logs in `issues/` until `reset()` is called.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import time
+
+WL_NO_SHIELD = 0xFF
+WL_NO_MODULE = 0xFF
+WL_IDLE_STATUS = 0
+WL_NO_SSID_AVAIL = 1
+WL_SCAN_COMPLETED = 2
+WL_CONNECTED = 3
+WL_CONNECT_FAILED = 4
+WL_CONNECTION_LOST = 5
+WL_DISCONNECTED = 6
+WL_AP_LISTENING = 7
+WL_AP_CONNECTED = 8
+WL_AP_FAILED = 9
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+class Network:
+    def __init__(self, ssid, rssi):
+        self.ssid = ssid
+        self.rssi = rssi
+
+
+##=============================================================================
+class ESP_SPIcontrol:
+    '''ESP32 Wi-Fi co-processor on the SPI bus.'''
+
+    ap_reachable = True
+    connect_failures = 0
+    wedged = False
+    associate_time = 1.0
+
+    def __init__(self, spi, cs_dio, ready_dio, reset_dio, gpio0_dio=None, *, debug=False, debug_show_secrets=False):
+        self._ssid = None
+        self._status = WL_IDLE_STATUS
+        self._associated_at = None
+        ## Number of hard resets, for fault injection scenarios
+        self.resets = 0
+
+    def _check(self):
+        if ESP_SPIcontrol.wedged:
+            raise TimeoutError("Timed out waiting for SPI char")
+
+    @staticmethod
+    def _join():
+        if not ESP_SPIcontrol.ap_reachable:
+            return WL_NO_SSID_AVAIL
+        if ESP_SPIcontrol.connect_failures > 0:
+            ESP_SPIcontrol.connect_failures -= 1
+            return WL_CONNECT_FAILED
+        return WL_CONNECTED
+
+    @property
+    def status(self):
+        self._check()
+        if self._associated_at is not None and time.monotonic() >= self._associated_at:
+            self._associated_at = None
+            self._status = self._join()
+        return self._status
+
+    @property
+    def firmware_version(self):
+        self._check()
+        return "1.7.7"
+
+    @property
+    def MAC_address(self):
+        self._check()
+        return bytearray(b"\xb4\x8a\x0a\x8c\x18\xd8")
+
+    @property
+    def ip_address(self):
+        if self.status == WL_CONNECTED:
+            return bytearray((192, 168, 0, 98))
+        return bytearray(4)
+
+    @property
+    def is_connected(self):
+        return self.status == WL_CONNECTED
+
+    @property
+    def ap_info(self):
+        if self.status != WL_CONNECTED:
+            return None
+        return Network(self._ssid, -25)
+
+    def pretty_ip(self, ip):
+        return "%d.%d.%d.%d" % (ip[0], ip[1], ip[2], ip[3])
+
+    def wifi_set_passphrase(self, ssid, passphrase):
+        '''Start joining an AP; poll `status` for the outcome.'''
+        self._check()
+        self._ssid = ssid.decode("utf-8") if isinstance(ssid, bytes) else ssid
+        self._status = WL_IDLE_STATUS
+        self._associated_at = time.monotonic() + ESP_SPIcontrol.associate_time
+
+    def connect_AP(self, ssid, password, timeout_s=10):
+        self._check()
+        self._associated_at = None
+        self._status = self._join()
+        if self._status != WL_CONNECTED:
+            raise ConnectionError("Failed to connect to ssid", ssid)
+        self._ssid = ssid
+        return self._status
+
+    def disconnect(self):
+        self._check()
+        self._associated_at = None
+        self._status = WL_DISCONNECTED
+
+    def reset(self):
+        ESP_SPIcontrol.wedged = False
+        self._associated_at = None
+        self._status = WL_IDLE_STATUS
+        self.resets += 1
+
+    def get_host_by_name(self, hostname):
+        self._check()
+        return bytearray((127, 0, 0, 1))
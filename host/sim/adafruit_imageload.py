@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_imageload`, limited to uncompressed BMP files.
+
+Indexed (1/4/8 bit) images load with a `displayio.Palette`, 24/32 bit images
+with a `displayio.ColorConverter`, as on the device.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import struct
+
+import displayio
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def load(file_or_filename, *, bitmap=None, palette=None):
+    '''Load a BMP file into a (bitmap, palette) pair.'''
+    if bitmap is None:
+        bitmap = displayio.Bitmap
+    if palette is None:
+        palette = displayio.Palette
+    if isinstance(file_or_filename, str):
+        with open(file_or_filename, "rb") as f:
+            data = f.read()
+    else:
+        data = file_or_filename.read()
+    if data[:2] != b"BM":
+        raise ValueError("Unsupported image format")
+
+    data_start, = struct.unpack_from("<I", data, 10)
+    header_size, width, height, _, bits, compression, _, _, _, colors = struct.unpack_from("<IiiHHIIiiI", data, 14)
+    if compression not in (0, 3):
+        raise NotImplementedError("bmp compression %d" % compression)
+    ## (y, offset in data) of the rows in file order; bottom-up unless the height is negative
+    stride = ((width * bits + 31) // 32) * 4
+    rows = [(row if height < 0 else abs(height) - 1 - row, data_start + row * stride) for row in range(abs(height))]
+    if bits <= 8:
+        return _load_indexed(data, rows, width, bits, colors or (1 << bits), 14 + header_size, bitmap, palette)
+    return _load_rgb(data, rows, width, bits // 8, bitmap)
+
+
+def _load_indexed(data, rows, width, bits, colors, table, bitmap, palette):
+    '''1/4/8 bit pixels with a color table at offset table.'''
+    image_palette = palette(colors)
+    for i in range(colors):
+        b, g, r = data[table + 4 * i: table + 4 * i + 3]
+        image_palette[i] = (r << 16) | (g << 8) | b
+    image = bitmap(width, len(rows), colors)
+    mask = (1 << bits) - 1
+    for y, offset in rows:
+        for x in range(width):
+            bit = x * bits
+            image[x, y] = (data[offset + bit // 8] >> (8 - bits - bit % 8)) & mask
+    return image, image_palette
+
+
+def _load_rgb(data, rows, width, step, bitmap):
+    '''24/32 bit BGR(A) pixels.'''
+    image = bitmap(width, len(rows), 1 << 24)
+    for y, offset in rows:
+        for x in range(width):
+            b, g, r = data[offset + step * x: offset + step * x + 3]
+            image[x, y] = (r << 16) | (g << 8) | b
+    return image, displayio.ColorConverter()
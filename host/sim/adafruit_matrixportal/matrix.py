@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_matrixportal.matrix`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import board
+import displayio
+import framebufferio
+import rgbmatrix
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class Matrix:
+    '''Set up the RGB matrix and an auto-refreshing display for it.'''
+
+    def __init__(self, *, width=64, height=32, bit_depth=2, alt_addr_pins=None,
+                 color_order="RGB", serpentine=True, tile_rows=1, rotation=0):
+        displayio.release_displays()
+        self.matrix = rgbmatrix.RGBMatrix(
+            width=width, height=height, bit_depth=bit_depth,
+            rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1, board.MTX_R2, board.MTX_G2, board.MTX_B2],
+            addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
+            clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE,
+            tile=tile_rows, serpentine=serpentine)
+        self.display = framebufferio.FramebufferDisplay(self.matrix, rotation=rotation)
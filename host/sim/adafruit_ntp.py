@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for `adafruit_ntp`.
+
+No packets are sent: `datetime` reports the host's UTC clock. Set
+`NTP.failures` to make the next n queries raise the ETIMEDOUT seen in the
+logs in `issues/`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import errno
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class NTP:
+    '''Network time protocol client answering from the host clock.'''
+
+    ## Number of upcoming queries that fail
+    failures = 0
+    ## Number of queries answered
+    queries = 0
+
+    def __init__(self, socketpool, *, server="0.adafruit.pool.ntp.org", port=123,
+                 tz_offset=0, socket_timeout=10, cache_seconds=0):
+        self._pool = socketpool
+        self.server = server
+        self.port = port
+        self.tz_offset = tz_offset
+        self.socket_timeout = socket_timeout
+        self.cache_seconds = cache_seconds
+
+    def _query(self):
+        if NTP.failures > 0:
+            NTP.failures -= 1
+            raise OSError(errno.ETIMEDOUT, "ETIMEDOUT")
+        NTP.queries += 1
+        return time.time_ns()
+
+    @property
+    def datetime(self):
+        return time.gmtime(self._query() // 1_000_000_000 + self.tz_offset * 3600)
+
+    @property
+    def utc_ns(self):
+        return self._query()
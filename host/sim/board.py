@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `board` on the MatrixPortal M4.
+
+`board.I2C()` returns a shared bus with a simulated SHT40 at 0x44.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import busio
+import sim_i2c
+
+##*****************************************************************************
+##*****************************************************************************
+
+board_id = "matrixportal_m4"
+
+_PINS = (
+    "SCK", "MOSI", "MISO", "SCL", "SDA", "TX", "RX",
+    "ESP_CS", "ESP_BUSY", "ESP_RESET", "ESP_GPIO0", "ESP_TX", "ESP_RX",
+    "MTX_R1", "MTX_G1", "MTX_B1", "MTX_R2", "MTX_G2", "MTX_B2",
+    "MTX_ADDRA", "MTX_ADDRB", "MTX_ADDRC", "MTX_ADDRD", "MTX_ADDRE",
+    "MTX_CLK", "MTX_LAT", "MTX_OE",
+    "NEOPIXEL", "L", "LED", "BUTTON_UP", "BUTTON_DOWN", "ACCELEROMETER_INTERRUPT",
+    "A0", "A1", "A2", "A3", "A4",
+    )
+
+
+class Pin:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "board." + self.name
+
+
+for _name in _PINS:
+    globals()[_name] = Pin(_name)
+
+_i2c = None
+
+
+##=============================================================================
+def I2C():
+    '''Return the board's singleton I2C bus.'''
+    global _i2c
+    if _i2c is None:
+        _i2c = busio.I2C(SCL, SDA)  # noqa: F821
+        _i2c.devices[0x44] = sim_i2c.SHT40()
+    return _i2c
+
+
+STEMMA_I2C = I2C
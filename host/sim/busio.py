@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `busio`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import errno
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class I2C:
+    '''I2C bus routing transfers to simulated devices in `devices`.'''
+
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        self.devices = {}
+        ## Number of transfers, for profiling bus traffic
+        self.transactions = 0
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return sorted(self.devices)
+
+    def _device(self, address):
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+        self.transactions += 1
+        try:
+            return self.devices[address]
+        except KeyError:
+            raise OSError(errno.ENODEV, "No such device") from None
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        self._device(address).write(bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        view = memoryview(buffer)[start:end]
+        self._device(address).read_into(view)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, *,
+                              out_start=0, out_end=None, in_start=0, in_end=None):
+        self.writeto(address, buffer_out, start=out_start, end=out_end)
+        self.readfrom_into(address, buffer_in, start=in_start, end=in_end)
+
+    def deinit(self):
+        pass
+
+
+##=============================================================================
+class SPI:
+    '''SPI bus; the ESP32 co-processor is simulated above the bus level.'''
+
+    def __init__(self, clock, MOSI=None, MISO=None):
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def configure(self, *, baudrate=100000, polarity=0, phase=0, bits=8):
+        pass
+
+    def deinit(self):
+        pass
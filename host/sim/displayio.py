@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `displayio`.
+
+Only the subset used by the clock is implemented: Bitmap, Palette,
+ColorConverter, TileGrid and Group. Displays composite their root group into
+an in-memory RGB888 framebuffer (see `framebufferio.FramebufferDisplay`).
+
+@author: mada
+@version: 2026-10-16
+"""
+
+from array import array
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def release_displays():
+    '''Nothing to release on the host.'''
+    pass
+
+
+##=============================================================================
+class Bitmap:
+    '''Two dimensional bitmap of palette indices (or raw RGB888 values).'''
+
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._data = array('I', bytes(4 * width * height))
+
+    def __len__(self):
+        return self.width * self.height
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel out of bounds")
+            return y * self.width + x
+        return key
+
+    def __getitem__(self, key):
+        return self._data[self._index(key)]
+
+    def __setitem__(self, key, value):
+        if value >= self.value_count:
+            raise ValueError("value out of range")
+        self._data[self._index(key)] = value
+
+    def fill(self, value):
+        for i in range(len(self._data)):
+            self._data[i] = value
+
+
+##=============================================================================
+class Palette:
+    '''Map palette indices to RGB888 colors, with per-entry transparency.'''
+
+    def __init__(self, color_count):
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        if isinstance(color, (bytes, bytearray, tuple, list)):
+            color = (color[0] << 16) | (color[1] << 8) | color[2]
+        self._colors[index] = color & 0xFFFFFF
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+    def _lookup(self, value):
+        if self._transparent[value]:
+            return None
+        return self._colors[value]
+
+
+##=============================================================================
+class ColorConverter:
+    '''Pass RGB888 bitmap values straight through.'''
+
+    def __init__(self, *, input_colorspace=None, dither=False):
+        self._transparent_color = None
+
+    def convert(self, color):
+        return color & 0xFFFFFF
+
+    def make_transparent(self, color):
+        self._transparent_color = color
+
+    def make_opaque(self, color):
+        self._transparent_color = None
+
+    def _lookup(self, value):
+        if value == self._transparent_color:
+            return None
+        return value & 0xFFFFFF
+
+
+##=============================================================================
+class TileGrid:
+    '''A grid of tiles sourced from one bitmap.'''
+
+    def __init__(self, bitmap, *, pixel_shader, width=1, height=1,
+                 tile_width=None, tile_height=None, default_tile=0, x=0, y=0):
+        if tile_width is None:
+            tile_width = bitmap.width
+        if tile_height is None:
+            tile_height = bitmap.height
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.width = width
+        self.height = height
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self.flip_x = False
+        self.flip_y = False
+        self._tiles = bytearray([default_tile] * (width * height))
+
+    def _index(self, key):
+        if isinstance(key, tuple):
+            x, y = key
+            return y * self.width + x
+        return key
+
+    def __getitem__(self, key):
+        return self._tiles[self._index(key)]
+
+    def __setitem__(self, key, tile_index):
+        self._tiles[self._index(key)] = tile_index
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def _render(self, fb, fb_width, fb_height, ox, oy, scale):
+        bitmap = self.bitmap
+        shader = self.pixel_shader
+        tw, th = self.tile_width, self.tile_height
+        per_row = bitmap.width // tw
+        ox += self.x * scale
+        oy += self.y * scale
+        for ty in range(self.height):
+            for tx in range(self.width):
+                tile = self._tiles[ty * self.width + tx]
+                sx0 = (tile % per_row) * tw
+                sy0 = (tile // per_row) * th
+                for py in range(th):
+                    sy = sy0 + (th - 1 - py if self.flip_y else py)
+                    for px in range(tw):
+                        sx = sx0 + (tw - 1 - px if self.flip_x else px)
+                        color = shader._lookup(bitmap[sx, sy])
+                        if color is None:
+                            continue
+                        dx = ox + (tx * tw + px) * scale
+                        dy = oy + (ty * th + py) * scale
+                        _fill(fb, fb_width, fb_height, dx, dy, scale, color)
+
+
+##=============================================================================
+class Group:
+    '''An ordered, positionable collection of TileGrids and Groups.'''
+
+    def __init__(self, *, scale=1, x=0, y=0):
+        self._layers = []
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+    def append(self, layer):
+        self._layers.append(layer)
+
+    def insert(self, index, layer):
+        self._layers.insert(index, layer)
+
+    def remove(self, layer):
+        self._layers.remove(layer)
+
+    def pop(self, index=-1):
+        return self._layers.pop(index)
+
+    def index(self, layer):
+        return self._layers.index(layer)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, layer):
+        self._layers[index] = layer
+
+    def __iter__(self):
+        return iter(self._layers)
+
+    def _render(self, fb, fb_width, fb_height, ox, oy, scale):
+        ox += self.x * scale
+        oy += self.y * scale
+        scale *= self.scale
+        for layer in self._layers:
+            if not layer.hidden:
+                layer._render(fb, fb_width, fb_height, ox, oy, scale)
+
+
+##=============================================================================
+def _fill(fb, fb_width, fb_height, x, y, size, color):
+    '''Paint a size x size block into an RGB888 bytearray, clipped.'''
+    r, g, b = (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+    for yy in range(max(y, 0), min(y + size, fb_height)):
+        for xx in range(max(x, 0), min(x + size, fb_width)):
+            i = 3 * (yy * fb_width + xx)
+            fb[i] = r
+            fb[i + 1] = g
+            fb[i + 2] = b
+
+
+##=============================================================================
+def _composite(root_group, fb, fb_width, fb_height):
+    '''Clear fb and draw root_group into it.'''
+    fb[:] = bytes(len(fb))
+    if root_group is not None and not root_group.hidden:
+        root_group._render(fb, fb_width, fb_height, 0, 0, 1)
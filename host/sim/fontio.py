@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `fontio`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+from collections import namedtuple
+
+## fontio.Glyph(bitmap, tile_index, width, height, dx, dy, shift_x, shift_y)
+Glyph = namedtuple("Glyph", ("bitmap", "tile_index", "width", "height", "dx", "dy", "shift_x", "shift_y"))
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `framebufferio`.
+
+The display composites its root group into `framebuffer`, a bytearray of
+width * height RGB888 triplets, whenever it is refreshed. Long simulations
+that never look at the pixels can set `FramebufferDisplay.composite` to
+False; frames are still counted.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import displayio
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class FramebufferDisplay:
+    '''Render displayio groups into an in-memory RGB888 framebuffer.'''
+
+    ## False: refresh() only counts frames
+    composite = True
+
+    def __init__(self, framebuffer, *, rotation=0, auto_refresh=True):
+        self.width = framebuffer.width
+        self.height = framebuffer.height
+        self.rotation = rotation
+        self.auto_refresh = auto_refresh
+        self.brightness = 1.0
+        self.root_group = None
+        self.framebuffer = bytearray(3 * self.width * self.height)
+        ## Number of frames composited so far
+        self.frames = 0
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        '''Composite the root group into the framebuffer.'''
+        if self.composite:
+            displayio._composite(self.root_group, self.framebuffer, self.width, self.height)
+        self.frames += 1
+        return True
+
+    def snapshot(self):
+        '''Return the current frame; auto-refresh displays are repainted first.'''
+        if self.auto_refresh:
+            self.refresh()
+        return bytes(self.framebuffer)
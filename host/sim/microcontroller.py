@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `microcontroller`.
+
+`nvm` is backed by a file, so its contents survive simulated resets and
+separate simulator runs like the flash of the board. The file is
+`$SIM_NVM`, by default `matrixclock_nvm.bin` in the temp directory.
+
+`watchdog` never resets the host; it only notes when it would have
+(`expired`). `reset()` counts resets and raises `SimulatedReset`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import os
+import tempfile
+import time
+
+import watchdog as _watchdog
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class NVM:
+    '''Byte addressable non-volatile memory, erased to 0xFF, backed by a file.'''
+
+    def __init__(self, path, size=8192):
+        self.path = path
+        self._data = bytearray(b"\xff" * size)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                stored = f.read(size)
+            self._data[:len(stored)] = stored
+        ## Number of writes, i.e. flash page erases on the board
+        self.writes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice) and len(self._data[key]) != len(value):
+            raise ValueError("NVM slice assignment must not change the size")
+        self._data[key] = value
+        self.writes += 1
+        self._flush()
+
+    def _flush(self):
+        with open(self.path, "wb") as f:
+            f.write(self._data)
+
+    def erase(self):
+        '''Back to the erased state, as after flashing a new firmware.'''
+        self._data[:] = b"\xff" * len(self._data)
+        self._flush()
+
+
+##=============================================================================
+class ResetReason:
+    POWER_ON = "POWER_ON"
+    BROWNOUT = "BROWNOUT"
+    SOFTWARE = "SOFTWARE"
+    DEEP_SLEEP_ALARM = "DEEP_SLEEP_ALARM"
+    RESET_PIN = "RESET_PIN"
+    WATCHDOG = "WATCHDOG"
+    UNKNOWN = "UNKNOWN"
+    RESCUE_DEBUG = "RESCUE_DEBUG"
+
+
+class _Processor:
+    reset_reason = ResetReason.POWER_ON
+    frequency = 120_000_000
+
+
+##=============================================================================
+class WatchDogTimer:
+    '''Hardware watchdog; expiry is only recorded.'''
+
+    def __init__(self):
+        self.timeout = None
+        self.mode = None
+        self._fed = None
+        self.feeds = 0
+
+    def feed(self):
+        if self.mode is None:
+            raise ValueError("WatchDogTimer is not initialized")
+        self._fed = time.monotonic()
+        self.feeds += 1
+
+    def deinit(self):
+        self.mode = None
+        self._fed = None
+
+    @property
+    def expired(self):
+        '''True if the board would have been reset by now.'''
+        return self.mode == _watchdog.WatchDogMode.RESET and self._fed is not None \
+            and time.monotonic() - self._fed > self.timeout
+
+
+class SimulatedReset(Exception):
+    pass
+
+
+def reset():
+    global resets
+    resets += 1
+    cpu.reset_reason = ResetReason.SOFTWARE
+    raise SimulatedReset()
+
+
+cpu = _Processor()
+watchdog = WatchDogTimer()
+resets = 0
+nvm = NVM(os.environ.get("SIM_NVM") or os.path.join(tempfile.gettempdir(), "matrixclock_nvm.bin"))
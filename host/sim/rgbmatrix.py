@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `rgbmatrix`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+
+##=============================================================================
+class RGBMatrix:
+    '''HUB75 matrix framebuffer; holds the panel geometry only.'''
+
+    def __init__(self, *, width, height=0, bit_depth, rgb_pins, addr_pins,
+                 clock_pin, latch_pin, output_enable_pin, doublebuffer=True,
+                 framebuffer=None, serpentine=True, tile=1):
+        self.width = width
+        self.height = height or 16 * len(addr_pins)
+        self.bit_depth = bit_depth
+        self.brightness = 1.0
+
+    def deinit(self):
+        pass
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `rtc`.
+
+The RTC is kept as an offset against the host's `time.time()`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import calendar
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class RTC:
+    '''Real time clock; all instances share the same time base.'''
+
+    _offset = 0
+    calibration = 0
+
+    @property
+    def datetime(self):
+        return time.gmtime(int(time.time() + RTC._offset))
+
+    @datetime.setter
+    def datetime(self, value):
+        RTC._offset = calendar.timegm(tuple(value)[:6] + (0, 0, 0)) - int(time.time())
+
+
+def set_time_source(rtc):
+    pass
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+"""
+Simulated I2C peripherals for the host stand-in of `busio.I2C`.
+
+A device is any object with `write(buf)` and `read_into(buf)`; the bus routes
+transfers to it by 7-bit address.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import errno
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def crc8(data):
+    '''Sensirion CRC-8 (polynomial 0x31, init 0xFF).'''
+    crc = 0xFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+    return crc
+
+
+##=============================================================================
+class SHT40:
+    '''
+    Sensirion SHT40 temperature/humidity sensor.
+
+    Like the real part, a read issued before the conversion time has elapsed
+    is NACKed, which `busio` reports as an OSError.
+    '''
+
+    ## command -> conversion time in seconds
+    CONVERSION_TIME = {
+        0xFD: 0.0083, 0xF6: 0.0045, 0xE0: 0.0017,
+        0x39: 1.1, 0x32: 0.11, 0x2F: 1.1, 0x24: 0.11, 0x1E: 1.1, 0x15: 0.11,
+        0x89: 0.001,
+        }
+
+    def __init__(self, temperature=21.5, humidity=45.0, serial_number=0x0C0FFEE0):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.serial_number = serial_number
+        self.measurements = 0
+        self._ready_at = None
+        self._payload = None
+
+    def write(self, buf):
+        command = buf[0]
+        if command not in self.CONVERSION_TIME:
+            raise OSError(errno.EIO, "SHT40: unknown command 0x%02X" % command)
+        self._ready_at = time.monotonic() + self.CONVERSION_TIME[command]
+        if command == 0x89:
+            words = ((self.serial_number >> 16) & 0xFFFF, self.serial_number & 0xFFFF)
+        else:
+            t_ticks = round((self.temperature + 45) * 65535 / 175)
+            rh_ticks = round((self.humidity + 6) * 65535 / 125)
+            words = (max(0, min(t_ticks, 65535)), max(0, min(rh_ticks, 65535)))
+            self.measurements += 1
+        payload = bytearray()
+        for word in words:
+            pair = bytes((word >> 8, word & 0xFF))
+            payload += pair + bytes((crc8(pair),))
+        self._payload = payload
+
+    def read_into(self, buf):
+        if self._payload is None or time.monotonic() < self._ready_at:
+            raise OSError(errno.ENODEV, "No such device")
+        n = min(len(buf), len(self._payload))
+        buf[:n] = self._payload[:n]
+        self._payload = None
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `terminalio`.
+
+The built-in terminal font is approximated by the 6x10 BDF font in `src/`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import os
+
+from adafruit_bitmap_font import bitmap_font
+
+FONT = bitmap_font.load_font(os.path.join(os.path.dirname(__file__), "..", "..", "src", "6x10.bdf"))
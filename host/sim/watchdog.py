@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+"""
+Host stand-in for CircuitPython's `watchdog`.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+class WatchDogMode:
+    RAISE = "RAISE"
+    RESET = "RESET"
+
+
+class WatchDogTimeout(Exception):
+    pass
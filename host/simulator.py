@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run the CircuitPython clock unmodified on a CPython host.
+
+The stand-in modules in `host/sim/` replace the board specific libraries
+(`board`, `busio`, `digitalio`, `rtc`, `displayio`, `rgbmatrix`,
+`adafruit_matrixportal`, `adafruit_esp32spi`, `adafruit_ntp`, ...). The
+display renders into a 64x32 RGB888 framebuffer that can be dumped to PNG.
+
+Usage:
+    python host/simulator.py --seconds 3 --png clock.png --ascii
+
+From Python:
+    import simulator
+    clock = simulator.load_clock()      # runs the boot path, not main()
+    clock.ns["clocktick"]()             # call into the script's globals
+    clock.write_png("clock.png")
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import os
+import struct
+import sys
+import time
+import tracemalloc
+import zlib
+
+import ntp_server
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+SIM_DIR = os.path.join(HOST_DIR, "sim")
+SRC_DIR = os.path.join(os.path.dirname(HOST_DIR), "src")
+
+## Answer the firmware's NTP queries in-process: host name -> (address, responder)
+NTP_SERVERS = {
+    "pool.ntp.org": ("10.0.0.123", ntp_server.NTPResponder(delay=0.015)),
+    "0.pool.ntp.org": ("10.0.0.124", ntp_server.NTPResponder(delay=0.012, jitter=0.004, seed=0)),
+    "1.pool.ntp.org": ("10.0.0.125", ntp_server.NTPResponder(delay=0.025, jitter=0.010, seed=1)),
+    "2.pool.ntp.org": ("10.0.0.126", ntp_server.NTPResponder(delay=0.040, jitter=0.020, seed=2)),
+    }
+## Heap reported by the stand-in gc.mem_free() at the start of boot; CPython
+## needs far more than the SAMD51's 192 kB, so only the deltas mean something
+HEAP_SIZE = 4 * 1024 * 1024
+_mem_free = [HEAP_SIZE]
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def mem_free():
+    '''
+    Stand-in for CircuitPython's gc.mem_free().
+
+    HEAP_SIZE minus what tracemalloc has seen allocated since load_clock()
+    started tracing; outside of tracing the last value is repeated.
+    '''
+    if tracemalloc.is_tracing():
+        _mem_free[0] = HEAP_SIZE - tracemalloc.get_traced_memory()[0]
+    return _mem_free[0]
+
+
+##=============================================================================
+def setup():
+    '''Put the stand-ins and the firmware on sys.path and pin the host to UTC.'''
+    for path in (SRC_DIR, SIM_DIR):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+    os.environ["TZ"] = "UTC"
+    time.tzset()
+    if not hasattr(gc, "mem_free"):
+        gc.mem_free = mem_free
+    os.environ.setdefault("CIRCUITPY_WIFI_SSID", "simulator")
+    os.environ.setdefault("CIRCUITPY_WIFI_PASSWORD", "simulator")
+    import adafruit_connection_manager
+    for name, (address, responder) in NTP_SERVERS.items():
+        adafruit_connection_manager.register_host(name, address, responder)
+
+
+##=============================================================================
+def write_png(filename, rgb, width, height, scale=1):
+    '''Write an RGB888 buffer as PNG, each pixel blown up to scale x scale.'''
+    raw = bytearray()
+    for y in range(height):
+        row = bytearray()
+        for x in range(width):
+            i = 3 * (y * width + x)
+            row += rgb[i:i + 3] * scale
+        for _ in range(scale):
+            raw += b"\x00" + row
+
+    def chunk(tag, payload):
+        return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload))
+
+    with open(filename, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width * scale, height * scale, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(bytes(raw), 9)))
+        f.write(chunk(b"IEND", b""))
+
+
+##=============================================================================
+def to_ascii(rgb, width, height):
+    '''Render an RGB888 buffer as text, one character per pixel.'''
+    lines = []
+    for y in range(height):
+        line = ""
+        for x in range(width):
+            i = 3 * (y * width + x)
+            line += "#" if any(rgb[i:i + 3]) else "."
+        lines.append(line)
+    return "\n".join(lines)
+
+
+##=============================================================================
+class NullWriter:
+    '''Console that swallows output, for long runs; the firmware still pays for formatting it.'''
+
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+##=============================================================================
+class SimulatedClock:
+    '''A firmware script loaded into the simulator.'''
+
+    def __init__(self, ns, main, console):
+        ## The script's global namespace
+        self.ns = ns
+        self._main = main
+        ## Console output captured while booting (empty unless quiet)
+        self.console = console
+
+    @property
+    def display(self):
+        return self.ns["display"]
+
+    def frame(self):
+        '''Return the current frame as RGB888 bytes.'''
+        return self.display.snapshot()
+
+    def write_png(self, filename, scale=8):
+        write_png(filename, self.frame(), self.display.width, self.display.height, scale)
+
+    def ascii(self):
+        return to_ascii(self.frame(), self.display.width, self.display.height)
+
+    def run(self, seconds, vt=None):
+        '''
+        Run the script's main() for the given number of seconds.
+
+        Seconds are wall clock seconds, or virtual ones if a
+        virtual_time.VirtualTime is given.
+        '''
+        async def _run():
+            try:
+                await asyncio.wait_for(self._main(), seconds)
+            except asyncio.TimeoutError:
+                pass
+            ## Stop the tasks main() has started
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if vt is None:
+            asyncio.run(_run())
+        else:
+            vt.run(_run())
+
+
+##=============================================================================
+def load_clock(script="code_MatrixClock.py", *, quiet=True):
+    '''
+    Execute a firmware script up to (but not into) its asyncio main loop.
+
+    The script runs from `src/` so that fonts and images load by relative
+    path. Its final `asyncio.run(main())` is intercepted; use
+    `SimulatedClock.run()` to enter the main loop.
+
+    Returns
+    -------
+    clock : SimulatedClock
+    '''
+    setup()
+    path = os.path.join(SRC_DIR, script)
+    with open(path, encoding="utf-8") as f:
+        code = compile(f.read(), path, "exec")
+    ns = {"__name__": "__main__", "__file__": path}
+
+    def intercept(coro, **kwargs):
+        coro.close()
+
+    console = io.StringIO()
+    cwd = os.getcwd()
+    run = asyncio.run
+    asyncio.run = intercept
+    ## Trace the boot for gc.mem_free(), unless the caller traces already
+    trace = not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    try:
+        os.chdir(SRC_DIR)
+        with contextlib.redirect_stdout(console if quiet else sys.stdout):
+            exec(code, ns)
+    finally:
+        if trace:
+            mem_free()
+            tracemalloc.stop()
+        asyncio.run = run
+        os.chdir(cwd)
+    return SimulatedClock(ns, ns.get("main"), console.getvalue())
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--script", default="code_MatrixClock.py", help="firmware script in src/")
+    parser.add_argument("--seconds", type=float, default=0, help="run main() for this many seconds")
+    parser.add_argument("--png", help="dump the final frame to this PNG file")
+    parser.add_argument("--scale", type=int, default=8, help="PNG pixel size")
+    parser.add_argument("--ascii", action="store_true", help="print the final frame as text")
+    parser.add_argument("--quiet", action="store_true", help="suppress the script's console output")
+    args = parser.parse_args()
+
+    clock = load_clock(args.script, quiet=args.quiet)
+    if args.seconds:
+        with contextlib.redirect_stdout(io.StringIO() if args.quiet else sys.stdout):
+            clock.run(args.seconds)
+    if args.png:
+        clock.write_png(args.png, args.scale)
+        print("## Frame written to", args.png)
+    if args.ascii:
+        print(clock.ascii())
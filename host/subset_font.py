@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+Subset a BDF font to the glyphs the clock uses and write it as `.bcf`.
+
+The compact binary format is described and loaded by `src/compact_font.py`.
+By default the sensor line font is subset to what `update_display()` and
+`adafruit_display_text.Label` need (digits, sign, decimal point, degree and
+percent signs, plus "M j'" which Label measures for ascent and descent).
+
+Usage:
+    python host/subset_font.py src/helvR10.bdf                 # writes src/helvR10.bcf
+    python host/subset_font.py src/helvR10.bdf --chars "0123456789:"
+    python host/subset_font.py src/helvR10.bdf --measure       # BDF vs BCF load time and heap
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import argparse
+import gc
+import os
+import struct
+import sys
+import time
+import tracemalloc
+
+HOST_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(HOST_DIR), "src")
+
+## Glyphs of the sensor line, "21.5°  45.2%", and Label's metrics glyphs
+SENSOR_CHARS = "0123456789.-°% M j'"
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def _read_glyph(lines, wanted):
+    '''
+    Read one glyph after its STARTCHAR line, up to and including ENDCHAR.
+
+    Returns
+    -------
+    code_point : int
+    glyph : tuple or None
+        (width, height, dx, dy, shift_x, packed rows), None if not wanted
+    '''
+    code_point = shift_x = bbx = rows = None
+    for line in lines:
+        key, _, value = line.strip().partition(" ")
+        if key == "ENCODING":
+            code_point = int(value.split()[0])
+        elif key == "DWIDTH":
+            shift_x = int(value.split()[0])
+        elif key == "BBX":
+            bbx = tuple(int(v) for v in value.split())
+        elif key == "BITMAP":
+            rows = bytearray() if code_point in wanted else None
+        elif key == "ENDCHAR":
+            break
+        elif rows is not None:
+            rows += bytes.fromhex(key)[:(bbx[0] + 7) // 8]
+    if rows is None:
+        return code_point, None
+    width, height, dx, dy = bbx
+    return code_point, (width, height, dx, dy, shift_x, bytes(rows[:height * ((width + 7) // 8)]))
+
+
+def read_bdf(filename, chars):
+    '''
+    Read the header and the requested glyphs of a BDF font.
+
+    Returns
+    -------
+    header : dict
+        "bbox" (w, h, x, y), "ascent", "descent"
+    glyphs : dict
+        code point -> (width, height, dx, dy, shift_x, packed rows)
+    '''
+    wanted = set(ord(char) for char in chars)
+    header = {}
+    glyphs = {}
+    with open(filename, encoding="latin-1") as f:
+        for line in f:
+            key, _, value = line.strip().partition(" ")
+            if key == "FONTBOUNDINGBOX":
+                header["bbox"] = tuple(int(v) for v in value.split())
+            elif key == "FONT_ASCENT":
+                header["ascent"] = int(value)
+            elif key == "FONT_DESCENT":
+                header["descent"] = int(value)
+            elif key == "STARTCHAR":
+                code_point, glyph = _read_glyph(f, wanted)
+                if glyph is not None:
+                    glyphs[code_point] = glyph
+    bbox = header["bbox"]
+    header.setdefault("ascent", bbox[1] + bbox[3])
+    header.setdefault("descent", -bbox[3])
+    missing = wanted - set(glyphs)
+    if missing:
+        print("!! Not in {}: {}".format(os.path.basename(filename), "".join(sorted(chr(c) for c in missing))))
+    return header, glyphs
+
+
+##=============================================================================
+def write_bcf(filename, header, glyphs):
+    '''Write glyphs in the .bcf format of src/compact_font.py.'''
+    table = bytearray()
+    bitmaps = bytearray()
+    for code_point in sorted(glyphs):
+        width, height, dx, dy, shift_x, rows = glyphs[code_point]
+        table += struct.pack("<HBBbbbH", code_point, width, height, dx, dy, shift_x, len(bitmaps))
+        bitmaps += rows
+    w, h, x, y = header["bbox"]
+    with open(filename, "wb") as f:
+        f.write(struct.pack("<4sHBBbbbb", b"BCF1", len(glyphs), w, h, x, y, header["ascent"], header["descent"]))
+        f.write(table)
+        f.write(bitmaps)
+
+
+##=============================================================================
+def measure(bdf_file, bcf_file, chars, repeat=5):
+    '''Time and trace loading the glyphs from BDF and from BCF, as the clock does at boot.'''
+    sys.path[:0] = [SRC_DIR, os.path.join(HOST_DIR, "sim")]
+    from adafruit_bitmap_font import bitmap_font
+    import compact_font
+
+    def load(loader, filename):
+        font = loader(filename)
+        font.load_glyphs(chars)
+        return font
+
+    for name, loader, filename in (("BDF", bitmap_font.load_font, bdf_file), ("BCF", compact_font.load_font, bcf_file)):
+        times = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            font = load(loader, filename)
+            times.append(time.perf_counter() - start)
+            if hasattr(font, "file"):
+                font.file.close()
+        gc.collect()
+        tracemalloc.start()
+        font = load(loader, filename)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if hasattr(font, "file"):
+            font.file.close()
+        print("## {}: {:7d} bytes on disk, load {:7.2f} ms, heap peak {:7d} B, retained {:7d} B".format(
+            name, os.path.getsize(filename), min(times) * 1e3, peak, retained))
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Subset a BDF font into a compact .bcf font.")
+    parser.add_argument("bdf", nargs="?", default=os.path.join(SRC_DIR, "helvR10.bdf"))
+    parser.add_argument("--chars", default=SENSOR_CHARS, help="characters to keep")
+    parser.add_argument("--out", help="output file, defaults to the BDF name with .bcf")
+    parser.add_argument("--measure", action="store_true", help="compare loading BDF and BCF")
+    args = parser.parse_args()
+
+    out = args.out or os.path.splitext(args.bdf)[0] + ".bcf"
+    header, glyphs = read_bdf(args.bdf, args.chars)
+    write_bcf(out, header, glyphs)
+    print("## {} glyphs -> {} ({} bytes, BDF {} bytes)".format(
+        len(glyphs), os.path.relpath(out), os.path.getsize(out), os.path.getsize(args.bdf)))
+    if args.measure:
+        measure(args.bdf, out, args.chars)
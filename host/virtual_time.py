@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+"""
+Deterministic virtual time for host simulations.
+
+While installed, `time.time`, `time.monotonic`, their `_ns` variants and
+argument-less `time.localtime`/`time.gmtime` report virtual time, and
+`time.sleep` advances it instantly instead of blocking. Event loops from
+`new_event_loop()` (or `run()`) skip idle waits by advancing virtual time,
+so `asyncio.sleep()` costs no wall time either.
+
+    with VirtualTime(start=1736965800) as vt:
+        clock = simulator.load_clock()
+        vt.advance(1)
+        vt.run(some_coroutine())
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import selectors
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class _VirtualSelector(selectors.DefaultSelector):
+    '''Poll for I/O without blocking; idle timeouts advance virtual time.'''
+
+    def __init__(self, vt):
+        super().__init__()
+        self._vt = vt
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if not events and timeout:
+            ## Round up by a microsecond: float timers could otherwise stay short of due
+            ## forever once the clock is large (months of uptime) and a nanosecond is below float resolution
+            self._vt.advance(timeout + 1e-6)
+        return events
+
+
+##=============================================================================
+class VirtualTime:
+    '''A manually advanced clock patched into the `time` module.'''
+
+    def __init__(self, start=None, monotonic_start=1000):
+        if start is None:
+            start = time.time()
+        self._epoch_ns = int(start * 1_000_000_000)
+        self._monotonic_ns = int(monotonic_start * 1_000_000_000)
+        ## Total seconds spent in time.sleep(), i.e. time the caller blocked
+        self.slept = 0.0
+        self._saved = None
+
+    ##-------------------------------------------------------------------------
+    def advance(self, seconds):
+        '''Move both clocks forward.'''
+        step = int(seconds * 1_000_000_000)
+        if step < 0:
+            raise ValueError("virtual time only runs forward")
+        self._epoch_ns += step
+        self._monotonic_ns += step
+
+    def step_epoch(self, seconds):
+        '''Step the wall clock only, e.g. to model a skewed RTC.'''
+        self._epoch_ns += int(seconds * 1_000_000_000)
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.advance(seconds)
+
+    ##-------------------------------------------------------------------------
+    def time(self):
+        return self._epoch_ns / 1_000_000_000
+
+    def time_ns(self):
+        return self._epoch_ns
+
+    def monotonic(self):
+        return self._monotonic_ns / 1_000_000_000
+
+    def monotonic_ns(self):
+        return self._monotonic_ns
+
+    def localtime(self, secs=None):
+        return self._localtime(self.time() if secs is None else secs)
+
+    def gmtime(self, secs=None):
+        return self._gmtime(self.time() if secs is None else secs)
+
+    ##-------------------------------------------------------------------------
+    def install(self):
+        if self._saved is not None:
+            return self
+        names = ("time", "time_ns", "monotonic", "monotonic_ns", "sleep", "localtime", "gmtime")
+        self._saved = {name: getattr(time, name) for name in names}
+        self._localtime = self._saved["localtime"]
+        self._gmtime = self._saved["gmtime"]
+        for name in names:
+            setattr(time, name, getattr(self, name))
+        return self
+
+    def uninstall(self):
+        if self._saved is None:
+            return
+        for name, func in self._saved.items():
+            setattr(time, name, func)
+        self._saved = None
+
+    ##-------------------------------------------------------------------------
+    def new_event_loop(self):
+        '''An asyncio event loop whose idle waits advance virtual time.'''
+        return asyncio.SelectorEventLoop(_VirtualSelector(self))
+
+    def run(self, coro):
+        '''Like asyncio.run(), on a virtual time event loop.'''
+        loop = self.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(coro)
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
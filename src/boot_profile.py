@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+Boot phase profiler.
+
+Each call of `mark()` closes a phase: it records the time since the previous
+mark and the free heap (`gc.mem_free()`) at its end. At the end of boot the
+phases go out as one line:
+
+    profile = BootProfile()
+    from adafruit_esp32spi import adafruit_esp32spi
+    profile.mark("esp32spi")
+    ...
+    profile.finish()
+    ## Boot 1834ms: esp32spi=412ms/96k ... frame=21ms/61k
+
+Phases that end after boot (Wi-Fi, NTP in the background) can still be
+marked; `finish()` prints the report only once.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import gc
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class BootProfile:
+    '''
+    Time and free heap per boot phase.
+
+    Attributes
+    ----------
+    phases : list
+        (name, duration in ms, free heap in bytes after the phase)
+    finished : bool
+        True once the report has been printed
+    '''
+
+    def __init__(self):
+        self.t0_ns = time.monotonic_ns()
+        self._last_ns = self.t0_ns
+        self.phases = []
+        self.finished = False
+
+    ##-------------------------------------------------------------------------
+    def elapsed(self):
+        '''Seconds since the profile was started.'''
+        return (time.monotonic_ns() - self.t0_ns) / 1e9
+
+    def mark(self, name):
+        '''Close the phase `name` now; returns its duration in ms.'''
+        now_ns = time.monotonic_ns()
+        duration_ms = (now_ns - self._last_ns) // 1_000_000
+        self._last_ns = now_ns
+        self.phases.append((name, duration_ms, gc.mem_free()))
+        return duration_ms
+
+    def get(self, name):
+        '''(duration in ms, free heap) of the last phase called name, or None.'''
+        for phase in reversed(self.phases):
+            if phase[0] == name:
+                return phase[1:]
+        return None
+
+    def report(self):
+        '''The phases as one compact line.'''
+        total_ms = (self._last_ns - self.t0_ns) // 1_000_000
+        return "## Boot {}ms: {}".format(total_ms, " ".join(
+            "{}={}ms/{}k".format(name, duration_ms, mem_free // 1024) for name, duration_ms, mem_free in self.phases))
+
+    def finish(self):
+        '''Print the report, once.'''
+        if not self.finished:
+            self.finished = True
+            print(self.report())
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""
+Checkpoint of the disciplined clock in non-volatile memory.
+
+A synced `softclock.SoftClock` is written to `microcontroller.nvm` now and
+then as one small packed record:
+
+    offset  size
+    0       2     magic b"MC"
+    2       1     version
+    3       1     reserved
+    4       8     UTC of the clock in ns
+    12      4     UTC of the last NTP sync in s
+    16      4     frequency correction in ppb
+    20      2     number of writes so far
+    22      2     Fletcher-16 checksum of bytes 0..21
+
+After a reset that cleared the RTC, `restore()` puts the clock back to the
+checkpointed time right away. The restored time is behind by the time the
+board was down, so the clock stays unsynced until NTP answers. Writes are
+rate limited to spare the flash behind `nvm`.
+
+    checkpoint = ClockCheckpoint(microcontroller.nvm, clock)
+    checkpoint.restore()
+    ...
+    checkpoint.save()  # after a sync, and every `interval` seconds
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import struct
+import time
+
+MAGIC = b"MC"
+VERSION = 1
+RECORD = "<2sBxqIiH"
+SIZE = struct.calcsize(RECORD) + 2
+## An RTC reading earlier than this (2024-01-01) has lost power
+MIN_VALID_TS = 1704067200
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def fletcher16(data, start=0, end=None):
+    '''Fletcher-16 checksum of data[start:end].'''
+    if end is None:
+        end = len(data)
+    sum1 = sum2 = 0
+    for i in range(start, end):
+        sum1 = (sum1 + data[i]) % 255
+        sum2 = (sum2 + sum1) % 255
+    return (sum2 << 8) | sum1
+
+
+##=============================================================================
+class ClockCheckpoint:
+    '''
+    Save and restore a SoftClock in a byte addressable NVM region.
+
+    Parameters
+    ----------
+    nvm : bytearray like
+        e.g. microcontroller.nvm
+    clock : softclock.SoftClock
+    offset : int
+        start of the record in nvm
+    interval : float
+        seconds between periodic checkpoints
+    min_interval : float
+        minimum seconds between two writes, whatever asks for them
+    '''
+
+    def __init__(self, nvm, clock, *, offset=0, interval=3600, min_interval=600):
+        if nvm is None or len(nvm) < offset + SIZE:
+            raise ValueError("NVM too small for the clock checkpoint")
+        self.nvm = nvm
+        self.clock = clock
+        self.offset = offset
+        self.interval = interval
+        self.min_interval = min_interval
+        self._buffer = bytearray(SIZE)
+        self._last_write = None
+        ## Writes over the lifetime of the record
+        self.count = 0
+        ## Writes and skipped writes this boot
+        self.writes = 0
+        self.skipped = 0
+        ## Restored record: (UTC in ns, last sync UTC, freq_ppb), or None
+        self.restored = None
+
+    ##-------------------------------------------------------------------------
+    def load(self):
+        '''Read the record; (UTC in ns, last sync UTC, freq_ppb, count) or None if blank or corrupt.'''
+        data = self.nvm[self.offset:self.offset + SIZE]
+        magic, version, ts_ns, last_sync, freq_ppb, count = struct.unpack_from(RECORD, data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        if struct.unpack_from("<H", data, SIZE - 2)[0] != fletcher16(data, 0, SIZE - 2):
+            return None
+        return ts_ns, last_sync, freq_ppb, count
+
+    def restore(self, now=None):
+        '''
+        Restore the clock from the record.
+
+        The drift estimate is always taken over. The time only if the RTC has
+        lost power (now before MIN_VALID_TS) and the record is newer.
+
+        Returns
+        -------
+        restored : bool
+            True if the clock time was set from the record
+        '''
+        record = self.load()
+        if record is None:
+            return False
+        ts_ns, last_sync, freq_ppb, self.count = record
+        if now is None:
+            now = time.time()
+        restore_time = now < MIN_VALID_TS and ts_ns > now * 1_000_000_000
+        self.clock.restore(ts_ns if restore_time else None, freq_ppb)
+        if restore_time:
+            self.restored = (ts_ns, last_sync, freq_ppb)
+        return restore_time
+
+    def save(self):
+        '''Write a checkpoint of a synced clock, at most every min_interval seconds.'''
+        clock = self.clock
+        mono = time.monotonic()
+        if not clock.synced or (self._last_write is not None and mono - self._last_write < self.min_interval):
+            self.skipped += 1
+            return False
+        ts_ns = clock.time_ns()
+        last_sync = (ts_ns - (time.monotonic_ns() - clock.last_sync_ns)) // 1_000_000_000
+        self.count = (self.count + 1) & 0xFFFF
+        buffer = self._buffer
+        struct.pack_into(RECORD, buffer, 0, MAGIC, VERSION, ts_ns, last_sync, clock.freq_ppb, self.count)
+        struct.pack_into("<H", buffer, SIZE - 2, fletcher16(buffer, 0, SIZE - 2))
+        self.nvm[self.offset:self.offset + SIZE] = buffer
+        self._last_write = mono
+        self.writes += 1
+        return True
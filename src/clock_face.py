@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""
+Clock face drawn from prerendered digit atlases.
+
+Each theme has a sprite sheet `atlas_<theme>.bmp` (built on the host with
+`host/build_glyph_atlas.py`) with half-digit wide tiles:
+
+    tile:   0 1   2 3  ...  18 19   20   21
+    glyph:  "0"   "1"  ...  "9"     ":"  " "
+
+The face is one `displayio.TileGrid` per theme; showing a new time only
+writes the tile indices that changed, no text is laid out at runtime.
+
+    face = clock_face.ClockFace({"day": "atlas_day.bmp"}, center_x=32, center_y=10)
+    face.show("12:34")
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import adafruit_imageload
+import displayio
+
+## Tiles per character and the tiles of ":" and " "
+COLON = 20
+BLANK = 21
+## Widest text "HH:MM" in tiles
+MAX_TILES = 9
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class ClockFace(displayio.Group):
+    '''
+    Time display built from TileGrids, one per theme.
+
+    Parameters
+    ----------
+    atlases : dict
+        theme name -> atlas BMP file
+    center_x, center_y : int
+        the text is centered on this point
+    '''
+
+    def __init__(self, atlases, *, center_x, center_y):
+        super().__init__()
+        self.center_x = center_x
+        self.center_y = center_y
+        self._grids = {}
+        self.palettes = {}
+        for name, filename in atlases.items():
+            bitmap, palette = adafruit_imageload.load(filename, bitmap=displayio.Bitmap, palette=displayio.Palette)
+            palette.make_transparent(0)
+            tile_width = bitmap.width // (BLANK + 1)
+            grid = displayio.TileGrid(bitmap, pixel_shader=palette, width=MAX_TILES, height=1,
+                                      tile_width=tile_width, tile_height=bitmap.height, default_tile=BLANK)
+            grid.y = center_y - bitmap.height // 2
+            grid.hidden = True
+            self.append(grid)
+            self._grids[name] = grid
+            self.palettes[name] = palette
+        self._grid = None
+        self._theme = None
+        self._tiles = bytearray([BLANK] * MAX_TILES)
+        self._count = 0
+        self._colon_at = None  # tile of the last ":" or " " shown
+        ## Number of tile index writes, for profiling
+        self.writes = 0
+        self.theme = next(iter(atlases))
+
+    ##-------------------------------------------------------------------------
+    @property
+    def theme(self):
+        return self._theme
+
+    @theme.setter
+    def theme(self, name):
+        if name == self._theme:
+            return
+        grid = self._grids[name]
+        ## Bring the new grid up to date before swapping
+        for i in range(MAX_TILES):
+            grid[i] = self._tiles[i]
+        self._place(grid, self._count)
+        grid.hidden = False
+        if self._grid is not None:
+            self._grid.hidden = True
+        self._grid = grid
+        self._theme = name
+
+    def _place(self, grid, count):
+        grid.x = self.center_x - count * grid.tile_width // 2
+
+    ##-------------------------------------------------------------------------
+    def show(self, text):
+        '''Show text made of digits, ":" and " "; only changed tiles are written.'''
+        grid = self._grid
+        tiles = self._tiles
+        i = 0
+        for char in text:
+            if char == ":":
+                indices = (COLON,)
+                self._colon_at = i
+            elif char == " ":
+                indices = (BLANK,)
+                self._colon_at = i
+            else:
+                digit = 2 * (ord(char) - 48)
+                indices = (digit, digit + 1)
+            for index in indices:
+                if tiles[i] != index:
+                    tiles[i] = index
+                    grid[i] = index
+                    self.writes += 1
+                i += 1
+        if i != self._count:
+            for j in range(i, self._count):
+                tiles[j] = BLANK
+                grid[j] = BLANK
+            self._count = i
+            self._place(grid, i)
+
+    @property
+    def colon(self):
+        return self._colon_at is not None and self._tiles[self._colon_at] == COLON
+
+    @colon.setter
+    def colon(self, visible):
+        '''Show or blank the colon of the current text with a single tile write.'''
+        i = self._colon_at
+        if i is None:
+            return
+        index = COLON if visible else BLANK
+        if self._tiles[i] != index:
+            self._tiles[i] = index
+            self._grid[i] = index
+            self.writes += 1
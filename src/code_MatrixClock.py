@@ -9,35 +9,62 @@ MatrixClock - a HUB75 LED matrix clock driven by Adafruit's MaxtrixPortal M4.
 """
 
 # import sys
-import os
 import time
-import asyncio
+## Boot phases and the time to the first clock frame are measured from here
+from boot_profile import BootProfile
+profile = BootProfile()
+import os  # noqa: E402
+import asyncio  # noqa: E402
 
 ## Network ---------------------------------------------------------------------
-import board
-import digitalio
-import busio
-from adafruit_esp32spi import adafruit_esp32spi
+import board  # noqa: E402
+import digitalio  # noqa: E402
+import busio  # noqa: E402
+profile.mark("board")
+from adafruit_esp32spi import adafruit_esp32spi  # noqa: E402
+profile.mark("esp32spi")
 
 # import neopixel
 # from adafruit_esp32spi import adafruit_esp32spi_wifimanager
 
-import adafruit_connection_manager
+import adafruit_connection_manager  # noqa: E402
 
 ## NTP & RTC -------------------------------------------------------------------
-from rtc import RTC
-from adafruit_ntp import NTP
+from rtc import RTC  # noqa: E402
+import microcontroller  # noqa: E402
+from watchdog import WatchDogMode  # noqa: E402
 
 ## Display ---------------------------------------------------------------------
-from adafruit_matrixportal.matrix import Matrix
-from adafruit_display_text.label import Label
-from adafruit_bitmap_font import bitmap_font
-import adafruit_imageload
-import displayio
-import terminalio
+# from adafruit_matrixportal.matrix import Matrix
+from matrix_display import MatrixDisplay  # noqa: E402
+profile.mark("matrix_display")
+from adafruit_display_text.label import Label  # noqa: E402
+# from adafruit_bitmap_font import bitmap_font  # BDF fonts only, the sensor font is a .bcf (compact_font)
+import adafruit_imageload  # noqa: E402
+profile.mark("imageload")
+import displayio  # noqa: E402
+import terminalio  # noqa: E402
 
 ## Clock -----------------------------------------------------------------------
-import datetime_util
+import datetime_util  # noqa: E402
+import softclock  # noqa: E402
+from clock_checkpoint import ClockCheckpoint  # noqa: E402
+import sht40  # noqa: E402
+import sensor_history  # noqa: E402
+from ntp_client import NTPClient  # noqa: E402
+import wifi_supervisor  # noqa: E402
+from wifi_supervisor import WifiSupervisor  # noqa: E402
+from task_watchdog import TaskWatchdog  # noqa: E402
+from clock_face import ClockFace  # noqa: E402
+import compact_font  # noqa: E402
+from render_state import RenderState, Hysteresis  # noqa: E402
+import theme_schedule  # noqa: E402
+from palette_lut import PaletteSlot, ThemeFader  # noqa: E402
+from theme_schedule import ThemeSchedule  # noqa: E402
+from deadline_scheduler import Scheduler  # noqa: E402
+import console_log  # noqa: E402
+from console_log import ConsoleLog  # noqa: E402
+profile.mark("modules")
 
 ##******************************************************************************
 ##******************************************************************************
@@ -45,23 +72,53 @@ import datetime_util
 ## DEBUG mode
 DEBUG = False
 # DEBUG = True
+## Console log: buffered and written by a background task, DEBUG messages only in DEBUG mode
+LOG_LEVEL = console_log.DEBUG if DEBUG else console_log.INFO
+log = ConsoleLog(LOG_LEVEL)
+## Time telemetry on the console: once a minute, every second in DEBUG mode
+LOG_TIME = "\n## CET @ Time: {}\n## CET @ Tick: {}\n## CET @ RTC:  {}"
 ## Blinking colon
 BLINK = True
 ## NTP sync interval
-NTP_INTERVAL = 3600 * 12  # 3600s * 12 = 60min * 12 = 12h
-NTP_INTERVAL = 3600  # 3600s = 60min = 1h
+NTP_INTERVAL = 3600 * 12  # 3600s * 12 = 60min * 12 = 12h, the disciplined clock holds time in between
 ## Last NTP sync
 ts_lastntpsync = None
-## Clock counter
+## Minimum display frame rate; frames are otherwise only pushed on changes
+MIN_FPS = 0.2  # at least one frame every 5s
+## Day/night fades: seconds per fade out or in, frames per second while fading
+FADE_TIME = 1.5
+FADE_FPS = 20
+## Boot: the splash stays up at least SPLASH_TIME while assets load, the first clock frame is due within BOOT_BUDGET
+SPLASH_TIME = 1.0
+BOOT_BUDGET = 3.0
+## Wi-Fi: seconds to wait for an association, range of the backoff between attempts
+WIFI_TIMEOUT = 10
+WIFI_MIN_BACKOFF = 2
+WIFI_MAX_BACKOFF = 300
+## Sensor measurement interval
+SENSOR_INTERVAL = 2  # 2s, the display shows a new reading every other second
+## Render this long after each second boundary of the clock, so the new second is shown
+RENDER_PHASE_NS = 2_000_000  # 2ms
+## Interval of the task statistics on the console (late starts, overruns, missed deadlines)
+TASK_REPORT_INTERVAL = 3600
+## Disciplined software clock
 if DEBUG:
     ## Start at 05:59:00 UTC = 06:59:00 CET ...
-    ts_clocktick = 60 * 60 * 5 + 59 * 60
+    clock = softclock.SoftClock(60 * 60 * 5 + 59 * 60)
 else:
-    ## Start at 00:00:00 UTC
-    ts_clocktick = time.time()
+    ## Start at whatever time the RTC has (00:00:00 UTC after power-up)
+    clock = softclock.SoftClock()
+
+## Clock checkpoints in NVM: interval, minimum time between two flash writes
+CHECKPOINT_INTERVAL = 3600
+CHECKPOINT_MIN_INTERVAL = 600
+## Brightness level (of 3) while the clock has not been set by NTP: one step per lit channel at bit depth 2.
+## The 0x40 theme colors are at that step already, so the colon also stops blinking while unsynced
+UNSYNCED_LEVEL = 1
 
 MAX_CONSECUTIVE_FAILURES = 3
-consecutive_failures = 0
+## Hardware watchdog: reset the board if a task stops checking in; longer than the 10s SPI timeouts of the ESP32
+WATCHDOG_TIMEOUT = 16
 
 ##******************************************************************************
 ##******************************************************************************
@@ -76,99 +133,19 @@ print(  "****************************")
 settings = {
     "CIRCUITPY_WIFI_SSID": os.getenv("CIRCUITPY_WIFI_SSID"),
     "CIRCUITPY_WIFI_PASSWORD": os.getenv("CIRCUITPY_WIFI_PASSWORD"),
-    # "TIMEZONE": getenv("TIMEZONE"),
+    ## POSIX TZ string, e.g. TIMEZONE = "EST5EDT,M3.2.0,M11.1.0"
+    "TIMEZONE": os.getenv("TIMEZONE", datetime_util.TZ_CET),
+    ## Days with the weekend schedule, e.g. HOLIDAYS = "01-01,12-25,12-26,2026-04-06"
+    "HOLIDAYS": os.getenv("HOLIDAYS", ""),
+    ## Comma separated, "host" or "host:port"
+    "NTP_SERVERS": os.getenv("NTP_SERVERS", "0.pool.ntp.org,1.pool.ntp.org,2.pool.ntp.org"),
     # "NTP_INTERVAL": getenv("NTP_INTERVAL"),
     }
 CIRCUITPY_WIFI_SSID = settings["CIRCUITPY_WIFI_SSID"]
 CIRCUITPY_WIFI_PASSWORD = settings["CIRCUITPY_WIFI_PASSWORD"]
-
-
-##==============================================================================
-print("\n***********************")
-print(  "**** Network Setup ****")
-print(  "***********************")
-
-esp32_cs = digitalio.DigitalInOut(board.ESP_CS)
-esp32_busy = digitalio.DigitalInOut(board.ESP_BUSY)
-esp32_reset = digitalio.DigitalInOut(board.ESP_RESET)
-spi = busio.SPI(board.SCK, board.MOSI, board.MISO)
-
-esp = adafruit_esp32spi.ESP_SPIcontrol(spi, esp32_cs, esp32_busy, esp32_reset)
-
-if esp.status == adafruit_esp32spi.WL_IDLE_STATUS:
-    print("## ESP32 found and in idle mode")
-print("## Firmware vers.", esp.firmware_version)
-print("## MAC addr:", ":".join("%02X" % byte for byte in esp.MAC_address))
-print("## IP addr:", esp.pretty_ip(esp.ip_address))
-
-## Scan networks (=> slow !!!)
-# for ap in esp.scan_networks():
-#     print("\t%-23s RSSI: %d" % (ap.ssid, ap.rssi))
-
-print(">> Connecting...")
-while not esp.is_connected:
-    try:
-        esp.connect_AP(CIRCUITPY_WIFI_SSID, CIRCUITPY_WIFI_PASSWORD)
-    except OSError as e:
-        print("!! Could not connect, retrying: ", e)
-        continue
-print("## Connected to", esp.ap_info.ssid, "\tRSSI:", esp.ap_info.rssi, "\tIP addr:", esp.pretty_ip(esp.ip_address))
-
-
-##==============================================================================
-print("\n*******************")
-print(  "**** NTP & RTC ****")
-print(  "*******************")
-
-pool = adafruit_connection_manager.get_radio_socketpool(esp)
-ntp = NTP(pool, tz_offset=0, cache_seconds=NTP_INTERVAL, server="pool.ntp.org")
-print("## Current NTP time:", ntp.datetime)
-rtc = RTC()
-rtc.datetime = ntp.datetime
-print("## Current RTC time:", rtc.datetime)
-
-
-##------------------------------------------------------------------------------
-def sync_time_via_ntp():
-    """Synchronize RTC and ts_clocktick with NTP."""
-    global ts_clocktick
-    global ts_lastntpsync
-    global consecutive_failures
-
-    print("\n>> Syncing time via NTP...")
-    try:
-        ## The line below may raise an OSError if SPI times out or if Wi-Fi is locked up
-        rtc.datetime = ntp.datetime
-        ts_clocktick = time.mktime(ntp.datetime)
-        ts_lastntpsync = time.monotonic()
-        print("<< Time synchronized successfully.")
-        consecutive_failures = 0  # reset on success
-    except OSError as e:
-        consecutive_failures += 1
-        print(f"!! OSError while syncing time: {e} (fail #{consecutive_failures})")
-
-        ## If we’ve failed too many times in a row, reset the ESP
-        if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-            print("!! Too many consecutive failures, resetting the ESP module...")
-            esp.reset()                # Hard-reset the ESP32
-            ## After a reset, the ESP32 is in an initial state, so we need to re-init Wi-Fi
-            reconnect_wifi()
-            consecutive_failures = 0
-        else:
-            ## Optional: wait a bit before trying again
-            time.sleep(10)
-
-
-##------------------------------------------------------------------------------
-def reconnect_wifi():
-    """Reconnect to Wi-Fi after an esp.reset()."""
-    while not esp.is_connected:
-        try:
-            esp.connect_AP(CIRCUITPY_WIFI_SSID, CIRCUITPY_WIFI_PASSWORD)
-        except OSError as e:
-            print("!! Could not reconnect to Wi-Fi, retrying:", e)
-            time.sleep(5)
-    print("!! Reconnected to Wi-Fi after ESP reset.")
+timezone = datetime_util.PosixTZ(settings["TIMEZONE"])
+print("## Time zone:", settings["TIMEZONE"])
+print("## NTP servers:", settings["NTP_SERVERS"])
 
 
 ##==============================================================================
@@ -176,20 +153,24 @@ print("\n***********************")
 print(  "**** Display Setup ****")
 print(  "***********************")
 
-matrix = Matrix(
+## No auto-refresh: frames are pushed when the render state changes
+matrix = MatrixDisplay(
     # width=64, height=32,
     # rotation=180,
+    min_fps=MIN_FPS,
     )
-time.sleep(1)  # show the Adafruit logo for 1 second
 display = matrix.display
+profile.mark("matrix")
 
-## Load Python logo from a BMP file
+## Load Python logo from a BMP file; it stays up while sensor, fonts and network are set up
 image, palette = adafruit_imageload.load("Python-logo_64x32.bmp")
 tile_grid = displayio.TileGrid(image, pixel_shader=palette)
 group = displayio.Group()
 group.append(tile_grid)
 display.root_group = group
-time.sleep(2)  # show the Python logo for 2 seconds
+matrix.refresh()
+ts_splash = time.monotonic()
+profile.mark("splash")
 
 # text = "Hello\nred!"
 # text_area = Label(terminalio.FONT, text=text, color=0x440000)
@@ -254,63 +235,18 @@ try:
 finally:
     i2c_bus.unlock()
 
-sht40_sensor = 0x44  # i2c_devices[1]
-
-sht40_modes = (
-    ("SERIAL_NUMBER", 0x89, "Serial number", 0.01),
-    ("NOHEAT_HIGHPRECISION", 0xFD, "No heater, high precision", 0.01),
-    ("NOHEAT_MEDPRECISION", 0xF6, "No heater, med precision", 0.005),
-    ("NOHEAT_LOWPRECISION", 0xE0, "No heater, low precision", 0.002),
-    ("HIGHHEAT_1S", 0x39, "High heat, 1 second", 1.1),
-    ("HIGHHEAT_100MS", 0x32, "High heat, 0.1 second", 0.11),
-    ("MEDHEAT_1S", 0x2F, "Med heat, 1 second", 1.1),
-    ("MEDHEAT_100MS", 0x24, "Med heat, 0.1 second", 0.11),
-    ("LOWHEAT_1S", 0x1E, "Low heat, 1 second", 1.1),
-    ("LOWHEAT_100MS", 0x15, "Low heat, 0.1 second", 0.11),
-    )
-
-
-##------------------------------------------------------------------------------
-def read_sensor():
-    """
-    Read measurement data from Sensirion SHT40.
-
-    Returns
-    -------
-    * t_degC : float
-    * rh_pRH : float
-    """
-    mode = sht40_modes[1]  # NOHEAT_HIGHPRECISION
-    while not i2c_bus.try_lock():
-        pass
-    try:
-        # print ("\n## Reading sensor data...")
-        i2c_bus.writeto(sht40_sensor, bytearray([mode[1]]))
-        time.sleep(mode[-1])
-        rx_bytes = bytearray(6)
-        i2c_bus.readfrom_into(sht40_sensor, rx_bytes)
-        # print('>', rx_bytes, len(rx_bytes))
-        t_ticks = rx_bytes[0] * 256 + rx_bytes[1]
-        rh_ticks = rx_bytes[3] * 256 + rx_bytes[4]
-        t_degC = -45 + 175 * t_ticks / 65535  # 2^16 - 1 = 65535
-        rh_pRH = -6 + 125 * rh_ticks / 65535
-        if (rh_pRH > 100):
-            rh_pRH = 100
-        if (rh_pRH < 0):
-            rh_pRH = 0
-        # print('> temperature:', t_degC)
-        # print('> humidity:', rh_pRH)
-
-        return t_degC, rh_pRH
-
-    finally:
-        i2c_bus.unlock()
-
+sensor = sht40.SHT40(i2c_bus, 0x44)  # i2c_devices[1]
+## Rolling 1h/24h statistics, bounded memory
+history = sensor_history.SensorHistory(interval=SENSOR_INTERVAL)
 
 print("\n## Reading sensor data...")
-t_degC, rh_pRH = read_sensor()
+## Blocking once at boot; afterwards _read_sensor() measures in the background
+t_degC, rh_pRH = sensor.read()
+if sensor.readings:
+    history.add(t_degC, rh_pRH)
 print('> temperature:', t_degC)
 print('> humidity:', rh_pRH)
+profile.mark("sensor")
 
 
 ##==============================================================================
@@ -319,143 +255,388 @@ print(  "**** Matrix Clock ****")
 print(  "**********************")
 
 ## Define fonts
-font_large_day = bitmap_font.load_font("IBMPlexMono-Medium-24_jep.bdf")
+## The clock digits come prerendered from atlas_<theme>.bmp (host/build_glyph_atlas.py)
+# font_large_day = bitmap_font.load_font("IBMPlexMono-Medium-24_jep.bdf")
 # font_small_day = bitmap_font.load_font("6x10.bdf")  # ugly
-font_small_day = bitmap_font.load_font("helvR10.bdf")
+# font_small_day = bitmap_font.load_font("helvR10.bdf")
+## Subset of helvR10.bdf with the sensor line glyphs (host/subset_font.py)
+font_small_day = compact_font.load_font("helvR10.bcf")
 font_small_night = terminalio.FONT
-font_large_night = terminalio.FONT
 font_small_night = font_small_day
-font_large_night = font_small_day
 
 ## Create labels for the display text
-clock_label = Label(font_large_day)
+clock_face = ClockFace({"day": "atlas_day.bmp", "night": "atlas_night.bmp"},
+                       center_x=display.width // 2, center_y=display.height // 3)
 sensor_label = Label(font_small_day)
-clock_label.color = color[4]
 sensor_label.color = color[4]
 ## Place the labels
-clock_label.y = display.height // 3
 sensor_label.y = 26
 
+## Theme assets, all loaded above: clock face atlas, sensor font and color
+THEMES = {
+    "day": (font_small_day, color[3]),  # greenish
+    "night": (font_small_night, color[1]),  # red
+    }
+## Wakeup at 7 on workdays, 8 on weekends and holidays, night from 20:00
+schedule = ThemeSchedule(theme_schedule.RULES, holidays=theme_schedule.parse_holidays(settings["HOLIDAYS"]))
+
+
+##------------------------------------------------------------------------------
+def apply_theme(theme):
+    """Switch fonts and atlases; colors are faded in by the fader."""
+    font, _ = THEMES[theme]
+    clock_face.theme = theme
+    if sensor_label.font is not font:
+        sensor_label.font = font
+
+
+## Gamma-corrected brightness LUTs of the themed palette slots, built once
+fader = ThemeFader({
+    theme: [PaletteSlot(clock_face.palettes[theme], 1), PaletteSlot(sensor_label, None, theme_color)]
+    for theme, (_, theme_color) in THEMES.items()
+    }, apply_theme, duration=FADE_TIME)
+fade_event = None  # created in main(), on the running event loop
+
+
+## Last pushed state of the display elements
+render = RenderState()
+t_shown = Hysteresis(step=0.1)
+rh_shown = Hysteresis(step=0.1)
+
 ## Create a display group for the labels
 group = displayio.Group()
 display.root_group = group
 ## Add the labels to the group
-group.append(clock_label)
+group.append(clock_face)
 group.append(sensor_label)
+profile.mark("fonts")
+
+
+##------------------------------------------------------------------------------
+def _update_theme(theme):
+    """Brightness by sync state, day/night fades; pushes only what changed."""
+    if render.changed("synced", clock.synced):
+        ## Dimmed until NTP has set the clock, e.g. after a warm boot
+        level = fader.max_level if clock.synced else UNSYNCED_LEVEL
+        for name in THEMES:
+            fader.set_brightness(level, name)
+    if render.changed("theme", theme):
+        ## Fade out, switch, fade in (at once at boot)
+        fader.switch(theme)
+    if fade_event is not None and fader.active:
+        fade_event.set()
+
+
+##------------------------------------------------------------------------------
+def _update_sensor_label():
+    """Show the latest cached reading, never waits on I2C; tenths with hysteresis."""
+    t_tenths = t_shown.update(sensor.temperature)
+    rh_tenths = rh_shown.update(sensor.humidity)
+    if not render.changed("sensor", t_tenths * 10000 + rh_tenths):
+        return
+    sensor_str = "{:.1f}°  {:.1f}%".format(t_tenths / 10, rh_tenths / 10)
+    sensor_label.text = sensor_str
+    bbx, bby, bbwidth, bbh = sensor_label.bounding_box
+    sensor_label.x = round(display.width / 2 - bbwidth / 2)  # centered
+    sensor_label.y = 26
+    if DEBUG:
+        log.debug("## sensor_label bounding box: {},{},{},{}", bbx, bby, bbwidth, bbh)
+        log.debug("## sensor_label x: {} y: {}", sensor_label.x, sensor_label.y)
+
+
+##------------------------------------------------------------------------------
+def _format_times(now, now_tick, rtc_datetime):
+    """LOG_TIME of the raw times; called by the console log, off the render path."""
+    return LOG_TIME.format(datetime_util.localtime_toString(datetime_util.epoch_to_civil(now)),
+                           datetime_util.localtime_toString(datetime_util.epoch_to_civil(now_tick)),
+                           datetime_util.localtime_toString(rtc_datetime))
 
 
 ##------------------------------------------------------------------------------
 def update_display(*, hours=None, minutes=None, show_colon=False):
     """Update the clock display with the current time and sensor readings."""
-    # now_monotonic = time.monotonic()
-    now_time = time.time()
-    now_tick = ts_clocktick
-    now_rtc = rtc.datetime
-    ## Protect the direct ntp.datetime call
-    try:
-        now_ntp = ntp.datetime
-    except OSError as e:
-        print("!! OSError while fetching ntp.datetime:", e)
-        now_ntp = now_rtc
-    # print(f"## Monotonic: {now_monotonic}")
-    # print(f"## Time:      {now_time}")
-    # print(f"## Tick:      {now_tick}")
-    # print(f"## UTC @ Time: {time.localtime(now_time)}")
-    # print(f"## UTC @ Tick: {time.localtime(now_tick)}")
-    # print(f"## UTC @ RTC:  {now_rtc}")
-    # print(f"## UTC @ NTP:  {now_ntp}")
-    print()
-    print(f"## CET @ Time: {datetime_util.localtime_toString(time.localtime(now_time))}")
-    print(f"## CET @ Tick: {datetime_util.localtime_toString(time.localtime(now_tick))}")
-    print(f"## CET @ RTC:  {datetime_util.localtime_toString(now_rtc)}")
-    print(f"## CET @ NTP:  {datetime_util.localtime_toString(now_ntp)}")
+    now_tick = clock.time()
 
     #now = datetime_util.cettime(time.time())  # CET/CEST
-    offset = datetime_util.daylightSavingOffset(now_time)  # TZ offset in seconds (CET/CEST)
-    now = time.localtime(time.mktime(now_ntp) + offset)  # CET/CEST
+    offset = timezone.utcoffset(now_tick)  # TZ offset in seconds (e.g. CET/CEST)
+    now = datetime_util.epoch_to_civil(now_tick + offset)  # local time
 
     if hours is None:
         hours = now[3]
     if minutes is None:
         minutes = now[4]
     seconds = now[5]
-    if now[6] in [5, 6]:  # Saturday or Sunday
-        wakeup = 8
-    else:
-        wakeup = 7
-
-    if hours >= 20 or hours < wakeup:
-        ## Evening hours to morning
-        clock_label.font = font_large_night
-        clock_label.color = color[1]
-        sensor_label.font = font_small_night
-        sensor_label.color = color[1]
-    else:
-        ## Daylight hours
-        clock_label.font = font_large_day
-        clock_label.color = color[3]
-        sensor_label.font = font_small_day
-        sensor_label.color = color[3]
-
-    if BLINK:
-        colon = ":" if show_colon or seconds % 2 else " "
+    ## Day/night by the precompiled schedule of the day (see theme_schedule)
+    theme = schedule.theme(now_tick + offset)
+
+    ## Push only what changed (see render_state) ------------------------------
+    _update_theme(theme)
+
+    if BLINK and clock.synced:
+        colon = show_colon or seconds % 2 == 1
     else:
-        colon = ":"
+        colon = True
 
     ## Format the time string --------------------------------------------------
-    time_str_display = "{:d}{}{:02d}".format(hours, colon, minutes)
-    # time_str_stdout = "{}:{:02d}".format(time_str_display, seconds)
-    clock_label.text = time_str_display
-    bbx, bby, bbwidth, bbh = clock_label.bounding_box
+    time_changed = render.changed("time", hours * 100 + minutes)
+    if time_changed or DEBUG:
+        ## Raw times only; formatted when log.run() writes them
+        log.info(_format_times, time.time(), now_tick, rtc.datetime)
+    if time_changed:
+        time_str_display = "{:d}{}{:02d}".format(hours, ":" if colon else " ", minutes)
+        # time_str_stdout = "{}:{:02d}".format(time_str_display, seconds)
+        clock_face.show(time_str_display)  # centered, writes only the changed tiles
+        render.changed("colon", colon)
+    elif render.changed("colon", colon):
+        clock_face.colon = colon
 
-    clock_label.x = round(display.width / 2 - bbwidth / 2)  # centered
-    clock_label.y = display.height // 3
+    ## Format the sensor string ------------------------------------------------
+    if seconds % 2 == 0 and sensor.readings:
+        _update_sensor_label()
     if DEBUG:
-        print("## clock_label bounding box: {},{},{},{}".format(bbx, bby, bbwidth, bbh))
-        print("## clock_label x: {} y: {}".format(clock_label.x, clock_label.y))
+        log.debug("## Render updates applied: {} skipped: {} tile writes: {}", render.applied, render.skipped, clock_face.writes)
 
-    ## Format the sensor string ------------------------------------------------
-    if seconds % 2 == 0:
-        t_degC, rh_pRH = read_sensor()
-        sensor_str = "{:.1f}°  {:.1f}%".format(t_degC, rh_pRH)
-        sensor_label.text = sensor_str
-        bbx, bby, bbwidth, bbh = sensor_label.bounding_box
-        sensor_label.x = round(display.width / 2 - bbwidth / 2)  # centered
-        sensor_label.y = 26
-        if DEBUG:
-            print("## sensor_label bounding box: {},{},{},{}".format(bbx, bby, bbwidth, bbh))
-            print("## sensor_label x: {} y: {}".format(sensor_label.x, sensor_label.y))
+
+##------------------------------------------------------------------------------
+async def _read_sensor():
+    """Scheduled every SENSOR_INTERVAL: measure without blocking the loop."""
+    wdt.beat("sensor", SENSOR_INTERVAL + 10)
+    if await sensor.measure():
+        history.add(sensor.temperature, sensor.humidity)
 
 
 ##------------------------------------------------------------------------------
-async def _clocktick(lock):
-    """Scheduler to add one second to the counter."""
-    global ts_clocktick
+async def _fade_display():
+    """Background task: run fades at FADE_FPS, idle otherwise."""
     while True:
-        # await lock.acquire()
-        ts_clocktick += 1
-        # lock.release()
-        await asyncio.sleep(1)
+        if not fader.active:
+            await fade_event.wait()
+            fade_event.clear()
+        while fader.update():
+            matrix.invalidate()
+            matrix.update()
+            await asyncio.sleep(1 / FADE_FPS)
+        matrix.invalidate()
+        matrix.update()
+
+
+##------------------------------------------------------------------------------
+def _next_second(mono_ns):
+    """Monotonic ns of the first render deadline after mono_ns: RENDER_PHASE_NS into a second of the clock."""
+    ## Half a phase of slack: a deadline just computed maps to the next second, not to itself
+    return clock.next_second(mono_ns - RENDER_PHASE_NS // 2) + RENDER_PHASE_NS
+
+
+##------------------------------------------------------------------------------
+def _render():
+    """Scheduled at each second boundary of the clock."""
+    wdt.beat("render", 5)
+    clocktick()
 
 
 ##------------------------------------------------------------------------------
 def clocktick():
-    """Check if NTP sync is due and update the clock display."""
+    """Update the clock display; NTP runs in its own task."""
+    update_display()
+    if fader.active:
+        fader.update()  # keeps fades going even if _fade_display() is starved
+        matrix.invalidate()
+    matrix.update(render)  # push a frame only if something changed
+    if DEBUG:
+        log.debug("## Frames: {} skipped: {} FPS: {:.2f}", matrix.frames, matrix.skipped, matrix.fps)
+
+
+##==============================================================================
+print("\n***********************")
+print(  "**** Network Setup ****")
+print(  "***********************")
+
+esp32_cs = digitalio.DigitalInOut(board.ESP_CS)
+esp32_busy = digitalio.DigitalInOut(board.ESP_BUSY)
+esp32_reset = digitalio.DigitalInOut(board.ESP_RESET)
+spi = busio.SPI(board.SCK, board.MOSI, board.MISO)
+
+esp = adafruit_esp32spi.ESP_SPIcontrol(spi, esp32_cs, esp32_busy, esp32_reset)
+
+try:
+    if esp.status == adafruit_esp32spi.WL_IDLE_STATUS:
+        print("## ESP32 found and in idle mode")
+    print("## Firmware vers.", esp.firmware_version)
+    print("## MAC addr:", ":".join("%02X" % byte for byte in esp.MAC_address))
+except wifi_supervisor.TRANSPORT_ERRORS as e:
+    ## A wedged ESP32 must not stop the clock; the supervisor resets it
+    print("!! ESP32 not responding:", e)
+
+## Scan networks (=> slow !!!)
+# for ap in esp.scan_networks():
+#     print("\t%-23s RSSI: %d" % (ap.ssid, ap.rssi))
+
+
+##------------------------------------------------------------------------------
+def on_wifi_state(wifi, old):
+    """Log the Wi-Fi state changes; the first connection attempt ends the boot offline or online."""
+    global wifi_resets_seen
+    state = wifi.state
+    if state == wifi_supervisor.ASSOCIATING:
+        log.info(">> Connecting...")
+    elif state == wifi_supervisor.CONNECTED and old == wifi_supervisor.ASSOCIATING:
+        if not profile.finished:
+            profile.mark("connect")
+        log.info("## Connected to {} \tRSSI: {} \tIP addr: {}", esp.ap_info.ssid, esp.ap_info.rssi, esp.pretty_ip(esp.ip_address))
+        if wifi.resets != wifi_resets_seen:
+            wifi_resets_seen = wifi.resets
+            log.warning("!! Reconnected to Wi-Fi after ESP reset.")
+    elif state == wifi_supervisor.IDLE and old == wifi_supervisor.ASSOCIATING:
+        log.warning("!! Could not connect, retrying: {}", wifi.last_error)
+        if not profile.finished:
+            ## Boot ends offline; the report does not wait for the AP
+            profile.mark("offline")
+            profile.finish()
+    elif state == wifi_supervisor.RESETTING:
+        log.error("!! Too many consecutive failures, resetting the ESP module... {}", wifi.last_error)
+    else:
+        log.info("## Wi-Fi {} -> {}: {}", old, state, wifi.last_error if state == wifi_supervisor.DEGRADED else "ok")
+
+
+## Connection state machine, runs as a background task (see wifi_supervisor)
+wifi = WifiSupervisor(esp, CIRCUITPY_WIFI_SSID, CIRCUITPY_WIFI_PASSWORD, timeout=WIFI_TIMEOUT,
+                      min_backoff=WIFI_MIN_BACKOFF, max_backoff=WIFI_MAX_BACKOFF, reset_after=MAX_CONSECUTIVE_FAILURES,
+                      on_state=on_wifi_state)
+wifi_resets_seen = 0
+print("## Wi-Fi is connected in the background by the supervisor")
+profile.mark("esp")
+
+
+##==============================================================================
+print("\n*******************")
+print(  "**** NTP & RTC ****")
+print(  "*******************")
+
+pool = adafruit_connection_manager.get_radio_socketpool(esp)
+ntp_client = NTPClient(pool, clock, servers=settings["NTP_SERVERS"], interval=NTP_INTERVAL)
+rtc = RTC()
+print("## Current RTC time:", rtc.datetime)
+
+## Warm boot: if the RTC lost power, continue from the last checkpoint until NTP answers
+checkpoint = ClockCheckpoint(microcontroller.nvm, clock, interval=CHECKPOINT_INTERVAL, min_interval=CHECKPOINT_MIN_INTERVAL)
+if not DEBUG and checkpoint.restore():
+    ts_ns, ts_sync, freq_ppb = checkpoint.restored
+    rtc.datetime = time.localtime(ts_ns // 1_000_000_000)
+    print("## Time restored from NVM (unsynced): {1} {0} UTC, last NTP sync {3} {2} UTC, drift {4:.1f}ppm".format(
+        *datetime_util.localtime_toString(datetime_util.epoch_to_civil(ts_ns // 1_000_000_000)),
+        *datetime_util.localtime_toString(datetime_util.epoch_to_civil(ts_sync)), freq_ppb / 1e3))
+print("## NTP sync is done in the background by _sync_time_NTP()")
+profile.mark("rtc")
+
+
+##------------------------------------------------------------------------------
+async def sync_time_via_ntp():
+    """Synchronize RTC and the disciplined clock with NTP."""
     global ts_lastntpsync
-    global ts_clocktick
 
-    ## Check if NTP is due
-    if ts_lastntpsync is None or time.monotonic() > ts_lastntpsync + NTP_INTERVAL:
-        update_display(show_colon=True)  # make sure a colon is displayed while updating
-        sync_time_via_ntp()
-    ## Update the time display
-    update_display()
+    log.info("\n>> Syncing time via NTP...")
+    ## The query never blocks; SPI timeouts or a locked-up Wi-Fi end up as a failed sync
+    if await ntp_client.sync():
+        wifi.report_success()
+        rtc.datetime = time.localtime(clock.time())
+        ts_lastntpsync = time.monotonic()
+        checkpoint.save()
+        log.info("<< Time synchronized successfully with {}. Offset: {:.3f}s RTT: {:.0f}ms Drift: {:.1f}ppm",
+                 ntp_client.last_server, ntp_client.last_offset_ns / 1e9, ntp_client.last_rtt_ns / 1e6, clock.freq_ppb / 1e3)
+        for server in ntp_client.servers:
+            if server.reach & 1 == 0:
+                log.warning("## {} did not answer: {}", server.name, server.last_error)
+        return
+
+    log.error("!! Error while syncing time: {} (fail #{})", ntp_client.last_error, ntp_client.consecutive_failures)
+    ## The supervisor degrades the link, and resets the ESP after too many failures in a row
+    wifi.report_failure(ntp_client.last_error)
+    log.info("## Wi-Fi health: {}", wifi.health())
+
+
+##------------------------------------------------------------------------------
+async def _sync_time_NTP():
+    """Scheduled after ntp_client.next_delay(): NTP_INTERVAL, or a backoff after failures; waits for the link."""
+    wdt.beat("ntp", None)  # not watched while offline, the Wi-Fi task is
+    await wifi.wait_connected()
+    wdt.beat("ntp", 60)
+    await sync_time_via_ntp()
+    if not profile.finished:
+        ## The first sync ends the boot
+        profile.mark("ntp")
+        profile.finish()
+    wdt.beat("ntp", ntp_client.next_delay() + 60)
+
+
+##------------------------------------------------------------------------------
+async def _supervise_wifi():
+    """Background task: run the Wi-Fi state machine, one state at a time."""
+    while True:
+        ## The longest state is a backoff followed by an association
+        wdt.beat("wifi", WIFI_MAX_BACKOFF + WIFI_TIMEOUT + 30)
+        await wifi.step()
+
+
+##==============================================================================
+print("\n******************")
+print(  "**** Watchdog ****")
+print(  "******************")
+
+## Task heartbeats feed the hardware watchdog; stalls and crashes are journaled to NVM.
+## Not armed in DEBUG mode, and feeding an unarmed watchdog raises: only the tasks are tracked then
+wdt = TaskWatchdog(None if DEBUG else microcontroller.watchdog, microcontroller.nvm)
+print("## Reset reason:", microcontroller.cpu.reset_reason)
+crash = wdt.load()
+if crash:
+    print("!! Last run crashed: {} after {}s, last check-in: {}, free heap: {}".format(*crash))
+    wdt.clear()
+
+
+##------------------------------------------------------------------------------
+async def _feed_watchdog():
+    """Background task: feed the watchdog while every task checks in."""
+    while wdt.check():
+        await asyncio.sleep(WATCHDOG_TIMEOUT / 4)
+    log.error("!! Watchdog no longer fed ({}), resetting in {}s", wdt.tripped, WATCHDOG_TIMEOUT)
+
+
+##------------------------------------------------------------------------------
+def on_task_error(loop, context):
+    """A background task died: journal it and let the watchdog reset the board."""
+    error = context.get("exception")
+    log.error("!! Task error: {} {!r}", context.get("message"), error)
+    wdt.trip(type(error).__name__ if error else "task error")
+
+
+##------------------------------------------------------------------------------
+def _report_tasks():
+    """Scheduled every TASK_REPORT_INTERVAL: log late starts, overruns and missed deadlines."""
+    for line in scheduler.report():
+        log.info(line)
+
+
+## Periodic jobs at absolute deadlines, lower priority values first (see deadline_scheduler)
+scheduler = Scheduler()
+scheduler.every("render", 1, _render, priority=0, align=_next_second)
+scheduler.every("sensor", SENSOR_INTERVAL, _read_sensor, priority=1)
+scheduler.every("ntp", ntp_client.next_delay, _sync_time_NTP, priority=2)
+scheduler.every("checkpoint", CHECKPOINT_INTERVAL, checkpoint.save, priority=3, delay=CHECKPOINT_INTERVAL)
+scheduler.every("report", TASK_REPORT_INTERVAL, _report_tasks, priority=4, delay=TASK_REPORT_INTERVAL)
 
 
 ##******************************************************************************
 ##******************************************************************************
 
-update_display(show_colon=True)  # display whatever time is on the board
+## Keep the splash up for the rest of SPLASH_TIME, then show whatever time is on the board
+time.sleep(max(0, SPLASH_TIME - (time.monotonic() - ts_splash)))
+profile.mark("hold")
+update_display(show_colon=True)
+matrix.update(render)
+profile.mark("frame")
+ts_first_frame = profile.elapsed()
+print("\n## First clock frame after {:.2f}s (budget {:.1f}s)".format(ts_first_frame, BOOT_BUDGET))
+if ts_first_frame > BOOT_BUDGET:
+    print("!! Boot over budget")
 
 ## 1) Run clock in a loop
 # while True:
@@ -465,17 +646,21 @@ update_display(show_colon=True)  # display whatever time is on the board
 
 ## 2) Run clock in a routine
 async def main():
-    ## Create the lock instance
-    lock = asyncio.Lock()
-
     ## Init co-routines (cooperative tasks) for basic clock function
-    asyncio.create_task(_clocktick(lock))
     # asyncio.create_task(_update_clock(lock))
-    # asyncio.create_task(_sync_time_NTP(lock, ntp))
+    asyncio.get_event_loop().set_exception_handler(on_task_error)
+    asyncio.create_task(log.run())  # writes the buffered console log
+    if not DEBUG:
+        microcontroller.watchdog.timeout = WATCHDOG_TIMEOUT
+        microcontroller.watchdog.mode = WatchDogMode.RESET
+    asyncio.create_task(_feed_watchdog())
+    asyncio.create_task(_supervise_wifi())
+    global fade_event
+    fade_event = asyncio.Event()
+    asyncio.create_task(_fade_display())
 
-    while True:
-        clocktick()
-        await asyncio.sleep(1)
+    ## Render, sensor, NTP and checkpoints at their deadlines
+    await scheduler.run()
 
 
 # try:
@@ -483,4 +668,11 @@ async def main():
 # finally:
 #     ## Clear retained state
 #     _ = asyncio.new_event_loop()
-asyncio.run(main())
+try:
+    asyncio.run(main())
+except Exception as e:
+    ## Journal the crash and reset instead of sitting on the traceback
+    log.flush()
+    print("!! Main loop crashed:", repr(e))
+    wdt.trip(type(e).__name__)
+    microcontroller.reset()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+"""
+Loader for compact binary fonts (`.bcf`) built by `host/subset_font.py`.
+
+A `.bcf` file holds a subset of a BDF font in packed binary form, so loading
+it needs no text parsing and no scanning of unused glyphs. The font object
+behaves like the ones from `adafruit_bitmap_font.bitmap_font.load_font()`
+and works with `adafruit_display_text.label.Label`.
+
+File layout (little endian):
+
+    header   "BCF1", glyph count (H), bounding box w, h (2B), x, y (2b), ascent, descent (2b)
+    table    per glyph: code point (H), width, height (2B), dx, dy, shift_x (3b), bitmap offset (H)
+    bitmaps  1 bit per pixel, rows padded to whole bytes, MSB first
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import struct
+
+import displayio
+from fontio import Glyph
+from adafruit_bitmap_font.glyph_cache import GlyphCache
+
+MAGIC = b"BCF1"
+HEADER = "<4sHBBbbbb"
+ENTRY = "<HBBbbbH"
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class CompactFont(GlyphCache):
+    '''Glyphs from a .bcf file; bitmaps are built on first use.'''
+
+    def __init__(self, data, bitmap_class=displayio.Bitmap):
+        super().__init__()
+        magic, count, bw, bh, bx, by, ascent, descent = struct.unpack_from(HEADER, data, 0)
+        if magic != MAGIC:
+            raise ValueError("Unknown magic number %r" % magic)
+        self._data = data
+        self.bitmap_class = bitmap_class
+        self._boundingbox = (bw, bh, bx, by)
+        self._ascent = ascent
+        self._descent = descent
+        ## code point -> table offset
+        self._table = {}
+        offset = struct.calcsize(HEADER)
+        size = struct.calcsize(ENTRY)
+        for _ in range(count):
+            self._table[struct.unpack_from("<H", data, offset)[0]] = offset
+            offset += size
+        self._bitmaps = offset
+
+    @property
+    def ascent(self):
+        return self._ascent
+
+    @property
+    def descent(self):
+        return self._descent
+
+    def get_bounding_box(self):
+        return self._boundingbox
+
+    def load_glyphs(self, code_points):
+        if isinstance(code_points, int):
+            code_points = (code_points,)
+        elif isinstance(code_points, str):
+            code_points = [ord(c) for c in code_points]
+        for code_point in code_points:
+            if code_point in self._glyphs:
+                continue
+            offset = self._table.get(code_point)
+            if offset is None:
+                self._glyphs[code_point] = None
+                continue
+            _, width, height, dx, dy, shift_x, bits = struct.unpack_from(ENTRY, self._data, offset)
+            bitmap = self.bitmap_class(width, height, 2)
+            data = self._data
+            stride = (width + 7) // 8
+            start = self._bitmaps + bits
+            for y in range(height):
+                row = start + y * stride
+                for x in range(width):
+                    if data[row + (x >> 3)] & (0x80 >> (x & 7)):
+                        bitmap[x, y] = 1
+            self._glyphs[code_point] = Glyph(bitmap, 0, width, height, dx, dy, shift_x, 0)
+
+
+##=============================================================================
+def load_font(filename, bitmap=displayio.Bitmap):
+    '''Load a .bcf font.'''
+    with open(filename, "rb") as f:
+        return CompactFont(f.read(), bitmap)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Buffered, leveled console log.
+
+Messages are a format string and a tuple of arguments; logging only stores
+both in a preallocated ring buffer, and the `run()` task formats and prints
+them a few lines at a time, so a tick never waits on the USB console:
+
+    log = ConsoleLog(INFO)
+    asyncio.create_task(log.run())
+    log.info("## Connected to {} RSSI: {}", ssid, rssi)
+
+* Messages below the level return right away; hot paths additionally guard
+  debug messages with `if DEBUG:`, which costs nothing when disabled.
+* The format can also be a function, called with the arguments when the
+  message is written; hot paths pass raw values and leave converting them
+  to text to the drain:
+
+      log.info(format_times, time.time(), rtc.datetime)
+* A message identical to the previous one is not stored again; once a
+  different one arrives, "## last message repeated N times" is logged.
+* A full buffer drops new messages and reports how many were lost; each
+  drain writes at most `batch` lines.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+REPEATED = "## last message repeated {} times"
+DROPPED = "!! log: {} messages dropped"
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class ConsoleLog:
+    '''
+    Ring buffered console log.
+
+    Parameters
+    ----------
+    level : int
+        messages below this level are discarded
+    size : int
+        number of messages buffered
+    batch : int
+        maximum lines written per drain
+    interval : float
+        seconds between drains of run()
+    write : callable
+        output of a formatted line, print() by default
+
+    Attributes
+    ----------
+    logged, written, repeated, dropped : int
+        counters
+    '''
+
+    def __init__(self, level=INFO, size=32, *, batch=8, interval=0.1, write=print):
+        self.level = level
+        self.size = size
+        self.batch = batch
+        self.interval = interval
+        self._write = write
+        self._formats = [None] * size
+        self._args = [None] * size
+        self._head = 0  # oldest pending entry
+        self._count = 0
+        ## Last accepted message, and how often it has been repeated since
+        self._last_format = None
+        self._last_args = None
+        self._repeats = 0
+        self._dropped = 0
+        self.logged = 0
+        self.written = 0
+        self.repeated = 0
+        self.dropped = 0
+
+    ##-------------------------------------------------------------------------
+    @property
+    def pending(self):
+        return self._count
+
+    def _put(self, fmt, args):
+        if self._count == self.size:
+            self._dropped += 1
+            self.dropped += 1
+            return
+        i = (self._head + self._count) % self.size
+        self._formats[i] = fmt
+        self._args[i] = args
+        self._count += 1
+
+    def log(self, level, fmt, *args):
+        '''Buffer a message; it is formatted with fmt.format(*args), or fmt(*args), when it is written.'''
+        if level < self.level:
+            return
+        if fmt is self._last_format and args == self._last_args:
+            self._repeats += 1
+            self.repeated += 1
+            return
+        if self._repeats:
+            self._put(REPEATED, (self._repeats,))
+            self._repeats = 0
+        self._last_format = fmt
+        self._last_args = args
+        self.logged += 1
+        self._put(fmt, args)
+
+    def debug(self, fmt, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, fmt, *args)
+
+    def info(self, fmt, *args):
+        self.log(INFO, fmt, *args)
+
+    def warning(self, fmt, *args):
+        self.log(WARNING, fmt, *args)
+
+    def error(self, fmt, *args):
+        self.log(ERROR, fmt, *args)
+
+    ##-------------------------------------------------------------------------
+    def drain(self, limit=None):
+        '''Format and write up to limit (default batch) pending messages; returns the number written.'''
+        if limit is None:
+            limit = self.batch
+        written = 0
+        while self._count and written < limit:
+            i = self._head
+            fmt = self._formats[i]
+            args = self._args[i]
+            self._formats[i] = self._args[i] = None
+            self._head = (i + 1) % self.size
+            self._count -= 1
+            if callable(fmt):
+                self._write(fmt(*args))
+            else:
+                self._write(fmt.format(*args) if args else fmt)
+            written += 1
+        ## Messages were dropped after everything that was buffered
+        if self._dropped and not self._count and written < limit:
+            self._write(DROPPED.format(self._dropped))
+            self._dropped = 0
+            written += 1
+        self.written += written
+        return written
+
+    def flush(self):
+        '''Write everything now, e.g. before a reset.'''
+        if self._repeats:
+            self._put(REPEATED, (self._repeats,))
+            self._repeats = 0
+            self._last_format = None
+        while self._count or self._dropped:
+            self.drain(self.size)
+
+    async def run(self):
+        '''Background task: drain the buffer every interval.'''
+        while True:
+            self.drain()
+            await asyncio.sleep(self.interval)
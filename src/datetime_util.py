@@ -4,7 +4,7 @@
 Useful clock related functions.
 
 @author: mada
-@version: 2024-12-19
+@version: 2026-10-16
 """
 
 import time
@@ -12,36 +12,43 @@ import time
 ##*****************************************************************************
 ##*****************************************************************************
 
+## Days from 1970-01-01 to the epoch of the platform; CircuitPython has no time.gmtime()
+EPOCH_1970 = 0
+EPOCH_2000 = 10957  # 2000-01-01, used by some embedded ports
+EPOCH = EPOCH_2000 if time.localtime(0)[0] == 2000 else EPOCH_1970
+
+
+## POSIX TZ string of Central Europe: CET (UTC+1H) and CEST (UTC+2H) from the
+## last Sunday of March 02:00 CET to the last Sunday of October 03:00 CEST
+TZ_CET = "CET-1CEST,M3.5.0,M10.5.0/3"
+
+## Names for localtime_toString(), built once
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 ##=============================================================================
-def daylightSavingOffset(ts_utc=time.time()):
+def daylightSavingOffset(ts_utc=None):
     '''
     https://forum.micropython.org/viewtopic.php?f=2&t=4034
 
+    Offset of Central European Time, see PosixTZ.utcoffset().
+
+    Parameters
+    ----------
+    ts_utc : int/float, optional
+        UTC timestamp, defaults to time.time() at the time of the call.
+
     Returns
     -------
     offset : int
         daylight saving offset in seconds
     '''
-    year = time.localtime(ts_utc)[0]  # get current year
-    HHMarch   = time.mktime((year,  3, (31 - (int(5 * year / 4 + 4)) % 7), 1,0,0,0,0,0))  # noqa # Time of March change to CEST
-    HHOctober = time.mktime((year, 10, (31 - (int(5 * year / 4 + 1)) % 7), 1,0,0,0,0,0))  # noqa # Time of October change to CET
-
-    if ts_utc < HHMarch:
-        ## we are before last Sunday of March
-        offset = 3600  # CET: UTC+1H
-    elif ts_utc < HHOctober:
-        ## we are before last Sunday of October
-        offset = 7200  # CEST: UTC+2H
-    else:
-        ## we are after last Sunday of October
-        offset = 3600  # CEST: UTC+1H
-
-    return offset
+    return CET.utcoffset(ts_utc)
 
 
 ##=============================================================================
-def cettime(ts_utc=time.time()):
+def cettime(ts_utc=None):
     '''
     https://forum.micropython.org/viewtopic.php?f=2&t=4034
 
@@ -52,11 +59,19 @@ def cettime(ts_utc=time.time()):
     Changes happen last Sundays of March (CEST) and October (CET) at 01:00 UTC.
     Ref. formulas : http://www.webexhibits.org/daylightsaving/i.html
                     Since 1996, valid through 2099
+
+    Parameters
+    ----------
+    ts_utc : int/float, optional
+        UTC timestamp, defaults to time.time() at the time of the call.
+
     Returns
     -------
     ts_cet : float
         timestamp for CET
     '''
+    if ts_utc is None:
+        ts_utc = time.time()
     offset = daylightSavingOffset(ts_utc)
     ts_cet = time.localtime(ts_utc + offset)
 
@@ -75,29 +90,6 @@ def localtime_toString(localtime):
     timestr : str
     datestr : str
     '''
-    days = {
-        0 : "Mon",
-        1 : "Tue",
-        2 : "Wed",
-        3 : "Thu",
-        4 : "Fri",
-        5 : "Sat",
-        6 : "Sun"
-        }
-    months = {
-        1 : "Jan",
-        2 : "Feb",
-        3 : "Mar",
-        4 : "Apr",
-        5 : "May",
-        6 : "Jun",
-        7 : "Jul",
-        8 : "Aug",
-        9 : "Sep",
-        10 : "Oct",
-        11 : "Nov",
-        12 : "Dec"
-        }
     len_lt = len(localtime)
     if len_lt == 8:
         ## MicroPython
@@ -107,9 +99,9 @@ def localtime_toString(localtime):
         year, month, mday, hour, minute, second, weekday, yearday, dst = localtime
 
     timestr = "{:02d}:{:02d}:{:02d}".format(hour, minute, second)
-    try:
-        datestr = "{}, {:02d} {} {}".format(days[weekday], mday, months[month], year)
-    except Exception:
+    if 0 <= weekday < 7 and 1 <= month <= 12:
+        datestr = "{}, {:02d} {} {}".format(DAYS[weekday], mday, MONTHS[month - 1], year)
+    else:
         datestr = ''
     return timestr, datestr
 
@@ -139,16 +131,360 @@ def get_timetuple(short_time_tuple):
         placeholder for the daylight savings time flag (N/A here).
     '''
     year, month, day, hour, minute, second = short_time_tuple
-    days_since_jan1 = (31, 28 + (year % 4 == 0), 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
-    day_of_year = sum(days_since_jan1[:month - 1]) + day
-    days_since_1900 = (year - 1900) * 365 + (year - 1901) // 4 + day_of_year - 1
-    days_since_1970 = days_since_1900 - 25568
-    day_of_week = (days_since_1970 + 4) % 7
-    # seconds_since_midnight = hour * 3600 + minute * 60 + second
+    days = days_from_civil(year, month, day)
+    day_of_week = (days + 3) % 7  # 1970-01-01 was a Thursday
+    day_of_year = days - days_from_civil(year, 1, 1) + 1
 
     return year, month, day, hour, minute, second, day_of_week, day_of_year, -1
 
 
+##=============================================================================
+def days_from_civil(year, month, day):
+    '''
+    Count the days from 1970-01-01 to a date of the proleptic Gregorian calendar.
+
+    Integer math only, no time.mktime() involved.
+    Ref. algorithm : https://howardhinnant.github.io/date_algorithms.html
+
+    Returns
+    -------
+    days : int
+        days since 1970-01-01 (negative before)
+    '''
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400  # [0, 399]
+    doy = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1  # [0, 365]
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy  # [0, 146096]
+    return era * 146097 + doe - 719468
+
+
+##=============================================================================
+def civil_from_days(days):
+    '''
+    Inverse of days_from_civil().
+
+    Returns
+    -------
+    year : int
+    month : int
+    day : int
+    '''
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097  # [0, 146096]
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365  # [0, 399]
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)  # [0, 365], starting March 1st
+    mp = (5 * doy + 2) // 153  # [0, 11], starting March
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    return yoe + era * 400 + (month <= 2), month, day
+
+
+##=============================================================================
+def civil_to_epoch(year, month, day, hour=0, minute=0, second=0, epoch=EPOCH):
+    '''
+    Replacement for time.mktime() without the struct_time round-trip.
+
+    Parameters
+    ----------
+    epoch : int
+        EPOCH_1970 or EPOCH_2000, defaults to the epoch of the platform.
+
+    Returns
+    -------
+    ts : int
+        seconds since the epoch
+    '''
+    return (days_from_civil(year, month, day) - epoch) * 86400 + hour * 3600 + minute * 60 + second
+
+
+##=============================================================================
+def epoch_to_civil(ts, epoch=EPOCH):
+    '''
+    Replacement for time.localtime()/time.gmtime() using integer math only.
+
+    Unlike time.localtime() on the ESP32 ports this does not overflow for
+    timestamps beyond a machine word.
+
+    Parameters
+    ----------
+    ts : int/float
+        seconds since the epoch
+    epoch : int
+        EPOCH_1970 or EPOCH_2000, defaults to the epoch of the platform.
+
+    Returns
+    -------
+    year : int
+    month : int
+    day : int
+    hour : int
+    minute : int
+    second : int
+    day_of_week : int
+        Monday is 0.
+    day_of_year : int
+        January 1st is 1.
+    '''
+    days, secs = divmod(int(ts), 86400)
+    days += epoch
+    day_of_week = (days + 3) % 7  # 1970-01-01 was a Thursday
+    ## Inlined civil_from_days()
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    if mp < 10:
+        month = mp + 3
+        year = yoe + era * 400
+        leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        day_of_year = doy + 60 + leap
+    else:
+        month = mp - 9
+        year = yoe + era * 400 + 1
+        day_of_year = doy - 305
+    hour, secs = divmod(secs, 3600)
+    minute, second = divmod(secs, 60)
+    return year, month, day, hour, minute, second, day_of_week, day_of_year
+
+
+##=============================================================================
+class PosixTZ:
+    '''
+    Time zone described by a POSIX TZ string, e.g. "CET-1CEST,M3.5.0,M10.5.0/3".
+
+    Format: std offset [dst [offset] [,start[/time],end[/time]]]
+
+    * Names are three or more letters, or quoted in angle brackets ("<+03>").
+    * Offsets are [+-]hh[:mm[:ss]] west of UTC, i.e. "CET-1" is UTC+1H. The
+      DST offset defaults to one hour ahead of standard time.
+    * Rules are "Mm.w.d" (day d of week w of month m, d=0 is Sunday, w=5 is
+      the last), "Jn" (day 1..365, never counting February 29th) or "n"
+      (day 0..365). The time of day defaults to 02:00:00 local time.
+
+    The two transitions of a year are compiled to UTC timestamps once, and
+    utcoffset() caches the [start, end) interval it last answered for. The
+    common call is two compares; rules are only evaluated again at the next
+    transition or the turn of the year.
+    '''
+
+    def __init__(self, tz_string):
+        self.tz_string = tz_string
+        self._pos = 0
+        self.std_name = self._parse_name()
+        self.std_offset = -self._parse_offset()
+        self.dst_name = None
+        self.dst_offset = self.std_offset
+        self.dst_start = None
+        self.dst_end = None
+        if self._pos < len(tz_string):
+            self.dst_name = self._parse_name()
+            self.dst_offset = self.std_offset + 3600
+            if self._pos < len(tz_string) and tz_string[self._pos] != ",":
+                self.dst_offset = -self._parse_offset()
+            if self._pos < len(tz_string):
+                self._expect(",")
+                self.dst_start = self._parse_rule()
+                self._expect(",")
+                self.dst_end = self._parse_rule()
+            else:
+                ## No rules given: fall back to the US rules like glibc does
+                self.dst_start = ("M", 3, 2, 0, 7200)
+                self.dst_end = ("M", 11, 1, 0, 7200)
+        if self._pos != len(tz_string):
+            self._fail()
+        ## Cached segment: _offset is valid for _lo <= ts_utc < _hi
+        self._lo = 0
+        self._hi = 0
+        self._offset = self.std_offset
+        self._isdst = False
+
+    def __repr__(self):
+        return "PosixTZ({!r})".format(self.tz_string)
+
+    ##-------------------------------------------------------------------------
+    def _fail(self):
+        raise ValueError("invalid TZ string: {!r} (at {})".format(self.tz_string, self._pos))
+
+    def _expect(self, char):
+        if self.tz_string[self._pos:self._pos + 1] != char:
+            self._fail()
+        self._pos += 1
+
+    def _parse_name(self):
+        s = self.tz_string
+        start = self._pos
+        if s[start:start + 1] == "<":
+            end = s.find(">", start)
+            if end < 0:
+                self._fail()
+            self._pos = end + 1
+            name = s[start + 1:end]
+        else:
+            end = start
+            while end < len(s) and s[end].isalpha():
+                end += 1
+            self._pos = end
+            name = s[start:end]
+        if len(name) < 3:
+            self._fail()
+        return name
+
+    def _parse_int(self):
+        s = self.tz_string
+        start = self._pos
+        while self._pos < len(s) and s[self._pos].isdigit():
+            self._pos += 1
+        if self._pos == start:
+            self._fail()
+        return int(s[start:self._pos])
+
+    def _parse_offset(self):
+        '''Parse [+-]hh[:mm[:ss]] into seconds.'''
+        sign = 1
+        if self.tz_string[self._pos:self._pos + 1] in ("+", "-"):
+            sign = -1 if self.tz_string[self._pos] == "-" else 1
+            self._pos += 1
+        seconds = self._parse_int() * 3600
+        for scale in (60, 1):
+            if self.tz_string[self._pos:self._pos + 1] != ":":
+                break
+            self._pos += 1
+            seconds += self._parse_int() * scale
+        return sign * seconds
+
+    def _parse_rule(self):
+        '''Parse a start or end rule into (kind, a, b, c, seconds after local midnight).'''
+        s = self.tz_string
+        if s[self._pos:self._pos + 1] == "M":
+            self._pos += 1
+            month = self._parse_int()
+            self._expect(".")
+            week = self._parse_int()
+            self._expect(".")
+            weekday = self._parse_int()
+            if not (1 <= month <= 12 and 1 <= week <= 5 and 0 <= weekday <= 6):
+                self._fail()
+            rule = ["M", month, week, weekday]
+        elif s[self._pos:self._pos + 1] == "J":
+            self._pos += 1
+            day = self._parse_int()
+            if not 1 <= day <= 365:
+                self._fail()
+            rule = ["J", day, 0, 0]
+        else:
+            day = self._parse_int()
+            if not 0 <= day <= 365:
+                self._fail()
+            rule = ["N", day, 0, 0]
+        seconds = 7200
+        if s[self._pos:self._pos + 1] == "/":
+            self._pos += 1
+            seconds = self._parse_offset()
+        rule.append(seconds)
+        return tuple(rule)
+
+    ##-------------------------------------------------------------------------
+    @staticmethod
+    def _rule_days(rule, year):
+        '''Days since 1970-01-01 of the date a rule selects in a year.'''
+        kind, a, b, c, _ = rule
+        if kind == "M":
+            first = days_from_civil(year, a, 1)
+            if a == 12:
+                length = days_from_civil(year + 1, 1, 1) - first
+            else:
+                length = days_from_civil(year, a + 1, 1) - first
+            day = (c - (first + 4)) % 7 + (b - 1) * 7  # 1970-01-01 was a Thursday (4)
+            while day >= length:
+                day -= 7
+            return first + day
+        jan1 = days_from_civil(year, 1, 1)
+        if kind == "J":
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            return jan1 + a - 1 + (leap and a >= 60)
+        return jan1 + a
+
+    def transitions(self, year):
+        '''
+        Compile the rules for one year.
+
+        Returns
+        -------
+        dst_start : int
+            UTC timestamp at which daylight saving time starts
+        dst_end : int
+            UTC timestamp at which daylight saving time ends
+        None if the zone has no daylight saving time.
+        '''
+        if self.dst_start is None:
+            return None
+        start = (self._rule_days(self.dst_start, year) - EPOCH) * 86400 + self.dst_start[4] - self.std_offset
+        end = (self._rule_days(self.dst_end, year) - EPOCH) * 86400 + self.dst_end[4] - self.dst_offset
+        return start, end
+
+    def _segment(self, ts_utc):
+        '''Find the [lo, hi) interval of constant offset around ts_utc.'''
+        year = epoch_to_civil(ts_utc)[0]
+        lo = civil_to_epoch(year, 1, 1)
+        hi = civil_to_epoch(year + 1, 1, 1)
+        if self.dst_start is None:
+            return lo, hi, self.std_offset, False
+        start, end = self.transitions(year)
+        if start < end:
+            ## Northern hemisphere: DST within the year
+            bounds = ((lo, start, False), (start, end, True), (end, hi, False))
+        else:
+            ## Southern hemisphere: DST across the turn of the year
+            bounds = ((lo, end, True), (end, start, False), (start, hi, True))
+        for seg_lo, seg_hi, isdst in bounds:
+            if ts_utc < seg_hi:
+                break
+        return seg_lo, seg_hi, self.dst_offset if isdst else self.std_offset, isdst
+
+    ##-------------------------------------------------------------------------
+    def utcoffset(self, ts_utc=None):
+        '''
+        Offset of local time from UTC.
+
+        Parameters
+        ----------
+        ts_utc : int/float, optional
+            UTC timestamp, defaults to time.time() at the time of the call.
+
+        Returns
+        -------
+        offset : int
+            seconds east of UTC
+        '''
+        if ts_utc is None:
+            ts_utc = time.time()
+        if self._lo <= ts_utc < self._hi:
+            return self._offset
+        self._lo, self._hi, self._offset, self._isdst = self._segment(ts_utc)
+        return self._offset
+
+    def isdst(self, ts_utc=None):
+        self.utcoffset(ts_utc)
+        return self._isdst
+
+    def tzname(self, ts_utc=None):
+        return self.dst_name if self.isdst(ts_utc) else self.std_name
+
+    def localtime(self, ts_utc=None):
+        '''Local time as (year, month, day, hour, minute, second, weekday, yearday).'''
+        if ts_utc is None:
+            ts_utc = time.time()
+        return epoch_to_civil(ts_utc + self.utcoffset(ts_utc))
+
+
+CET = PosixTZ(TZ_CET)
+
+
 ##*****************************************************************************
 ##*****************************************************************************
 if __name__ == '__main__':
@@ -189,6 +525,6 @@ if __name__ == '__main__':
     seconds_since_epoch = time.mktime(localtime_full)
     print(seconds_since_epoch)
     print("> convert seconds to a full time tuple with weekday and yearday")
-    ## TODO: this fails on ESP32 with OverflowError: overflow converting long int to machine word
-    full_time_tuple = time.localtime(seconds_since_epoch)
+    ## time.localtime() fails here on ESP32 with OverflowError: overflow converting long int to machine word
+    full_time_tuple = epoch_to_civil(seconds_since_epoch)
     print(full_time_tuple)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+
+"""
+Periodic jobs at absolute deadlines on top of asyncio.
+
+`await asyncio.sleep(period)` after the work drifts by the duration of the
+work every round. Here every job has a deadline on the monotonic clock, and
+the next one is the previous deadline plus the period, so the schedule never
+drifts; lateness shows up as jitter instead. A job can be aligned to a
+boundary, e.g. the render job to the seconds of the disciplined clock; each
+deadline is then the first boundary after the previous one, so a clock that
+is stepped or slewed moves the schedule along with it:
+
+    scheduler = Scheduler()
+    scheduler.every("render", 1, render, priority=0, align=clock.next_second)
+    scheduler.every("sensor", 2, read_sensor, priority=1)
+    scheduler.every("ntp", ntp_client.next_delay, sync, priority=2)
+    await scheduler.run()
+
+* Plain functions run inline, coroutine functions as their own task; a job
+  still running at its next deadline is not started twice (an overrun).
+* The period is seconds, or a callable asked for the delay from the end of
+  each run (e.g. a backoff after a failed NTP sync).
+* Jobs due at the same time run in priority order, lower values first.
+* Deadlines that have passed entirely are skipped and counted as missed.
+* A job raising an exception is stopped and reported to the event loop's
+  exception handler, like a task that died.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import asyncio
+import time
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class Job:
+    '''
+    A periodic job and its statistics.
+
+    Attributes
+    ----------
+    deadline : int or None
+        monotonic ns of the next run, None while waiting for a callable
+        period to be asked after the current run
+    runs, overruns, missed : int
+        counters
+    late_max_ns, late_sum_ns, duration_max_ns : int
+        start after the deadline (jitter) and run time
+    failed : Exception or None
+        the exception that stopped the job
+    '''
+
+    def __init__(self, name, period, func, priority, align, delay):
+        self.name = name
+        self.period = period
+        self.func = func
+        self.priority = priority
+        self.align = align
+        self.delay = delay
+        self.deadline = None
+        self.running = False
+        self.paused = False
+        self.failed = None
+        self.runs = 0
+        self.overruns = 0
+        self.missed = 0
+        self.late_max_ns = 0
+        self.late_sum_ns = 0
+        self.duration_max_ns = 0
+
+    def period_ns(self):
+        period = self.period() if callable(self.period) else self.period
+        return int(period * 1_000_000_000)
+
+    def report(self):
+        '''One line of statistics.'''
+        late_avg = self.late_sum_ns / self.runs / 1e6 if self.runs else 0.0
+        return "## Task {}: {} runs, late avg {:.1f}ms max {:.1f}ms, longest {:.1f}ms, {} overruns, {} missed".format(
+            self.name, self.runs, late_avg, self.late_max_ns / 1e6, self.duration_max_ns / 1e6, self.overruns, self.missed)
+
+
+##=============================================================================
+class Scheduler:
+    '''
+    Run periodic jobs at absolute monotonic deadlines.
+
+    Attributes
+    ----------
+    jobs : list of Job
+        in priority order
+    '''
+
+    def __init__(self):
+        self.jobs = []
+        self._wake = None
+
+    def every(self, name, period, func, *, priority=10, align=None, delay=0):
+        '''
+        Add a periodic job.
+
+        Parameters
+        ----------
+        name : str
+        period : float or callable
+            seconds between deadlines, or a callable returning them after each run
+        func : callable
+            function or coroutine function without arguments
+        priority : int
+            lower runs first when several jobs are due
+        align : callable, optional
+            maps a monotonic ns to the first boundary after it
+        delay : float
+            seconds until the first run
+
+        Returns
+        -------
+        job : Job
+        '''
+        job = Job(name, period, func, priority, align, delay)
+        index = len(self.jobs)
+        while index > 0 and self.jobs[index - 1].priority > priority:
+            index -= 1
+        self.jobs.insert(index, job)
+        return job
+
+    def job(self, name):
+        for job in self.jobs:
+            if job.name == name:
+                return job
+        raise KeyError(name)
+
+    def pause(self, name):
+        self.job(name).paused = True
+
+    def resume(self, name):
+        self.job(name).paused = False
+
+    ##-------------------------------------------------------------------------
+    def _next(self, job, base_ns, now_ns):
+        '''Deadline one period (or boundary) after base_ns; deadlines already past are skipped and counted as missed.'''
+        period = job.period_ns()
+        deadline = base_ns + period if job.align is None else job.align(base_ns)
+        if deadline < now_ns and period > 0:
+            skipped = (now_ns - deadline) // period + 1
+            job.missed += skipped
+            deadline = deadline + skipped * period if job.align is None else job.align(now_ns)
+        return deadline
+
+    def _start(self, job, now_ns):
+        deadline = job.deadline
+        late = now_ns - deadline
+        job.runs += 1
+        job.late_sum_ns += late
+        if late > job.late_max_ns:
+            job.late_max_ns = late
+        ## Fixed periods are scheduled right away, callable ones at the end of the run
+        job.deadline = None if callable(job.period) else self._next(job, deadline, now_ns)
+        job.running = True
+        try:
+            result = job.func()
+        except Exception as e:
+            self._fail(job, e)
+            return
+        if hasattr(result, "send"):
+            asyncio.create_task(self._finish(job, deadline, now_ns, result))
+        else:
+            self._done(job, deadline, now_ns)
+
+    async def _finish(self, job, deadline, started_ns, coro):
+        try:
+            await coro
+        except Exception as e:
+            self._fail(job, e)
+            return
+        self._done(job, deadline, started_ns)
+
+    def _done(self, job, deadline, started_ns):
+        now = time.monotonic_ns()
+        job.running = False
+        if now - started_ns > job.duration_max_ns:
+            job.duration_max_ns = now - started_ns
+        if job.deadline is None:
+            job.deadline = self._next(job, now, now)
+            if self._wake is not None:
+                self._wake.set()
+        elif job.deadline <= now:
+            ## Ran past its next deadline, which is run late right away
+            job.overruns += 1
+
+    def _fail(self, job, error):
+        job.running = False
+        job.failed = error
+        asyncio.get_event_loop().call_exception_handler(
+            {"message": "job {} failed".format(job.name), "exception": error})
+
+    ##-------------------------------------------------------------------------
+    def _run_due(self):
+        '''Start the jobs that are due, in priority order; returns the earliest deadline, None if there is none.'''
+        now = time.monotonic_ns()
+        next_deadline = None
+        for job in self.jobs:
+            if job.paused or job.failed is not None or job.deadline is None:
+                continue
+            if job.deadline <= now:
+                if job.running:
+                    ## Still busy with the previous deadline: skip this one
+                    job.overruns += 1
+                    job.deadline = self._next(job, job.deadline, now)
+                else:
+                    self._start(job, now)
+                    now = time.monotonic_ns()
+            if job.deadline is not None and (next_deadline is None or job.deadline < next_deadline):
+                next_deadline = job.deadline
+        return next_deadline
+
+    async def run(self):
+        '''Run the jobs forever.'''
+        self._wake = asyncio.Event()
+        now = time.monotonic_ns()
+        for job in self.jobs:
+            ## Jobs of a previous, cancelled run() start over
+            job.running = False
+            if job.deadline is None:
+                first = now + int(job.delay * 1_000_000_000)
+                job.deadline = job.align(first) if job.align is not None else first
+        while True:
+            next_deadline = self._run_due()
+            delay = None if next_deadline is None else next_deadline - time.monotonic_ns()
+            if delay is not None and delay <= 0:
+                await asyncio.sleep(0)
+                continue
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), None if delay is None else delay / 1e9)
+            except asyncio.TimeoutError:
+                pass
+
+    def report(self):
+        '''Statistics of all jobs, one line each.'''
+        return [job.report() for job in self.jobs]
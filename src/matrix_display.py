@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+Explicit-refresh display backend for the RGB matrix.
+
+Like `code_scrolling text.py`, the panel is driven by a
+`framebufferio.FramebufferDisplay` with `auto_refresh=False`, so displayio
+only composites a frame when asked to. The clock refreshes when its render
+state reports a change, plus at a configurable minimum frame rate, and
+counts the frames it pushes:
+
+    matrix = MatrixDisplay(min_fps=0.2)
+    display = matrix.display
+    ...
+    update_display()
+    matrix.update(render)  # refreshes only if render.dirty or min_fps is due
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import time
+
+import board
+import displayio
+import framebufferio
+import rgbmatrix
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class MatrixDisplay:
+    '''
+    64x32 HUB75 matrix on the MatrixPortal with change-driven refreshes.
+
+    Attributes
+    ----------
+    frames : int
+        frames pushed so far
+    skipped : int
+        update() calls that found nothing to push
+    fps : float
+        frames per second over the last second or so
+    '''
+
+    def __init__(self, *, width=64, height=32, bit_depth=2, rotation=0, min_fps=0.2):
+        displayio.release_displays()
+        self.matrix = rgbmatrix.RGBMatrix(
+            width=width, height=height, bit_depth=bit_depth,
+            rgb_pins=[board.MTX_R1, board.MTX_G1, board.MTX_B1, board.MTX_R2, board.MTX_G2, board.MTX_B2],
+            addr_pins=[board.MTX_ADDRA, board.MTX_ADDRB, board.MTX_ADDRC, board.MTX_ADDRD],
+            clock_pin=board.MTX_CLK, latch_pin=board.MTX_LAT, output_enable_pin=board.MTX_OE)
+        self.display = framebufferio.FramebufferDisplay(self.matrix, rotation=rotation, auto_refresh=False)
+        ## Refresh at least every 1 / min_fps seconds, even without changes (0 = never)
+        self.min_fps = min_fps
+        self.dirty = True
+        self.frames = 0
+        self.skipped = 0
+        self.fps = 0.0
+        self._last_frame = None
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+
+    ##-------------------------------------------------------------------------
+    def invalidate(self):
+        '''Mark the frame as changed outside the render state (splash, fades, ...).'''
+        self.dirty = True
+
+    def refresh(self):
+        '''Push a frame now.'''
+        self.display.refresh(minimum_frames_per_second=0)
+        self.dirty = False
+        self.frames += 1
+        self._window_frames += 1
+        self._last_frame = time.monotonic()
+
+    def update(self, render=None):
+        '''
+        Push a frame if something changed or the minimum frame rate is due.
+
+        Parameters
+        ----------
+        render : render_state.RenderState
+            its dirty flag is consumed
+
+        Returns
+        -------
+        refreshed : bool
+        '''
+        now = time.monotonic()
+        if render is not None and render.dirty:
+            render.dirty = False
+            self.dirty = True
+        due = self.min_fps and (self._last_frame is None or now - self._last_frame >= 1 / self.min_fps)
+        if self.dirty or due:
+            self.refresh()
+            refreshed = True
+        else:
+            self.skipped += 1
+            refreshed = False
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+        return refreshed
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+
+"""
+Non-blocking asyncio SNTP client for a set of servers.
+
+Requests go out over UDP sockets from the regular socket pool
+(`adafruit_connection_manager.get_radio_socketpool(esp)`); replies are
+polled with a zero timeout between `asyncio.sleep()` calls, so the event
+loop keeps rendering while queries are in flight.
+
+A sync round queries all healthy servers concurrently, each with a short
+burst of full t1..t4 exchanges:
+
+    offset = ((t2 - t1) + (t3 - t4)) / 2
+    delay  = (t4 - t1) - (t3 - t2)
+
+Per server the lowest-delay sample of the burst is kept (clock filter).
+Servers whose offset is far from the median are dropped as outliers, and
+the lowest-delay survivor disciplines the clock. A server that does not
+answer is held off with a growing backoff, and a round stops waiting for
+stragglers shortly after the first server has answered its burst, so one
+broken server does not cost a full timeout on every sync. Failed rounds are retried with
+exponential backoff and jitter.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import errno
+import random
+import struct
+import time
+import asyncio
+
+## Seconds from 1900-01-01 (NTP era 0) to 1970-01-01
+NTP_TO_UNIX = 2_208_988_800
+## Offsets further than this (and 3 median deviations) from the median are outliers
+OUTLIER_NS = 125_000_000  # 125ms
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def to_ntp(utc_ns):
+    '''UTC nanoseconds to a 64 bit NTP timestamp (seconds, fraction).'''
+    seconds, ns = divmod(utc_ns, 1_000_000_000)
+    return (seconds + NTP_TO_UNIX) & 0xFFFF_FFFF, (ns << 32) // 1_000_000_000
+
+
+##=============================================================================
+def from_ntp(packet, offset):
+    '''64 bit NTP timestamp at packet[offset] to UTC nanoseconds.'''
+    seconds, fraction = struct.unpack_from("!II", packet, offset)
+    if seconds < 0x8000_0000:
+        seconds += 0x1_0000_0000  # era 1 starts 2036-02-07
+    return (seconds - NTP_TO_UNIX) * 1_000_000_000 + (fraction * 1_000_000_000 >> 32)
+
+
+##=============================================================================
+class NTPServer:
+    '''Address, health and last sample of one server ("host" or "host:port").'''
+
+    def __init__(self, name, port=123):
+        host, _, custom_port = name.partition(":")
+        self.name = name
+        self.host = host
+        self.port = int(custom_port) if custom_port else port
+        self.addr = None
+        ## Reachability register, one bit per round, 1 = answered (as in ntpd)
+        self.reach = 0
+        self.consecutive_failures = 0
+        self.holdoff_until = 0  # time.monotonic()
+        self.last_error = None
+        self.last_offset_ns = None
+        self.last_delay_ns = None
+
+    def __repr__(self):
+        return "NTPServer({!r}, reach=0o{:o})".format(self.name, self.reach)
+
+
+##=============================================================================
+class NTPClient:
+    '''
+    Multi-server SNTP client feeding a softclock.SoftClock.
+
+    Usage in a task:
+        while True:
+            await ntp_client.sync()
+            await asyncio.sleep(ntp_client.next_delay())
+    '''
+
+    def __init__(self, pool, clock, *, servers=("pool.ntp.org",), port=123, interval=3600,
+                 timeout=2.0, poll_interval=0.01, burst=3, settle=0.5,
+                 min_backoff=8, max_backoff=900):
+        self._pool = pool
+        self._clock = clock
+        if isinstance(servers, str):
+            servers = [name.strip() for name in servers.split(",") if name.strip()]
+        self.servers = [NTPServer(name, port) for name in servers]
+        ## Seconds between successful syncs
+        self.interval = interval
+        ## Seconds to wait for one reply, and how often to look for it
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        ## Exchanges per server and round
+        self.burst = burst
+        ## Seconds to wait for stragglers once the first server is done with a sample
+        self.settle = settle
+        ## Retry delays after failures grow from min_backoff to max_backoff seconds
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        ## Statistics
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.outliers = 0
+        self.last_error = None
+        self.last_server = None
+        self.last_rtt_ns = None  # round trip delay of the chosen sample
+        self.last_offset_ns = None
+        self.last_sync = None  # time.monotonic() of the last successful sync
+
+    ##-------------------------------------------------------------------------
+    def _resolve(self, server):
+        '''Resolve a server once; DNS lookups block on the ESP32.'''
+        if server.addr is None:
+            server.addr = self._pool.getaddrinfo(server.host, server.port)[0][-1]
+        return server.addr
+
+    def _recv(self, sock, packet):
+        '''Non-blocking receive: number of bytes, 0 if nothing has arrived yet.'''
+        try:
+            return sock.recv_into(packet) or 0
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.ETIMEDOUT):
+                return 0
+            raise
+
+    async def exchange(self, server):
+        '''
+        One request/reply exchange with a server, without blocking the loop.
+
+        Returns
+        -------
+        offset_ns : int
+            server time minus clock time
+        delay_ns : int
+            round trip delay without the server's processing time,
+            including up to one poll interval
+        t4_ns : int
+            clock time when the reply was picked up
+        mono_ns : int
+            time.monotonic_ns() when the reply was picked up
+        '''
+        addr = self._resolve(server)
+        packet = bytearray(48)
+        sock = self._pool.socket(self._pool.AF_INET, self._pool.SOCK_DGRAM)
+        try:
+            sock.settimeout(0)
+            packet[0] = 0b00_100_011  # LI 0, version 4, mode 3 (client)
+            t1 = self._clock.time_ns()
+            struct.pack_into("!II", packet, 40, *to_ntp(t1))
+            request = bytes(packet[40:48])
+            sock.sendto(packet, addr)
+            for _ in range(max(1, int(self.timeout / self.poll_interval))):
+                await asyncio.sleep(self.poll_interval)
+                if self._recv(sock, packet) >= 48:
+                    break
+            else:
+                raise OSError(errno.ETIMEDOUT, "NTP reply timed out")
+            mono_ns = time.monotonic_ns()
+            t4 = self._clock.time_ns()
+        finally:
+            sock.close()
+
+        if packet[0] & 0b111 != 4 or packet[1] == 0:
+            ## Not a server reply, or a kiss-o'-death packet (stratum 0)
+            raise ValueError("bad NTP reply from {} (mode {}, stratum {})".format(
+                server.name, packet[0] & 0b111, packet[1]))
+        if packet[24:32] != request:
+            ## The originate timestamp must echo our transmit timestamp
+            raise ValueError("stale NTP reply from {}".format(server.name))
+        t2 = from_ntp(packet, 32)
+        t3 = from_ntp(packet, 40)
+        return ((t2 - t1) + (t3 - t4)) // 2, (t4 - t1) - (t3 - t2), t4, mono_ns
+
+    async def _burst(self, server, samples):
+        '''Exchange up to `burst` packets with one server, collecting samples.'''
+        try:
+            for _ in range(self.burst):
+                samples.append(await self.exchange(server))
+        except (OSError, RuntimeError, ValueError) as e:
+            ## OSError includes TimeoutError and ConnectionError from the ESP32
+            server.last_error = e
+
+    async def _round(self):
+        '''
+        Query the healthy servers concurrently.
+
+        Returns
+        -------
+        best : list of (server, sample)
+            the lowest-delay sample of every server that answered
+        '''
+        now = time.monotonic()
+        servers = [server for server in self.servers if server.holdoff_until <= now] or self.servers
+        samples = {}
+        tasks = {}
+        for server in servers:
+            server.last_error = None
+            samples[server] = []
+            tasks[server] = asyncio.create_task(self._burst(server, samples[server]))
+
+        first_done = None
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            pending = [server for server in servers if not tasks[server].done()]
+            if not pending:
+                break
+            ## Servers failing at once (DNS, refused) must not cut short the bursts of healthy ones
+            if first_done is None and any(samples[server] for server in servers if tasks[server].done()):
+                first_done = time.monotonic()
+            if first_done is not None and time.monotonic() - first_done >= self.settle:
+                ## Do not wait a full timeout for stragglers
+                for server in pending:
+                    tasks[server].cancel()
+                    server.last_error = OSError(errno.ETIMEDOUT, "NTP server too slow")
+                await asyncio.sleep(0)  # let them close their sockets
+                break
+
+        best = []
+        for server in servers:
+            answered = bool(samples[server])
+            server.reach = ((server.reach << 1) | answered) & 0xFF
+            if answered:
+                sample = min(samples[server], key=lambda s: s[1])
+                server.last_offset_ns, server.last_delay_ns = sample[0], sample[1]
+                server.consecutive_failures = 0
+                server.holdoff_until = 0
+                best.append((server, sample))
+            else:
+                server.consecutive_failures += 1
+                server.holdoff_until = time.monotonic() + self._backoff(server.consecutive_failures)
+                server.addr = None  # resolve again next time
+                self.last_error = server.last_error
+        return best
+
+    def _select(self, best):
+        '''Drop outliers from the per-server samples and pick the lowest-delay survivor.'''
+        if len(best) >= 3:
+            offsets = sorted(sample[0] for _, sample in best)
+            median = offsets[len(offsets) // 2]
+            spread = sorted(abs(offset - median) for offset in offsets)[len(offsets) // 2]
+            limit = max(3 * spread, OUTLIER_NS)
+            survivors = [entry for entry in best if abs(entry[1][0] - median) <= limit]
+            self.outliers += len(best) - len(survivors)
+            best = survivors
+        return min(best, key=lambda entry: entry[1][1])
+
+    ##-------------------------------------------------------------------------
+    async def sync(self):
+        '''
+        Run one round over the servers and discipline the clock with the result.
+
+        Returns
+        -------
+        success : bool
+        '''
+        best = await self._round()
+        if not best:
+            self.failures += 1
+            self.consecutive_failures += 1
+            return False
+        server, (offset_ns, delay_ns, t4_ns, mono_ns) = self._select(best)
+        self.last_offset_ns = self._clock.sync(t4_ns + offset_ns, mono_ns)
+        self.last_rtt_ns = delay_ns
+        self.last_server = server.name
+        self.last_sync = time.monotonic()
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.last_error = None
+        return True
+
+    def _backoff(self, failures):
+        backoff = min(self.max_backoff, self.min_backoff * 2 ** (failures - 1))
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def next_delay(self):
+        '''Seconds until the next sync: the interval, or a jittered backoff after failures.'''
+        if self.consecutive_failures == 0:
+            return self.interval
+        return self._backoff(self.consecutive_failures)
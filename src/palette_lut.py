@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+"""
+Gamma-corrected brightness LUTs for palette slots.
+
+Every colored element of a theme is one palette slot. For each slot a table
+of `LEVELS` gamma-corrected colors, rounded to the steps the matrix shows
+at its bit depth, is computed once at startup; dimming and fading then only
+write a handful of palette entries from those tables, no label is recolored
+and no pixel is touched.
+
+    fader = ThemeFader({"day": [PaletteSlot(face_palette, 1)], ...}, apply_theme)
+    fader.switch("night")  # fade out, apply_theme("night"), fade in
+    while fader.update():   # at most `budget` slot writes per frame
+        ...
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import time
+from array import array
+
+## Brightness levels per slot, 0 = off, LEVELS - 1 = the slot's full color;
+## one per step of a channel at the matrix's bit depth, more would not show
+BIT_DEPTH = 2
+LEVELS = 1 << BIT_DEPTH
+GAMMA = 2.2
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def gamma_lut(color, levels=LEVELS, gamma=GAMMA, bit_depth=BIT_DEPTH):
+    '''
+    Colors of `color` at levels 0 .. levels - 1, gamma corrected.
+
+    The matrix shows the top bit_depth bits of each channel. Channel values
+    are rounded to those steps; above level 0, a channel that shows at full
+    color keeps at least one step instead of rounding to black.
+    '''
+    lut = array('L', [0] * levels)
+    step = 256 >> bit_depth
+    for level in range(levels):
+        scale = (level / (levels - 1)) ** gamma
+        value = 0
+        for shift in (16, 8, 0):
+            channel = (color >> shift) & 0xFF
+            scaled = round(channel * scale)
+            if level and channel >= step:
+                scaled = max(step, min(channel, round(scaled / step) * step))
+            value |= scaled << shift
+        lut[level] = value
+    return lut
+
+
+##=============================================================================
+class PaletteSlot:
+    '''
+    One palette entry with its brightness LUT.
+
+    Parameters
+    ----------
+    target : displayio.Palette or label
+        palette to write, or an object with a `color` property (index None)
+    index : int or None
+        palette index
+    color : int
+        full brightness color; defaults to the palette's current color
+    '''
+
+    def __init__(self, target, index=None, color=None, levels=LEVELS, gamma=GAMMA, bit_depth=BIT_DEPTH):
+        if color is None:
+            color = target.color if index is None else target[index]
+        self.target = target
+        self.index = index
+        self.lut = gamma_lut(color, levels, gamma, bit_depth)
+        self.level = None
+
+    def set(self, level):
+        '''Write the color of level; False if the slot already shows it.'''
+        if level == self.level:
+            return False
+        self.level = level
+        if self.index is None:
+            self.target.color = self.lut[level]
+        else:
+            self.target[self.index] = self.lut[level]
+        return True
+
+
+##=============================================================================
+class ThemeFader:
+    '''
+    Brightness and fades of themed palette slots.
+
+    Parameters
+    ----------
+    slots : dict
+        theme name -> list of PaletteSlot
+    apply : callable
+        apply(theme) switches fonts and visibility; called at level 0, after
+        the new theme's slots have been set to level 0
+    duration : float
+        seconds per fade out or fade in
+    budget : int
+        maximum slot writes per update(), i.e. per frame
+    '''
+
+    def __init__(self, slots, apply, *, duration=1.5, budget=4, levels=LEVELS):
+        self.slots = slots
+        self._apply = apply
+        self.duration = duration
+        self.budget = budget
+        self.max_level = levels - 1
+        self.theme = None
+        ## Target brightness per theme (dimming, auto brightness)
+        self.brightness = {theme: self.max_level for theme in slots}
+        self.level = 0
+        self._next_theme = None
+        self._from = self._to = 0
+        self._start = self._end = 0.0
+        self._cursor = 0
+        ## Number of slot writes, for profiling
+        self.writes = 0
+
+    ##-------------------------------------------------------------------------
+    @property
+    def active(self):
+        '''True while a fade is running or slots are behind the current level.'''
+        return self._next_theme is not None or self._from != self._to or self._pending()
+
+    def _pending(self):
+        if self.theme is None:
+            return False
+        for slot in self.slots[self.theme]:
+            if slot.level != self.level:
+                return True
+        return False
+
+    def _fade(self, to_level, now):
+        self._from = self.level
+        self._to = to_level
+        self._start = now
+        span = abs(to_level - self.level) / self.max_level
+        self._end = now + self.duration * span
+
+    def switch(self, theme, *, fade=True, now=None):
+        '''Fade out, apply theme, fade in; without fade (e.g. at boot) switch at once.'''
+        if now is None:
+            now = time.monotonic()
+        if not fade or self.theme is None:
+            self._next_theme = None
+            self.level = self._from = self._to = self.brightness[theme]
+            self._set_theme(theme)
+            return
+        if theme == self.theme and self._next_theme is None:
+            return
+        self._next_theme = theme
+        self._fade(0, now)
+
+    def set_brightness(self, level, theme=None, *, now=None):
+        '''Set (and fade to) the brightness level of a theme, default the current one.'''
+        theme = theme or self.theme
+        self.brightness[theme] = max(0, min(self.max_level, level))
+        if theme == self.theme and self._next_theme is None:
+            self._fade(self.brightness[theme], time.monotonic() if now is None else now)
+
+    def _set_theme(self, theme):
+        ## Color the new theme's slots before it becomes visible
+        for slot in self.slots[theme]:
+            slot.level = None
+            slot.set(self.level)
+            self.writes += 1
+        self.theme = theme
+        self._apply(theme)
+
+    ##-------------------------------------------------------------------------
+    def _write(self, budget):
+        '''Bring up to budget slots of the current theme to the current level.'''
+        slots = self.slots[self.theme]
+        count = len(slots)
+        for _ in range(count):
+            if budget <= 0:
+                break
+            self._cursor = (self._cursor + 1) % count
+            slot = slots[self._cursor]
+            if slot.set(self.level):
+                self.writes += 1
+                budget -= 1
+        return budget
+
+    def update(self, now=None):
+        '''
+        Advance the fade and write at most `budget` slots.
+
+        Returns
+        -------
+        active : bool
+            True while more frames are needed
+        '''
+        if self.theme is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        if self._from != self._to:
+            if now >= self._end:
+                self.level = self._to
+                self._from = self._to
+            else:
+                progress = (now - self._start) / (self._end - self._start)
+                self.level = self._from + round((self._to - self._from) * progress)
+        self._write(self.budget)
+        if self._next_theme is not None and self.level == 0 and not self._pending():
+            ## Faded out: switch and fade in
+            theme = self._next_theme
+            self._next_theme = None
+            self._set_theme(theme)
+            self._fade(self.brightness[theme], now)
+        return self.active
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+Dirty tracking for the display.
+
+`RenderState` remembers what was last pushed to `displayio` for each element
+(time, colon, theme, sensor line) and tells the renderer whether the desired
+value differs, so a tick only touches the elements that changed:
+
+    if render.changed("time", hours * 100 + minutes):
+        clock_face.show(...)
+
+`Hysteresis` keeps a reading from flickering between two display values when
+it sits on a rounding boundary.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class RenderState:
+    '''
+    Last applied value per display element.
+
+    Attributes
+    ----------
+    applied, skipped : int
+        updates pushed to the display and updates skipped as unchanged
+    dirty : bool
+        set by every pushed update, cleared by whoever refreshes the display
+    '''
+
+    def __init__(self):
+        self._state = {}
+        self.applied = 0
+        self.skipped = 0
+        self.dirty = False
+
+    def changed(self, element, value):
+        '''Record value as desired for element; True if it has to be pushed.'''
+        if element in self._state and self._state[element] == value:
+            self.skipped += 1
+            return False
+        self._state[element] = value
+        self.applied += 1
+        self.dirty = True
+        return True
+
+    def invalidate(self, element=None):
+        '''Force the next update of one (or every) element to be pushed.'''
+        if element is None:
+            self._state.clear()
+        else:
+            self._state.pop(element, None)
+
+
+##=============================================================================
+class Hysteresis:
+    '''
+    Quantize a reading to the display resolution, with hysteresis.
+
+    The shown value only moves once the reading is more than `margin` steps
+    past the rounding boundary, e.g. with step 0.1 and margin 0.25 a shown
+    21.5 changes to 21.6 at 21.575 and back to 21.5 at 21.525.
+
+    Values are returned as integer multiples of step (tenths for step 0.1).
+    '''
+
+    def __init__(self, step=0.1, margin=0.25):
+        self.step = step
+        self.margin = margin
+        self.value = None
+
+    def update(self, reading):
+        scaled = reading / self.step
+        value = self.value
+        if value is None or abs(scaled - value) >= 0.5 + self.margin:
+            self.value = round(scaled)
+        return self.value
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fixed-size sensor history with rolling statistics.
+
+Readings are stored as scaled integers (hundredths, e.g. 21.53 °C -> 2153)
+in preallocated `array('h')` ring buffers. Every window keeps its rolling
+min, max and mean with O(1) work per sample (amortized for min/max, via
+monotonic queues of ring positions) and an integer EMA, so adding a sample
+allocates nothing.
+
+To bound memory on the M4, a window stores slots rather than raw samples:
+each slot holds the mean of `every` consecutive samples. With the default
+2s sensor interval:
+
+    window   slots   slot length   memory per channel
+    1 h      360     10 s          ~2 kB
+    24 h     360     4 min         ~2 kB
+
+    history = sensor_history.SensorHistory(interval=2)
+    history.add(21.53, 45.2)
+    history.temperature_1h.min / 100  # -> 21.53
+
+@author: mada
+@version: 2026-10-16
+"""
+
+from array import array
+
+## Readings are stored as hundredths
+SCALE = 100
+## Fraction bits of the fixed point EMA
+EMA_BITS = 15
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class RollingWindow:
+    '''
+    Ring buffer of scaled integers with rolling min, max, mean and EMA.
+
+    Parameters
+    ----------
+    size : int
+        number of slots in the window
+    every : int
+        samples averaged into one slot
+    ema_samples : int
+        EMA span in samples, alpha = 2 / (ema_samples + 1); defaults to the
+        window length size * every
+    '''
+
+    def __init__(self, size, every=1, ema_samples=None):
+        self.size = size
+        self.every = every
+        self.values = array('h', [0] * size)
+        ## Ring positions with decreasing (max) / increasing (min) values
+        self._maxq = array('H', [0] * size)
+        self._minq = array('H', [0] * size)
+        self._maxq_head = self._maxq_len = 0
+        self._minq_head = self._minq_len = 0
+        self._next = 0  # ring position of the next slot
+        self._sum = 0
+        self._acc = 0
+        self._acc_n = 0
+        self._ema_k = max(1, ((ema_samples or size * every) + 1) // 2)
+        self._ema = None  # value << EMA_BITS
+        ## Number of filled slots, at most size
+        self.count = 0
+
+    ##-------------------------------------------------------------------------
+    def push(self, value):
+        '''
+        Add one sample (a scaled integer).
+
+        Returns
+        -------
+        slot_done : bool
+            True if the sample completed a slot
+        '''
+        ema = self._ema
+        if ema is None:
+            self._ema = value << EMA_BITS
+        else:
+            self._ema = ema + ((value << EMA_BITS) - ema) // self._ema_k
+
+        self._acc += value
+        self._acc_n += 1
+        if self._acc_n < self.every:
+            return False
+        every = self.every
+        slot = (self._acc + every // 2) // every
+        self._acc = self._acc_n = 0
+
+        size = self.size
+        p = self._next
+        values = self.values
+        if self.count == size:
+            ## Overwrite the oldest slot; it drops out of the queues' heads
+            self._sum -= values[p]
+            if self._maxq_len and self._maxq[self._maxq_head] == p:
+                self._maxq_head = (self._maxq_head + 1) % size
+                self._maxq_len -= 1
+            if self._minq_len and self._minq[self._minq_head] == p:
+                self._minq_head = (self._minq_head + 1) % size
+                self._minq_len -= 1
+        else:
+            self.count += 1
+        values[p] = slot
+        self._sum += slot
+
+        q = self._maxq
+        n = self._maxq_len
+        while n and values[q[(self._maxq_head + n - 1) % size]] <= slot:
+            n -= 1
+        q[(self._maxq_head + n) % size] = p
+        self._maxq_len = n + 1
+
+        q = self._minq
+        n = self._minq_len
+        while n and values[q[(self._minq_head + n - 1) % size]] >= slot:
+            n -= 1
+        q[(self._minq_head + n) % size] = p
+        self._minq_len = n + 1
+
+        self._next = (p + 1) % size
+        return True
+
+    ##-------------------------------------------------------------------------
+    @property
+    def max(self):
+        '''Largest slot in the window, None while empty.'''
+        if not self._maxq_len:
+            return None
+        return self.values[self._maxq[self._maxq_head]]
+
+    @property
+    def min(self):
+        '''Smallest slot in the window, None while empty.'''
+        if not self._minq_len:
+            return None
+        return self.values[self._minq[self._minq_head]]
+
+    @property
+    def mean(self):
+        '''Mean of the slots in the window (rounded), None while empty.'''
+        if not self.count:
+            return None
+        return (self._sum + self.count // 2) // self.count
+
+    @property
+    def ema(self):
+        '''Exponential moving average over the samples, None before the first one.'''
+        if self._ema is None:
+            return None
+        return (self._ema + (1 << (EMA_BITS - 1))) >> EMA_BITS
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        '''Slot i of the window, 0 = oldest, -1 = newest (for sparklines).'''
+        count = self.count
+        if i < 0:
+            i += count
+        if not 0 <= i < count:
+            raise IndexError("RollingWindow index out of range")
+        return self.values[(self._next - count + i) % self.size]
+
+
+##=============================================================================
+class SensorHistory:
+    '''Temperature and humidity over the last hour and the last day.'''
+
+    def __init__(self, interval=2, slots=360):
+        ## Samples per slot for 1 h and 24 h windows of `slots` slots
+        every_1h = max(1, 3600 // (interval * slots))
+        every_24h = max(1, 86400 // (interval * slots))
+        self.interval = interval
+        self.temperature_1h = RollingWindow(slots, every_1h)
+        self.temperature_24h = RollingWindow(slots, every_24h)
+        self.humidity_1h = RollingWindow(slots, every_1h)
+        self.humidity_24h = RollingWindow(slots, every_24h)
+        self.samples = 0
+
+    def add(self, t_degC, rh_pRH):
+        '''Add a reading in °C and %RH.'''
+        t = round(t_degC * SCALE)
+        rh = round(rh_pRH * SCALE)
+        self.temperature_1h.push(t)
+        self.temperature_24h.push(t)
+        self.humidity_1h.push(rh)
+        self.humidity_24h.push(rh)
+        self.samples += 1
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    import random
+
+    ## Cross-check the rolling statistics against brute force
+    window = RollingWindow(50, every=3)
+    raw = []
+    for i in range(2000):
+        value = random.randint(-4500, 13000)
+        raw.append(value)
+        if window.push(value):
+            slots = [(sum(raw[j:j + 3]) + 1) // 3 for j in range(0, len(raw), 3)][-50:]
+            assert window.min == min(slots), (i, window.min, min(slots))
+            assert window.max == max(slots), (i, window.max, max(slots))
+            assert window.mean == (sum(slots) + len(slots) // 2) // len(slots)
+            assert list(window) == slots
+    print("## RollingWindow matches brute force; EMA", window.ema, "mean", window.mean)
+
+    history = SensorHistory(interval=2)
+    for i in range(86400 // 2):
+        history.add(21.5 + 2 * (i % 1800) / 1800, 45.0)
+    for name in ("temperature_1h", "temperature_24h", "humidity_1h", "humidity_24h"):
+        w = getattr(history, name)
+        print("## {:16s} min {:6.2f} max {:6.2f} mean {:6.2f} ema {:6.2f}".format(
+            name, w.min / SCALE, w.max / SCALE, w.mean / SCALE, w.ema / SCALE))
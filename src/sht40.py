@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+"""
+Non-blocking driver for the Sensirion SHT40 temperature/humidity sensor.
+
+A measurement is split into `trigger()` (send the measure command) and
+`collect()` (read and check the result once the conversion time has
+elapsed). `measure()` yields to the event loop in between, so neither the
+conversion nor a busy I2C bus ever blocks rendering. The latest good
+reading is cached in `temperature`/`humidity` for the renderer.
+
+    sensor = sht40.SHT40(board.I2C())
+    asyncio.create_task(sensor.run(interval=2))
+    ...
+    print(sensor.temperature, sensor.humidity)
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import time
+import asyncio
+
+## name, command, description, conversion time in seconds
+MODES = (
+    ("SERIAL_NUMBER", 0x89, "Serial number", 0.01),
+    ("NOHEAT_HIGHPRECISION", 0xFD, "No heater, high precision", 0.01),
+    ("NOHEAT_MEDPRECISION", 0xF6, "No heater, med precision", 0.005),
+    ("NOHEAT_LOWPRECISION", 0xE0, "No heater, low precision", 0.002),
+    ("HIGHHEAT_1S", 0x39, "High heat, 1 second", 1.1),
+    ("HIGHHEAT_100MS", 0x32, "High heat, 0.1 second", 0.11),
+    ("MEDHEAT_1S", 0x2F, "Med heat, 1 second", 1.1),
+    ("MEDHEAT_100MS", 0x24, "Med heat, 0.1 second", 0.11),
+    ("LOWHEAT_1S", 0x1E, "Low heat, 1 second", 1.1),
+    ("LOWHEAT_100MS", 0x15, "Low heat, 0.1 second", 0.11),
+    )
+NOHEAT_HIGHPRECISION = MODES[1]
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+def crc8(data, start=0, end=2):
+    '''Sensirion CRC-8 (polynomial 0x31, init 0xFF) over data[start:end].'''
+    crc = 0xFF
+    for i in range(start, end):
+        crc ^= data[i]
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+    return crc
+
+
+##=============================================================================
+class SHT40:
+    '''
+    SHT40 on an I2C bus, measured with trigger/collect.
+
+    Attributes
+    ----------
+    temperature : float or None
+        latest good reading in °C
+    humidity : float or None
+        latest good reading in %RH, clipped to 0..100
+    timestamp : float or None
+        time.monotonic() of the latest good reading
+    readings, errors : int
+        number of good readings and failed transfers (NACK, CRC, busy bus)
+    '''
+
+    def __init__(self, i2c, address=0x44, mode=NOHEAT_HIGHPRECISION):
+        self._i2c = i2c
+        self.address = address
+        self.mode = mode
+        self._command = bytearray(1)
+        self._rx = bytearray(6)
+        self._ready_at = None
+        self.temperature = None
+        self.humidity = None
+        self.timestamp = None
+        self.readings = 0
+        self.errors = 0
+        self.last_error = None
+
+    ##-------------------------------------------------------------------------
+    def trigger(self):
+        '''
+        Start a measurement without waiting for it.
+
+        Returns
+        -------
+        delay : float or None
+            seconds until the result can be collected, None if the bus is busy
+        '''
+        if not self._i2c.try_lock():
+            return None
+        try:
+            self._command[0] = self.mode[1]
+            self._i2c.writeto(self.address, self._command)
+        except OSError as e:
+            self._fail(e)
+            return None
+        finally:
+            self._i2c.unlock()
+        self._ready_at = time.monotonic() + self.mode[-1]
+        return self.mode[-1]
+
+    def collect(self):
+        '''
+        Read the result of the last trigger() into the cache.
+
+        Returns
+        -------
+        success : bool
+            False if nothing is pending, the conversion is not done yet, the
+            bus is busy or the transfer failed; the cache keeps the last good
+            reading.
+        '''
+        if self._ready_at is None or time.monotonic() < self._ready_at:
+            return False
+        if not self._i2c.try_lock():
+            return False
+        rx = self._rx
+        try:
+            self._i2c.readfrom_into(self.address, rx)
+        except OSError as e:
+            ## NACK: the sensor is still converting (or gone)
+            self._fail(e)
+            return False
+        finally:
+            self._i2c.unlock()
+        self._ready_at = None
+        if crc8(rx, 0, 2) != rx[2] or crc8(rx, 3, 5) != rx[5]:
+            self._fail(ValueError("SHT40 CRC mismatch"))
+            return False
+        t_ticks = rx[0] * 256 + rx[1]
+        rh_ticks = rx[3] * 256 + rx[4]
+        self.temperature = -45 + 175 * t_ticks / 65535  # 2^16 - 1 = 65535
+        self.humidity = min(100, max(0, -6 + 125 * rh_ticks / 65535))
+        self.timestamp = time.monotonic()
+        self.readings += 1
+        return True
+
+    def _fail(self, error):
+        self.errors += 1
+        self.last_error = error
+
+    ##-------------------------------------------------------------------------
+    def read(self):
+        '''
+        Blocking measurement, for boot before the event loop runs.
+
+        Returns
+        -------
+        t_degC, rh_pRH : float or None
+        '''
+        delay = self.trigger()
+        if delay is not None:
+            time.sleep(delay)
+            self.collect()
+        return self.temperature, self.humidity
+
+    async def measure(self, retries=3):
+        '''Trigger, yield for the conversion time and collect; True on success.'''
+        delay = None
+        for _ in range(retries):
+            delay = self.trigger()
+            if delay is not None:
+                break
+            await asyncio.sleep(0.001)  # bus busy
+        if delay is None:
+            return False
+        for _ in range(retries):
+            await asyncio.sleep(delay)
+            if self.collect():
+                return True
+            delay = 0.001
+        return False
+
+    async def run(self, interval=2.0):
+        '''Background task: measure every interval seconds.'''
+        while True:
+            await self.measure()
+            await asyncio.sleep(interval)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+Disciplined software clock.
+
+The clock is anchored on time.monotonic_ns() instead of counting seconds in
+a coroutine, so scheduler jitter never accumulates. Every NTP sample updates
+the phase (slewed, or stepped if far off) and a frequency drift estimate
+(FLL), so the clock keeps time between syncs that are hours apart.
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import time
+
+## Offsets beyond this are stepped instead of slewed
+STEP_NS = 1_000_000_000  # 1s
+## Maximum rate at which phase corrections are slewed in
+SLEW_PPB = 500_000  # 500ppm
+## Maximum frequency correction
+MAX_FREQ_PPB = 500_000  # 500ppm
+## Samples closer than this are not used for the frequency estimate
+MIN_FLL_INTERVAL_NS = 64_000_000_000  # 64s
+## Weight of a new frequency error measurement
+FLL_GAIN = 0.5
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class SoftClock:
+    '''
+    UTC clock derived from the monotonic clock and disciplined by NTP samples.
+
+    now_ns = epoch_ns + dt * (1 + freq_ppb / 1e9) + slew, dt = monotonic_ns - mono_ns
+    '''
+
+    def __init__(self, ts_utc=None):
+        if ts_utc is None:
+            ts_utc = time.time()
+        ## Anchor: epoch_ns at monotonic mono_ns
+        self._mono_ns = time.monotonic_ns()
+        self._epoch_ns = int(ts_utc * 1_000_000_000)
+        ## Phase correction still being slewed in
+        self._slew_ns = 0
+        ## Frequency correction in parts per billion (positive: local oscillator is slow)
+        self.freq_ppb = 0
+        ## True once the clock has seen its first sample
+        self.synced = False
+        ## monotonic_ns of the last sample, offset measured by it
+        self.last_sync_ns = None
+        self.last_offset_ns = 0
+        ## Counters
+        self.syncs = 0
+        self.steps = 0
+        self._fll_samples = 0
+
+    ##-------------------------------------------------------------------------
+    def _estimate(self, mono_ns):
+        dt = mono_ns - self._mono_ns
+        ts_ns = self._epoch_ns + dt + dt * self.freq_ppb // 1_000_000_000
+        if self._slew_ns:
+            step = dt * SLEW_PPB // 1_000_000_000
+            if step >= abs(self._slew_ns):
+                ts_ns += self._slew_ns
+            elif self._slew_ns > 0:
+                ts_ns += step
+            else:
+                ts_ns -= step
+        return ts_ns
+
+    def time_ns(self):
+        '''UTC in nanoseconds since the epoch.'''
+        return self._estimate(time.monotonic_ns())
+
+    def time(self):
+        '''UTC in whole seconds since the epoch.'''
+        return self._estimate(time.monotonic_ns()) // 1_000_000_000
+
+    def next_second(self, mono_ns=None):
+        '''Monotonic ns at which the clock reaches its next whole second after mono_ns (default now).'''
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        estimate = self._estimate(mono_ns)
+        target = estimate - estimate % 1_000_000_000 + 1_000_000_000
+        deadline = mono_ns + target - estimate
+        ## The clock runs off by up to MAX_FREQ_PPB + SLEW_PPB: correct once for its rate
+        return deadline + target - self._estimate(deadline)
+
+    def since_sync(self):
+        '''Seconds since the last sample, None if never synced.'''
+        if self.last_sync_ns is None:
+            return None
+        return (time.monotonic_ns() - self.last_sync_ns) / 1_000_000_000
+
+    ##-------------------------------------------------------------------------
+    def sync(self, ts_utc_ns, mono_ns=None):
+        '''
+        Discipline the clock with a reference sample.
+
+        Parameters
+        ----------
+        ts_utc_ns : int
+            reference UTC in nanoseconds since the epoch (e.g. from NTP)
+        mono_ns : int, optional
+            time.monotonic_ns() at which the reference was valid, defaults to now
+
+        Returns
+        -------
+        offset_ns : int
+            reference minus clock before the correction
+        '''
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        estimate = self._estimate(mono_ns)
+        offset = ts_utc_ns - estimate
+        self.syncs += 1
+        self.last_offset_ns = offset
+
+        if self.synced:
+            ## FLL: the residual offset over the interval is the frequency error;
+            ## errors beyond twice the correction range are bogus samples
+            interval = mono_ns - self.last_sync_ns
+            if interval >= MIN_FLL_INTERVAL_NS:
+                error_ppb = offset * 1_000_000_000 // interval
+                if abs(error_ppb) <= 2 * MAX_FREQ_PPB:
+                    gain = 1 if self._fll_samples == 0 else FLL_GAIN
+                    freq = self.freq_ppb + int(error_ppb * gain)
+                    self.freq_ppb = max(-MAX_FREQ_PPB, min(freq, MAX_FREQ_PPB))
+                    self._fll_samples += 1
+
+        if not self.synced or abs(offset) > STEP_NS:
+            ## Step: too far off to slew (or the first sample after boot)
+            self._epoch_ns = ts_utc_ns
+            self._slew_ns = 0
+            self.steps += 1
+        else:
+            ## PLL: slew the phase error in without stepping time backwards
+            self._epoch_ns = estimate
+            self._slew_ns = offset
+        self._mono_ns = mono_ns
+        self.synced = True
+        self.last_sync_ns = mono_ns
+        return offset
+
+    def restore(self, ts_utc_ns=None, freq_ppb=0):
+        '''
+        Take over an approximate time and drift estimate, e.g. from a checkpoint.
+
+        The clock stays unsynced, so the next sample steps it; the frequency
+        counts as one FLL sample, so later samples refine it.
+        '''
+        if ts_utc_ns is not None:
+            self._mono_ns = time.monotonic_ns()
+            self._epoch_ns = ts_utc_ns
+            self._slew_ns = 0
+        self.freq_ppb = max(-MAX_FREQ_PPB, min(freq_ppb, MAX_FREQ_PPB))
+        if freq_ppb:
+            self._fll_samples = 1
+
+    def sync_time(self, ts_utc, mono_ns=None):
+        '''Like sync(), for a reference in seconds (e.g. time.mktime(ntp.datetime)).'''
+        return self.sync(int(ts_utc * 1_000_000_000), mono_ns)
+
+
+##*****************************************************************************
+##*****************************************************************************
+if __name__ == '__main__':
+    '''
+    Discipline a clock whose oscillator runs 80ppm fast against a perfect
+    reference that is sampled every 12 hours.
+    '''
+    ppm = 80
+    mono = 0
+    clock = SoftClock(0)
+    clock._mono_ns = mono
+    for sample in range(8):
+        reference = mono * 1_000_000 // (1_000_000 + ppm)  # true time when the local oscillator shows mono
+        offset = clock.sync(reference, mono)
+        print("> sync #{}: offset {:9.3f} ms, freq {:+8.3f} ppm, error 1s later {:8.3f} ms".format(
+            sample, offset / 1e6, clock.freq_ppb / 1e3,
+            (clock._estimate(mono + 1_000_000_000) - (mono + 1_000_000_000) * 1_000_000 // (1_000_000 + ppm)) / 1e6))
+        mono += 12 * 3600 * 1_000_000_000
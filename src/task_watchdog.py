@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hardware watchdog fed by task heartbeats, with a crash journal in NVM.
+
+Every supervised task checks in with `beat(name, within)`, promising to
+check in again within `within` seconds. A feeder calls `check()` a few
+times per watchdog timeout; the hardware watchdog is only fed while no
+task is overdue. A stalled task (or a dead event loop) therefore resets the
+board within the watchdog timeout instead of leaving it on a traceback.
+
+Before a reset that the firmware sees coming (a stalled task, an unhandled
+exception) a crash record is written to NVM:
+
+    offset  size
+    0       2     magic b"CR"
+    2       1     version
+    3       1     reserved
+    4       4     uptime in s
+    8       4     free heap in bytes at the time of the crash
+    12      16    reason: exception type or "stalled <task>"
+    28      8     last task to check in
+    36      2     Fletcher-16 checksum of bytes 0..35
+
+The next boot reads it with `load()`, reports it and clears it.
+
+    wdt = TaskWatchdog(microcontroller.watchdog, microcontroller.nvm)
+    wdt.beat("render", 5)
+    ...
+    wdt.check()  # from a feeder task
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import gc
+import struct
+import time
+
+from clock_checkpoint import fletcher16, SIZE as CHECKPOINT_SIZE
+
+MAGIC = b"CR"
+VERSION = 1
+RECORD = "<2sBxII16s8s"
+SIZE = struct.calcsize(RECORD) + 2
+## Default place in NVM, behind the clock checkpoint
+OFFSET = (CHECKPOINT_SIZE + 7) // 8 * 8
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class TaskWatchdog:
+    '''
+    Feed a watchdog only while every supervised task checks in.
+
+    Parameters
+    ----------
+    wdt : watchdog.WatchDogTimer
+        e.g. microcontroller.watchdog, with timeout and mode already set;
+        None to only track the tasks
+    nvm : bytearray like
+        e.g. microcontroller.nvm, for the crash record
+    offset : int
+        start of the crash record in nvm
+
+    Attributes
+    ----------
+    last : str
+        last task to check in
+    tripped : str or None
+        reason the watchdog is no longer fed
+    '''
+
+    def __init__(self, wdt, nvm, *, offset=OFFSET):
+        if nvm is None or len(nvm) < offset + SIZE:
+            raise ValueError("NVM too small for the crash record")
+        self.wdt = wdt
+        self.nvm = nvm
+        self.offset = offset
+        self._t0 = time.monotonic()
+        self._deadlines = {}
+        self._buffer = bytearray(SIZE)
+        self.last = ""
+        self.tripped = None
+        self.feeds = 0
+
+    ##-------------------------------------------------------------------------
+    def beat(self, name, within):
+        '''Check in; the task promises to check in again within `within` seconds (None: parked, not watched).'''
+        self._deadlines[name] = None if within is None else time.monotonic() + within
+        self.last = name
+
+    def overdue(self):
+        '''Name of a task that missed its check-in, or None.'''
+        now = time.monotonic()
+        for name, deadline in self._deadlines.items():
+            if deadline is not None and now > deadline:
+                return name
+        return None
+
+    def check(self):
+        '''
+        Feed the watchdog if every task is alive; otherwise journal the stall
+        once and let the watchdog reset the board.
+
+        Returns
+        -------
+        fed : bool
+        '''
+        if self.tripped is None:
+            name = self.overdue()
+            if name is not None:
+                self.trip("stalled " + name)
+        if self.tripped is not None:
+            return False
+        if self.wdt is not None:
+            self.wdt.feed()
+        self.feeds += 1
+        return True
+
+    def trip(self, reason):
+        '''Stop feeding the watchdog after writing a crash record with reason.'''
+        if self.tripped is None:
+            self.tripped = reason
+            self.record(reason)
+
+    ##-------------------------------------------------------------------------
+    def record(self, reason):
+        '''Write the crash record.'''
+        buffer = self._buffer
+        struct.pack_into(RECORD, buffer, 0, MAGIC, VERSION, int(time.monotonic() - self._t0), gc.mem_free(),
+                         reason.encode("utf-8")[:16], self.last.encode("utf-8")[:8])
+        struct.pack_into("<H", buffer, SIZE - 2, fletcher16(buffer, 0, SIZE - 2))
+        self.nvm[self.offset:self.offset + SIZE] = buffer
+
+    def load(self):
+        '''The crash record as (reason, uptime, last task, free heap), None if there is none.'''
+        data = self.nvm[self.offset:self.offset + SIZE]
+        magic, version, uptime, mem_free, reason, last = struct.unpack_from(RECORD, data)
+        if magic != MAGIC or version != VERSION:
+            return None
+        if struct.unpack_from("<H", data, SIZE - 2)[0] != fletcher16(data, 0, SIZE - 2):
+            return None
+        return reason.rstrip(b"\0").decode("utf-8"), uptime, last.rstrip(b"\0").decode("utf-8"), mem_free
+
+    def clear(self):
+        '''Invalidate the crash record once it has been reported.'''
+        self.nvm[self.offset:self.offset + 2] = b"\0\0"
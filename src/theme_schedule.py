@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Declarative day/night theme schedule.
+
+Rules list the transitions of a day as (hour, minute, theme); every weekday
+is mapped to a rule, and holidays use their own rule. For the current day the
+schedule is compiled once into a sorted table of transition instants, so
+looking up the active theme per tick is a comparison against the next
+transition:
+
+    schedule = ThemeSchedule(RULES, holidays=((1, 1), (12, 25)))
+    theme = schedule.theme(local_ts)  # local_ts = UTC + time zone offset
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import datetime_util
+
+## Wake up at 7 on workdays and at 8 on weekends and holidays, night from 20:00
+RULES = {
+    "workday": ((0, 0, "night"), (7, 0, "day"), (20, 0, "night")),
+    "weekend": ((0, 0, "night"), (8, 0, "day"), (20, 0, "night")),
+    }
+## Rule per weekday, Monday first
+WEEKDAYS = ("workday", "workday", "workday", "workday", "workday", "weekend", "weekend")
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class ThemeSchedule:
+    '''
+    Active theme by local time.
+
+    Parameters
+    ----------
+    rules : dict
+        rule name -> transitions ((hour, minute, theme), ...), sorted by time
+    weekdays : tuple of str
+        rule name for Monday .. Sunday
+    holidays : iterable
+        (month, day) every year or (year, month, day) once
+    holiday_rule : str
+        rule used on holidays
+    '''
+
+    def __init__(self, rules=RULES, weekdays=WEEKDAYS, holidays=(), holiday_rule="weekend"):
+        for name in weekdays + (holiday_rule,):
+            if name not in rules:
+                raise ValueError("unknown theme rule %r" % name)
+        self.rules = rules
+        self.weekdays = weekdays
+        self.holidays = set(tuple(date) for date in holidays)
+        self.holiday_rule = holiday_rule
+        ## Compiled day: [day_start, day_end) in local seconds, transition instants and themes
+        self._day_start = None
+        self._day_end = None
+        self._at = []
+        self._themes = []
+        self._index = 0
+        self.compiles = 0
+
+    ##-------------------------------------------------------------------------
+    def rule_for(self, year, month, day, weekday):
+        '''Name of the rule that applies to a date.'''
+        if (month, day) in self.holidays or (year, month, day) in self.holidays:
+            return self.holiday_rule
+        return self.weekdays[weekday]
+
+    def compile(self, local_ts):
+        '''Build the transition table of the local day containing local_ts.'''
+        year, month, day, _, _, _, weekday, _ = datetime_util.epoch_to_civil(local_ts)
+        day_start = local_ts - local_ts % 86400
+        transitions = self.rules[self.rule_for(year, month, day, weekday)]
+        self._at = []
+        self._themes = []
+        if transitions[0][:2] != (0, 0):
+            ## Carry the last theme of yesterday over midnight
+            year, month, day, _, _, _, weekday, _ = datetime_util.epoch_to_civil(day_start - 86400)
+            self._at.append(day_start)
+            self._themes.append(self.rules[self.rule_for(year, month, day, weekday)][-1][2])
+        for hour, minute, theme in transitions:
+            self._at.append(day_start + hour * 3600 + minute * 60)
+            self._themes.append(theme)
+        self._day_start = day_start
+        self._day_end = day_start + 86400
+        self._index = 0
+        self.compiles += 1
+
+    def theme(self, local_ts):
+        '''Active theme at local_ts (seconds since the epoch, in local time).'''
+        if self._day_start is None or not self._day_start <= local_ts < self._day_end:
+            self.compile(local_ts)
+        at = self._at
+        i = self._index
+        if local_ts < at[i]:
+            i = 0  # the clock stepped back
+        while i + 1 < len(at) and local_ts >= at[i + 1]:
+            i += 1
+        self._index = i
+        return self._themes[i]
+
+    def next_transition(self):
+        '''Local time of the next transition of the compiled day, or None.'''
+        if self._index + 1 < len(self._at):
+            return self._at[self._index + 1]
+        return None
+
+
+##=============================================================================
+def parse_holidays(text):
+    '''
+    Parse holidays from a settings string.
+
+    "01-01,12-25,2026-04-06" -> {(1, 1), (12, 25), (2026, 4, 6)}
+    '''
+    holidays = set()
+    for item in (text or "").split(","):
+        item = item.strip()
+        if item:
+            holidays.add(tuple(int(part) for part in item.split("-")))
+    return holidays
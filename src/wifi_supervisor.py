@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio supervisor for the ESP32 Wi-Fi co-processor.
+
+The link goes through explicit states:
+
+    idle ---------> associating ---------> connected <-----> degraded
+     ^   (backoff)       |      failure        |   transport    |
+     |                   v                     |   errors       |
+     +------------- resetting <----------------+----------------+
+                    esp.reset()     too many consecutive failures
+
+Association is started with `wifi_set_passphrase()` and polled through
+`esp.status`, so no call waits on the radio for more than one SPI
+transaction, except the hard reset (see `reset_delay`). Failed attempts are retried with exponential backoff and
+jitter; after `reset_after` consecutive failures the ESP32 is hard-reset.
+Transport errors of the SPI link (`TimeoutError: Timed out waiting for SPI
+char`, `ESP32 not responding`, ETIMEDOUT, ...) are counted, never raised.
+
+    wifi = WifiSupervisor(esp, ssid, password)
+    asyncio.create_task(wifi.run())
+    await wifi.wait_connected()
+    ...
+    wifi.report_failure(error)  # e.g. an NTP round that got no answer
+
+@author: mada
+@version: 2026-10-16
+"""
+
+import random
+import time
+import asyncio
+
+from adafruit_esp32spi import adafruit_esp32spi
+
+IDLE = "idle"
+ASSOCIATING = "associating"
+CONNECTED = "connected"
+DEGRADED = "degraded"
+RESETTING = "resetting"
+## Errors of the SPI link and the radio (TimeoutError and ConnectionError are OSErrors)
+TRANSPORT_ERRORS = (OSError, RuntimeError)
+
+##*****************************************************************************
+##*****************************************************************************
+
+
+##=============================================================================
+class WifiSupervisor:
+    '''
+    Connection state machine for an ESP_SPIcontrol.
+
+    Parameters
+    ----------
+    esp : adafruit_esp32spi.ESP_SPIcontrol
+    ssid, password : str
+    timeout : float
+        seconds to wait for an association
+    min_backoff, max_backoff : float
+        range of the pause between failed attempts
+    reset_after : int
+        consecutive failures that escalate to esp.reset()
+    reset_delay : float
+        seconds to wait for the ESP32 to boot after esp.reset(); the reset
+        itself blocks the event loop for about 0.76s (time.sleep() in the
+        driver), so the display stalls once per reset
+    check_interval : float
+        seconds between link checks while connected
+    on_state : callable
+        on_state(supervisor, old_state) after every state change
+
+    Attributes
+    ----------
+    state : str
+    associations, connects, disconnects, failures, transport_errors, resets : int
+        health counters
+    '''
+
+    def __init__(self, esp, ssid, password, *, timeout=10, min_backoff=2, max_backoff=300, reset_after=3,
+                 check_interval=10, poll_interval=0.1, reset_delay=1, on_state=None):
+        self.esp = esp
+        self._ssid = bytes(ssid or "", "utf-8")
+        self._password = bytes(password or "", "utf-8")
+        self.timeout = timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.reset_after = reset_after
+        self.check_interval = check_interval
+        self.poll_interval = poll_interval
+        self.reset_delay = reset_delay
+        self.on_state = on_state
+        self.state = IDLE
+        self.since = time.monotonic()
+        self._holdoff_until = 0
+        self._backoffs = 0
+        self.consecutive_failures = 0
+        self.last_error = None
+        ## Health counters
+        self.associations = 0
+        self.connects = 0
+        self.disconnects = 0
+        self.failures = 0
+        self.transport_errors = 0
+        self.resets = 0
+
+    ##-------------------------------------------------------------------------
+    @property
+    def connected(self):
+        '''True while the link is up, even if degraded.'''
+        return self.state == CONNECTED or self.state == DEGRADED
+
+    def health(self):
+        '''Health counters as a dictionary, for logging.'''
+        return {
+            "state": self.state,
+            "associations": self.associations,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "failures": self.failures,
+            "transport_errors": self.transport_errors,
+            "resets": self.resets,
+            }
+
+    def _set(self, state):
+        if state != self.state:
+            old = self.state
+            self.state = state
+            self.since = time.monotonic()
+            if self.on_state is not None:
+                self.on_state(self, old)
+
+    def _backoff(self):
+        self._backoffs += 1
+        backoff = min(self.max_backoff, self.min_backoff * 2 ** (self._backoffs - 1))
+        self._holdoff_until = time.monotonic() + backoff / 2 + random.uniform(0, backoff / 2)
+
+    ##-------------------------------------------------------------------------
+    def report_failure(self, error=None):
+        '''A transfer over the link failed; degrade, and escalate if it keeps failing.'''
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.consecutive_failures >= self.reset_after:
+            self._set(RESETTING)
+        elif self.state == CONNECTED:
+            self._set(DEGRADED)
+
+    def report_success(self):
+        '''A transfer over the link worked.'''
+        self.consecutive_failures = 0
+        if self.state == DEGRADED:
+            self._set(CONNECTED)
+
+    def _transport_error(self, error):
+        self.transport_errors += 1
+        if self.state == ASSOCIATING:
+            self._set(IDLE)
+        self.report_failure(error)
+        if self.state == IDLE:
+            self._backoff()
+
+    ##-------------------------------------------------------------------------
+    async def _associate(self):
+        '''Join the AP like esp.connect_AP(), but poll the status between asyncio.sleep()s.'''
+        self._set(ASSOCIATING)
+        self.associations += 1
+        self.esp.wifi_set_passphrase(self._ssid, self._password)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            status = self.esp.status
+            if status == adafruit_esp32spi.WL_CONNECTED:
+                self.connects += 1
+                self.consecutive_failures = 0
+                self._backoffs = 0
+                self.last_error = None
+                self._set(CONNECTED)
+                return
+            if time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(self.poll_interval)
+        self._set(IDLE)
+        self.report_failure(ConnectionError("Failed to connect to ssid, status %d" % status))
+        if self.state == IDLE:
+            self._backoff()
+
+    async def _check(self):
+        '''Wait for the next link check; back to idle if the AP is gone.'''
+        state = self.state
+        wake = time.monotonic() + self.check_interval
+        while self.state == state and time.monotonic() < wake:
+            await asyncio.sleep(min(1, self.check_interval))
+        if self.state == state and not self.esp.is_connected:
+            self.disconnects += 1
+            self._set(IDLE)
+
+    async def _reset(self):
+        '''Hard-reset the ESP32 and start over.'''
+        self.resets += 1
+        self.consecutive_failures = 0
+        ## Blocks for about 0.76s: the driver pulses the reset pin with time.sleep()
+        self.esp.reset()
+        await asyncio.sleep(self.reset_delay)
+        self._set(IDLE)
+
+    async def step(self):
+        '''Run the current state once; transport errors are counted, not raised.'''
+        try:
+            state = self.state
+            if state == IDLE:
+                delay = self._holdoff_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._associate()
+            elif state == CONNECTED or state == DEGRADED:
+                await self._check()
+            elif state == RESETTING:
+                await self._reset()
+            else:
+                self._set(IDLE)
+        except TRANSPORT_ERRORS as e:
+            self._transport_error(e)
+
+    async def connect(self):
+        '''Run the state machine until the link is up.'''
+        while not self.connected:
+            await self.step()
+
+    async def run(self):
+        '''Background task: supervise the link forever.'''
+        while True:
+            await self.step()
+
+    async def wait_connected(self, poll=0.5):
+        '''Wait until run() has the link up.'''
+        while not self.connected:
+            await asyncio.sleep(poll)